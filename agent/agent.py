@@ -0,0 +1,254 @@
+"""Agent wysyłający metryki lokalnego hosta do centralnego kolektora.
+
+Agent zbiera metryki tak jak tryb headless i co ``interval_s`` dopisuje
+wiersz do ograniczonej kolejki. Osobna pętla wysyła zgromadzone wiersze
+paczkami (ramki ``BATCH``) przez TCP lub gniazdo Unix::
+
+    python -m agent.agent --connect collector:9200
+    python -m agent.agent --connect unix:/run/resource-monitor.sock
+
+Gdy kolektor nie nadąża (``drain`` czeka) albo połączenie zostało zerwane,
+wiersze czekają w kolejce; po jej zapełnieniu najstarsze są odrzucane.
+Po zerwaniu połączenia agent łączy się ponownie z wykładniczo rosnącym
+odstępem.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import socket
+from collections import deque
+from itertools import islice
+from time import time
+from typing import Callable, Deque, Dict, List, Optional
+
+from agent.protocol import (
+    ProtocolError, Row, encode_batch, encode_hello, open_connection,
+)
+
+Collect = Callable[[], Dict[str, float]]
+
+
+class Agent:
+    """Zbiera metryki i przesyła je paczkami do kolektora."""
+
+    def __init__(
+        self,
+        address: str,
+        host: Optional[str] = None,
+        collect: Optional[Collect] = None,
+        interval_s: float = 1.0,
+        batch_size: int = 10,
+        max_queue: int = 3600,
+        reconnect_min_s: float = 0.5,
+        reconnect_max_s: float = 30.0,
+    ):
+        """
+        Args:
+            address: Adres kolektora (``host:port`` lub ``unix:/ścieżka``).
+            host: Nazwa hosta wysyłana kolektorowi; domyślnie nazwa maszyny.
+            collect: Funkcja zwracająca bieżące metryki; domyślnie monitory
+                z pakietu ``monitor`` uruchomione w wątku próbkującym.
+            interval_s: Odstęp między wierszami w sekundach.
+            batch_size: Liczba wierszy, po której paczka jest wysyłana
+                (wcześniej wysyłana jest po ``batch_size * interval_s``).
+            max_queue: Maksymalna liczba wierszy czekających na wysłanie.
+            reconnect_min_s: Początkowy odstęp ponownego łączenia.
+            reconnect_max_s: Maksymalny odstęp ponownego łączenia.
+        """
+        self.address = address
+        self.host = host or socket.gethostname()
+        self.interval_s = interval_s
+        self.batch_size = batch_size
+        self.reconnect_min_s = reconnect_min_s
+        self.reconnect_max_s = reconnect_max_s
+        self.queue: Deque[Row] = deque(maxlen=max_queue)
+        self.sent = 0
+        self.dropped = 0
+        self.connects = 0
+        self._collector = None
+        if collect is None:
+            from headless import HeadlessCollector, snapshot_metrics
+
+            self._collector = HeadlessCollector(sample_interval_ms=int(interval_s * 1000))
+            store = self._collector.store
+
+            def collect() -> Dict[str, float]:
+                return snapshot_metrics(store)
+        self.collect = collect
+        self._ready: Optional[asyncio.Event] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    def enqueue(self, row: Row) -> None:
+        """Dopisuje wiersz do kolejki (odrzucając najstarszy, gdy jest pełna)."""
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(row)
+        if self._ready is not None and len(self.queue) >= self.batch_size:
+            self._ready.set()
+
+    def stop(self) -> None:
+        """Przerywa ``run`` (bezpieczne tylko z pętli zdarzeń agenta)."""
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run(self, duration_s: Optional[float] = None) -> None:
+        """
+        Zbiera i wysyła metryki do wywołania ``stop`` lub upływu ``duration_s``.
+
+        Przed zakończeniem próbuje wysłać wiersze pozostałe w kolejce.
+        """
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        if self._collector is not None:
+            self._collector.sampler.start()
+        sender = asyncio.create_task(self._send_loop())
+        try:
+            await self._collect_loop(duration_s)
+        finally:
+            self._stop.set()
+            self._ready.set()
+            await sender
+            if self._collector is not None:
+                self._collector.sampler.stop()
+                self._collector.executor.shutdown()
+
+    async def _collect_loop(self, duration_s: Optional[float]) -> None:
+        """Co ``interval_s`` dopisuje do kolejki wiersz bieżących metryk."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        while not self._stop.is_set():
+            try:
+                self.enqueue((time(), self.collect()))
+            except Exception:
+                logging.exception("Błąd podczas zbierania metryk agenta")
+            if duration_s is not None and loop.time() - started >= duration_s:
+                return
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send_loop(self) -> None:
+        """Utrzymuje połączenie z kolektorem i wysyła paczki wierszy."""
+        delay = self.reconnect_min_s
+        while True:
+            try:
+                _, writer = await open_connection(self.address)
+            except OSError as exc:
+                if self._stop.is_set():
+                    return
+                logging.warning(
+                    "Brak połączenia z kolektorem %s (%s), ponowna próba za %.1f s",
+                    self.address, exc, delay,
+                )
+                try:
+                    await asyncio.wait_for(self._stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, self.reconnect_max_s)
+                continue
+
+            self.connects += 1
+            delay = self.reconnect_min_s
+            try:
+                writer.write(encode_hello(self.host))
+                await self._send_batches(writer)
+                return
+            except (OSError, asyncio.IncompleteReadError, ProtocolError) as exc:
+                logging.warning("Połączenie z kolektorem zerwane: %s", exc)
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+    async def _send_batches(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Wysyła paczki, aż agent zostanie zatrzymany, a kolejka opróżniona.
+
+        Paczka ma najwyżej ``batch_size`` wierszy - kolejka zebrana podczas
+        przerwy w połączeniu jest wysyłana w wielu ramkach. Paczka, której nie
+        da się zakodować (np. ramka ponad ``MAX_PAYLOAD``), jest odrzucana.
+        """
+        flush_s = self.batch_size * self.interval_s
+        while True:
+            if len(self.queue) < self.batch_size and not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._ready.wait(), flush_s)
+                except asyncio.TimeoutError:
+                    pass
+            self._ready.clear()
+            if self.queue:
+                rows: List[Row] = list(islice(self.queue, self.batch_size))
+                try:
+                    frame = encode_batch(rows)
+                except ProtocolError as exc:
+                    logging.error("Odrzucono paczkę %d wierszy: %s", len(rows), exc)
+                    self._discard(rows[-1][0])
+                    self.dropped += len(rows)
+                    continue
+                writer.write(frame)
+                # Oczekiwanie na opróżnienie bufora gniazda - jeśli kolektor
+                # nie nadąża, wiersze gromadzą się w ograniczonej kolejce
+                await writer.drain()
+                self._discard(rows[-1][0])
+                self.sent += len(rows)
+            elif self._stop.is_set():
+                return
+
+    def _discard(self, last_t: float) -> None:
+        """Usuwa z kolejki wysłane wiersze (do chwili ``last_t`` włącznie)."""
+        # Najstarsze wiersze mogły zostać odrzucone w trakcie wysyłki
+        while self.queue and self.queue[0][0] <= last_t:
+            self.queue.popleft()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parsuje argumenty wiersza poleceń agenta."""
+    parser = argparse.ArgumentParser(
+        description="Agent wysyłający metryki do centralnego kolektora."
+    )
+    parser.add_argument(
+        "--connect", required=True,
+        help="adres kolektora: host:port lub unix:/ścieżka",
+    )
+    parser.add_argument("--name", help="nazwa hosta widoczna w kolektorze")
+    parser.add_argument(
+        "--interval-ms", type=int, default=1000,
+        help="odstęp między próbkami w milisekundach",
+    )
+    parser.add_argument(
+        "--batch", type=int, default=10,
+        help="liczba próbek wysyłanych w jednej paczce",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=None,
+        help="zakończ po tylu sekundach (domyślnie działa do przerwania)",
+    )
+    args = parser.parse_args(argv)
+    if args.interval_ms <= 0 or args.batch <= 0:
+        parser.error("interwał i rozmiar paczki muszą być dodatnie")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Punkt wejścia agenta."""
+    args = parse_args(argv)
+    agent = Agent(
+        args.connect,
+        host=args.name,
+        interval_s=args.interval_ms / 1000,
+        batch_size=args.batch,
+    )
+    try:
+        asyncio.run(agent.run(duration_s=args.duration))
+    except KeyboardInterrupt:
+        logging.info("Przerwano pracę agenta")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Centralny kolektor metryk przesyłanych przez agentów.
+
+Kolektor nasłuchuje na TCP lub gnieździe Unix i obsługuje wielu agentów
+jednocześnie w jednej pętli ``asyncio``. Dla każdego hosta przechowuje
+historię serii w buforach cyklicznych oraz ``SnapshotStore`` z ostatnimi
+odczytami w tej samej postaci co lokalne monitory - GUI może więc
+wyświetlać wybrany host tak jak maszynę lokalną::
+
+    python -m agent.collector --listen 0.0.0.0:9200
+
+Ramka jest w całości przetwarzana przed odczytem kolejnej, więc wolny
+kolektor spowalnia odczyt z gniazda, a mechanizm kontroli przepływu TCP
+przenosi to ciśnienie wstecz do agentów.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from agent.protocol import (
+    FRAME_BATCH, FRAME_HELLO, ProtocolError, decode_batch, decode_hello,
+    parse_address, read_frame,
+)
+from monitor.metrics import unflatten
+from monitor.ring_buffer import RingBuffer
+from monitor.sampler import SnapshotStore
+
+
+@dataclass
+class HostState:
+    """Historia i ostatnie odczyty jednego hosta."""
+
+    name: str
+    history_length: int
+    store: SnapshotStore = field(default_factory=SnapshotStore)
+    times: RingBuffer = field(init=False)
+    series: Dict[str, RingBuffer] = field(default_factory=dict)
+    last_t: float = float("-inf")
+    connected: bool = False
+    rows: int = 0
+
+    def __post_init__(self):
+        self.times = RingBuffer(self.history_length)
+
+    def ingest(self, times: np.ndarray, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Dopisuje wiersze paczki do historii i publikuje ostatni z nich.
+
+        Wiersze nie nowsze niż ostatni zapisany (np. ponownie wysłane po
+        zerwaniu połączenia) są pomijane.
+
+        Returns:
+            Liczba dopisanych wierszy.
+        """
+        keep = times > self.last_t
+        count = int(np.count_nonzero(keep))
+        if not count:
+            return 0
+        for name in columns:
+            if name not in self.series:
+                # Seria pojawiła się później - uzupełniamy brakujące próbki
+                buffer = RingBuffer(self.history_length)
+                buffer.extend(np.full(len(self.times), np.nan))
+                self.series[name] = buffer
+        self.times.extend(times[keep])
+        for name, buffer in self.series.items():
+            values = columns.get(name)
+            buffer.extend(values[keep] if values is not None else np.full(count, np.nan))
+
+        self.last_t = float(times[keep][-1])
+        self.rows += count
+        latest = {
+            name: float(values[keep][-1])
+            for name, values in columns.items()
+            if not np.isnan(values[keep][-1])
+        }
+        # Czas próbki agenta, a nie chwila odbioru
+        wall_ns = int(self.last_t * 1e9)
+        for task, value in unflatten(latest).items():
+            self.store.publish(task, value, wall_ns=wall_ns)
+        return count
+
+
+class Collector:
+    """
+    Serwer ``asyncio`` przyjmujący strumienie metryk od wielu agentów.
+
+    Args:
+        address: Adres nasłuchiwania (``host:port`` lub ``unix:/ścieżka``);
+            port ``0`` wybiera wolny port.
+        history_length: Liczba wierszy historii przechowywanych na host.
+    """
+    def __init__(self, address: str = "127.0.0.1:9200", history_length: int = 3600):
+        self.address = address
+        self.history_length = history_length
+        self._hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def hosts(self) -> List[str]:
+        """Zwraca nazwy hostów, od których odebrano dane."""
+        with self._lock:
+            return sorted(self._hosts)
+
+    def host(self, name: str) -> HostState:
+        """Zwraca stan hosta o podanej nazwie."""
+        with self._lock:
+            return self._hosts[name]
+
+    def history(self, name: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Zwraca kopię historii hosta: ``(czasy, {seria: wartości})``."""
+        with self._lock:
+            state = self._hosts[name]
+            return state.times.view().copy(), {
+                k: v.view().copy() for k, v in state.series.items()
+            }
+
+    @property
+    def bound_address(self) -> str:
+        """Faktyczny adres nasłuchiwania (z portem wybranym przez system)."""
+        sock = self._server.sockets[0]
+        name = sock.getsockname()
+        if isinstance(name, str):
+            return f"unix:{name}"
+        return f"{name[0]}:{name[1]}"
+
+    async def serve(self) -> None:
+        """Otwiera gniazdo nasłuchujące w bieżącej pętli zdarzeń."""
+        kind, target = parse_address(self.address)
+        if kind == "unix":
+            if os.path.exists(target):
+                os.unlink(target)
+            self._server = await asyncio.start_unix_server(self._handle, target)
+        else:
+            self._server = await asyncio.start_server(self._handle, *target)
+        logging.info("Kolektor nasłuchuje na %s", self.bound_address)
+
+    async def close(self) -> None:
+        """Zamyka gniazdo nasłuchujące."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Obsługuje połączenie jednego agenta."""
+        peer = writer.get_extra_info("peername")
+        state: Optional[HostState] = None
+        try:
+            frame_type, payload = await read_frame(reader)
+            if frame_type != FRAME_HELLO:
+                raise ProtocolError("Pierwszą ramką musi być HELLO")
+            name = decode_hello(payload)
+            with self._lock:
+                state = self._hosts.get(name)
+                if state is None:
+                    state = self._hosts[name] = HostState(name, self.history_length)
+                state.connected = True
+            logging.info("Agent %s połączony (%s)", name, peer)
+            while True:
+                frame_type, payload = await read_frame(reader)
+                if frame_type == FRAME_BATCH:
+                    times, columns = decode_batch(payload)
+                    with self._lock:
+                        state.ingest(times, columns)
+        except asyncio.IncompleteReadError:
+            pass
+        except (ProtocolError, OSError) as exc:
+            logging.warning("Zamykam połączenie z %s: %s", peer, exc)
+        finally:
+            if state is not None:
+                state.connected = False
+                logging.info("Agent %s rozłączony", state.name)
+            writer.close()
+
+    def start(self) -> None:
+        """Uruchamia kolektor we własnym wątku z pętlą zdarzeń."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run_thread, name="metrics-collector", daemon=True
+        )
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _run_thread(self) -> None:
+        """Pętla zdarzeń wątku kolektora."""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self.serve())
+        except BaseException as exc:
+            self._error = exc
+            self._started.set()
+            return
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+
+    def stop(self) -> None:
+        """Zatrzymuje kolektor uruchomiony przez ``start``."""
+        if self._thread is None:
+            return
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._thread = None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Punkt wejścia kolektora."""
+    parser = argparse.ArgumentParser(description="Kolektor metryk z wielu hostów.")
+    parser.add_argument(
+        "--listen", default="127.0.0.1:9200",
+        help="adres nasłuchiwania: host:port lub unix:/ścieżka",
+    )
+    parser.add_argument(
+        "--history", type=int, default=3600,
+        help="liczba próbek przechowywanych na host",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    async def run():
+        collector = Collector(args.listen, args.history)
+        await collector.serve()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        logging.info("Zatrzymano kolektor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Binarny protokół ramek między agentem a kolektorem.
+
+Każda ramka ma 8-bajtowy nagłówek ``<2sBBI``: znacznik ``b"RM"``, wersję
+protokołu, typ ramki i długość treści. Typy ramek:
+
+- ``HELLO`` - treść JSON z nazwą hosta agenta (pierwsza ramka połączenia),
+- ``BATCH`` - paczka wierszy zapisana kolumnowo: liczba serii i wierszy,
+  nazwy serii, a następnie tablica znaczników czasu i tablice wartości
+  (``float64``, NaN oznacza brak próbki).
+"""
+
+import asyncio
+import json
+import math
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"RM"
+VERSION = 1
+HEADER = struct.Struct("<2sBBI")
+FRAME_HELLO = 1
+FRAME_BATCH = 2
+MAX_PAYLOAD = 16 * 1024 * 1024
+
+Row = Tuple[float, Dict[str, float]]
+
+
+class ProtocolError(ValueError):
+    """Niepoprawna ramka odebrana od drugiej strony połączenia."""
+
+
+def encode_frame(frame_type: int, payload: bytes) -> bytes:
+    """Dokleja nagłówek do treści ramki."""
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"Ramka za duża: {len(payload)} B")
+    return HEADER.pack(MAGIC, VERSION, frame_type, len(payload)) + payload
+
+
+def encode_hello(host: str) -> bytes:
+    """Tworzy ramkę ``HELLO`` z nazwą hosta agenta."""
+    return encode_frame(FRAME_HELLO, json.dumps({"host": host}).encode("utf-8"))
+
+
+def encode_batch(rows: Sequence[Row]) -> bytes:
+    """
+    Koduje paczkę wierszy ``(czas, {metryka: wartość})`` w ramkę ``BATCH``.
+
+    Brakujące metryki w wierszu są zapisywane jako NaN.
+    """
+    names: List[str] = []
+    index: Dict[str, int] = {}
+    for _, values in rows:
+        for name in values:
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+
+    table = np.full((len(names), len(rows)), math.nan)
+    times = np.empty(len(rows))
+    for i, (timestamp, values) in enumerate(rows):
+        times[i] = timestamp
+        for name, value in values.items():
+            table[index[name], i] = math.nan if value is None else value
+
+    parts = [struct.pack("<HI", len(names), len(rows))]
+    for name in names:
+        encoded = name.encode("utf-8")
+        parts.append(struct.pack("<H", len(encoded)) + encoded)
+    parts.append(times.astype("<f8").tobytes())
+    parts.append(table.astype("<f8").tobytes())
+    return encode_frame(FRAME_BATCH, b"".join(parts))
+
+
+def decode_hello(payload: bytes) -> str:
+    """Zwraca nazwę hosta z treści ramki ``HELLO``."""
+    try:
+        return str(json.loads(payload.decode("utf-8"))["host"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ProtocolError(f"Niepoprawna ramka HELLO: {exc}") from exc
+
+
+def decode_batch(payload: bytes) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Dekoduje treść ramki ``BATCH``.
+
+    Returns:
+        Krotka ``(czasy, {metryka: wartości})``; tablice są widokami na
+        ``payload`` (bez kopiowania).
+    """
+    try:
+        n_names, n_rows = struct.unpack_from("<HI", payload)
+        offset = 6
+        names = []
+        for _ in range(n_names):
+            (length,) = struct.unpack_from("<H", payload, offset)
+            offset += 2
+            names.append(payload[offset:offset + length].decode("utf-8"))
+            offset += length
+        times = np.frombuffer(payload, dtype="<f8", count=n_rows, offset=offset)
+        offset += 8 * n_rows
+        table = np.frombuffer(
+            payload, dtype="<f8", count=n_names * n_rows, offset=offset
+        ).reshape(n_names, n_rows)
+    except (struct.error, ValueError) as exc:
+        raise ProtocolError(f"Niepoprawna ramka BATCH: {exc}") from exc
+    return times, dict(zip(names, table))
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """
+    Odczytuje jedną ramkę ze strumienia.
+
+    Raises:
+        asyncio.IncompleteReadError: Gdy połączenie zostało zamknięte.
+        ProtocolError: Przy niepoprawnym nagłówku lub zbyt dużej ramce.
+    """
+    header = await reader.readexactly(HEADER.size)
+    magic, version, frame_type, length = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ProtocolError("Nieznany protokół lub wersja")
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"Ramka za duża: {length} B")
+    return frame_type, await reader.readexactly(length)
+
+
+def parse_address(address: str) -> Tuple[str, object]:
+    """
+    Rozpoznaje adres ``host:port`` (TCP) lub ``unix:/ścieżka`` (gniazdo Unix).
+
+    Returns:
+        ``("unix", ścieżka)`` lub ``("tcp", (host, port))``.
+    """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Niepoprawny adres {address!r} (oczekiwano host:port)")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+async def open_connection(address: str):
+    """Otwiera połączenie TCP lub Unix wskazane adresem."""
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
@@ -0,0 +1,356 @@
+"""Silnik reguł alertów oceniany przyrostowo na odczytach wątku próbkującego.
+
+Silnik subskrybuje ``SnapshotStore`` i po każdej publikacji ocenia tylko
+metryki z nowego odczytu. Stan każdej pary (reguła, seria) przechodzi przez
+``ok -> pending -> firing -> ok``; zdarzenia powstają wyłącznie przy zmianie
+stanu (``firing``/``resolved``), więc warunek utrzymujący się przez wiele
+taktów generuje jeden alert. Zdarzenia są przekazywane do ujść
+(``alerts.sinks``), które działają we własnych wątkach - wolne ujście nie
+zatrzymuje próbkowania.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from time import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from monitor.metrics import flatten
+from monitor.sampler import Snapshot, SnapshotStore
+
+OK = "ok"
+PENDING = "pending"
+FIRING = "firing"
+RESOLVED = "resolved"
+
+
+def alert_metrics(name: str, value: Any) -> Dict[str, float]:
+    """
+    Zamienia odczyt monitora na metryki oceniane przez reguły.
+
+    Oprócz metryk z ``flatten`` udostępnia obciążenie procesów jako
+    ``PROCESS_<nazwa>[<pid>]_CPU`` i ``PROCESS_<nazwa>[<pid>]_RAM``.
+    """
+    if name == "processes" and value is not None:
+        metrics: Dict[str, float] = {}
+        for p in value:
+            metrics[f"PROCESS_{p.name}[{p.pid}]_CPU"] = p.cpu_percent
+            metrics[f"PROCESS_{p.name}[{p.pid}]_RAM"] = p.memory_percent
+        return metrics
+    return flatten(name, value)
+
+
+@dataclass
+class ThresholdRule:
+    """
+    Reguła progowa z czasem trwania i histerezą.
+
+    Alert wyzwala się, gdy wartość przekracza ``threshold`` (lub spada
+    poniżej, dla ``direction="below"``) nieprzerwanie przez ``for_s`` sekund,
+    i gaśnie dopiero, gdy wróci o ``hysteresis`` za próg - wartość krążąca
+    wokół progu nie powoduje serii alertów.
+    """
+
+    name: str
+    metric: str
+    threshold: float
+    direction: str = "above"
+    for_s: float = 0.0
+    hysteresis: float = 0.0
+    severity: str = "warning"
+
+    def value(self, series: str, timestamp: float, value: float) -> float:
+        """Wartość porównywana z progiem (dla reguły progowej - sama próbka)."""
+        return value
+
+    def breached(self, value: float) -> bool:
+        """Czy wartość narusza regułę."""
+        if self.direction == "below":
+            return value < self.threshold
+        return value > self.threshold
+
+    def cleared(self, value: float) -> bool:
+        """Czy wartość wróciła za próg z uwzględnieniem histerezy."""
+        if self.direction == "below":
+            return value >= self.threshold + self.hysteresis
+        return value <= self.threshold - self.hysteresis
+
+
+@dataclass
+class RateRule(ThresholdRule):
+    """
+    Reguła szybkości zmian: porównuje z progiem zmianę metryki na sekundę
+    wyliczoną z próbek z ostatnich ``window_s`` sekund.
+    """
+
+    window_s: float = 10.0
+    _history: Dict[str, Deque[Tuple[float, float]]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def value(self, series: str, timestamp: float, value: float) -> float:
+        """Zmiana wartości na sekundę w oknie ``window_s``."""
+        history = self._history.setdefault(series, deque())
+        history.append((timestamp, value))
+        while len(history) > 2 and timestamp - history[1][0] >= self.window_s:
+            history.popleft()
+        t0, v0 = history[0]
+        return (value - v0) / (timestamp - t0) if timestamp > t0 else 0.0
+
+
+def rule_from_dict(data: Dict[str, Any]) -> ThresholdRule:
+    """
+    Tworzy regułę z konfiguracji, np.
+    ``{"name": "cpu", "metric": "CPU", "threshold": 90, "for_s": 30}``.
+    Klucz ``"type": "rate"`` tworzy ``RateRule``.
+    """
+    data = dict(data)
+    kind = data.pop("type", "threshold")
+    if kind == "rate":
+        return RateRule(**data)
+    if kind != "threshold":
+        raise ValueError(f"Nieznany typ reguły: {kind}")
+    return ThresholdRule(**data)
+
+
+@dataclass
+class AlertEvent:
+    """Zmiana stanu alertu przekazywana do ujść."""
+
+    rule: str
+    series: str
+    state: str
+    value: float
+    threshold: float
+    severity: str
+    timestamp: float
+
+    @property
+    def message(self) -> str:
+        """Czytelny opis zdarzenia."""
+        if self.state == FIRING:
+            return (
+                f"[{self.severity}] {self.rule}: {self.series} = {self.value:.1f} "
+                f"(próg {self.threshold:g})"
+            )
+        return f"[ok] {self.rule}: {self.series} wróciło do normy ({self.value:.1f})"
+
+
+@dataclass
+class AlertState:
+    """Stan jednej pary (reguła, seria)."""
+
+    state: str = OK
+    since: float = 0.0
+    value: float = 0.0
+    resolved_at: float = float("-inf")
+
+
+class AlertEngine:
+    """
+    Ocenia reguły alertów na bieżących odczytach i powiadamia ujścia.
+
+    Args:
+        rules: Początkowe reguły.
+        sinks: Ujścia zdarzeń (obiekty z metodą ``emit``).
+        cooldown_s: Minimalny odstęp między ponownym wyzwoleniem alertu tej
+            samej serii a jego poprzednim wygaszeniem.
+    """
+    def __init__(
+        self,
+        rules: Iterable[ThresholdRule] = (),
+        sinks: Iterable[Any] = (),
+        cooldown_s: float = 0.0,
+    ):
+        self.sinks = list(sinks)
+        self.cooldown_s = cooldown_s
+        self._lock = threading.Lock()
+        self._rules: Dict[str, ThresholdRule] = {}
+        self._states: Dict[Tuple[str, str], AlertState] = {}
+        self._task_series: Dict[str, set] = {}
+        self._store: Optional[SnapshotStore] = None
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule: ThresholdRule) -> None:
+        """
+        Dodaje lub zastępuje regułę o tej samej nazwie.
+
+        Stan zastępowanej reguły jest resetowany, a jej aktywne alerty
+        wygaszane.
+        """
+        self.remove_rule(rule.name)
+        with self._lock:
+            self._rules[rule.name] = rule
+
+    def remove_rule(self, name: str) -> None:
+        """Usuwa regułę i jej stan, wygaszając jej aktywne alerty."""
+        events = []
+        with self._lock:
+            rule = self._rules.pop(name, None)
+            for key in [k for k in self._states if k[0] == name]:
+                state = self._states.pop(key)
+                if rule is not None and state.state == FIRING:
+                    events.append(self._event(rule, key[1], state, RESOLVED))
+        for event in events:
+            self._dispatch(event)
+
+    def rules(self) -> List[ThresholdRule]:
+        """Zwraca listę reguł."""
+        with self._lock:
+            return list(self._rules.values())
+
+    def active(self) -> List[AlertEvent]:
+        """Zwraca aktualnie aktywne (``firing``) alerty."""
+        with self._lock:
+            return [
+                self._event(self._rules[rule], series, state, FIRING)
+                for (rule, series), state in self._states.items()
+                if state.state == FIRING
+            ]
+
+    def attach(self, store: SnapshotStore) -> None:
+        """Subskrybuje magazyn odczytów."""
+        self._store = store
+        store.subscribe(self.on_snapshot)
+
+    def detach(self) -> None:
+        """Odłącza silnik od magazynu."""
+        if self._store is not None:
+            self._store.unsubscribe(self.on_snapshot)
+            self._store = None
+
+    def on_snapshot(self, snap: Snapshot) -> None:
+        """Ocenia reguły na metrykach jednego odczytu (subskrybent magazynu)."""
+        # Czasy trwania i nachylenia liczone na zegarze monotonicznym odczytu;
+        # czas zegarowy tylko do opisu zdarzeń
+        self.evaluate(
+            snap.name,
+            alert_metrics(snap.name, snap.value),
+            snap.mono_ns / 1e9 if snap.mono_ns else snap.timestamp,
+            wall_time=snap.wall_ns / 1e9 if snap.wall_ns else None,
+        )
+
+    def evaluate(
+        self,
+        task: str,
+        metrics: Dict[str, float],
+        timestamp: float,
+        wall_time: Optional[float] = None,
+    ) -> List[AlertEvent]:
+        """
+        Ocenia reguły na metrykach zadania ``task``.
+
+        Serie, które zadanie publikowało wcześniej, a których zabrakło w tym
+        odczycie (np. zakończony proces), są wygaszane.
+
+        Args:
+            task: Nazwa zadania próbkowania.
+            metrics: Metryki odczytu.
+            timestamp: Czas odczytu do liczenia ``for_s``, ``cooldown_s``
+                i nachyleń (najlepiej zegar monotoniczny).
+            wall_time: Czas uniksowy odczytu podawany w zdarzeniach;
+                domyślnie ``timestamp``.
+
+        Returns:
+            Zdarzenia wygenerowane przez ten odczyt.
+        """
+        wall = timestamp if wall_time is None else wall_time
+        events: List[AlertEvent] = []
+        with self._lock:
+            rules = list(self._rules.values())
+            gone = self._task_series.get(task, set()) - metrics.keys()
+            self._task_series[task] = set(metrics)
+            for series, value in metrics.items():
+                if value is None or value != value:
+                    continue
+                for rule in rules:
+                    if fnmatch.fnmatchcase(series, rule.metric):
+                        event = self._step(rule, series, timestamp, value, wall)
+                        if event is not None:
+                            events.append(event)
+            events += self._expire(rules, gone, wall)
+        for event in events:
+            self._dispatch(event)
+        return events
+
+    def _expire(
+        self, rules: List[ThresholdRule], gone: Iterable[str], wall: float
+    ) -> List[AlertEvent]:
+        """Wygasza stan serii, których zabrakło w odczycie (wywoływane pod blokadą)."""
+        events = []
+        for series in gone:
+            for rule in rules:
+                state = self._states.pop((rule.name, series), None)
+                if state is not None and state.state == FIRING:
+                    events.append(self._event(rule, series, state, RESOLVED, wall))
+                if isinstance(rule, RateRule):
+                    rule._history.pop(series, None)
+        return events
+
+    def _step(
+        self,
+        rule: ThresholdRule,
+        series: str,
+        timestamp: float,
+        raw: float,
+        wall: float,
+    ) -> Optional[AlertEvent]:
+        """Przeprowadza jedną zmianę stanu pary (reguła, seria)."""
+        key = (rule.name, series)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = AlertState()
+        value = rule.value(series, timestamp, raw)
+        state.value = value
+
+        if state.state == FIRING:
+            if rule.cleared(value):
+                state.state = OK
+                state.resolved_at = timestamp
+                return self._event(rule, series, state, RESOLVED, wall)
+            return None
+        if not rule.breached(value):
+            state.state = OK
+            return None
+        if state.state == OK:
+            state.state = PENDING
+            state.since = timestamp
+        if (
+            timestamp - state.since >= rule.for_s
+            and timestamp - state.resolved_at >= self.cooldown_s
+        ):
+            state.state = FIRING
+            return self._event(rule, series, state, FIRING, wall)
+        return None
+
+    @staticmethod
+    def _event(
+        rule: ThresholdRule,
+        series: str,
+        state: AlertState,
+        kind: str,
+        timestamp: Optional[float] = None,
+    ) -> AlertEvent:
+        """Tworzy zdarzenie ``kind`` (``firing``/``resolved``) dla pary."""
+        return AlertEvent(
+            rule=rule.name,
+            series=series,
+            state=kind,
+            value=state.value,
+            threshold=rule.threshold,
+            severity=rule.severity,
+            timestamp=time() if timestamp is None else timestamp,
+        )
+
+    def _dispatch(self, event: AlertEvent) -> None:
+        """Przekazuje zdarzenie do ujść (które nie blokują)."""
+        for sink in self.sinks:
+            try:
+                sink.emit(event)
+            except Exception:
+                logging.exception("Błąd ujścia alertów %s", type(sink).__name__)
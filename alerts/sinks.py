@@ -0,0 +1,195 @@
+"""Nieblokujące ujścia zdarzeń alertów.
+
+``AlertEngine`` wywołuje ``emit`` w wątku próbkującym, dlatego ujścia
+wykonujące wejście/wyjście (plik, HTTP) tylko wrzucają zdarzenie do
+ograniczonej kolejki obsługiwanej przez własny wątek. Przepełnienie kolejki
+lub przekroczenie limitu zdarzeń na minutę powoduje odrzucenie zdarzenia
+(z licznikiem), a nie czekanie.
+"""
+
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from time import monotonic
+from typing import Deque, Dict, List, Optional, Tuple
+
+from alerts.engine import FIRING, AlertEvent
+
+
+class ThreadedSink:
+    """
+    Abstrakcyjne ujście obsługujące zdarzenia we własnym wątku-demonie.
+
+    Args:
+        max_queue: Maksymalna liczba zdarzeń czekających na obsługę.
+        max_per_minute: Limit obsłużonych zdarzeń na minutę (``None`` -
+            bez limitu).
+    """
+    def __init__(self, max_queue: int = 1000, max_per_minute: Optional[int] = None):
+        self.max_per_minute = max_per_minute
+        self.dropped = 0
+        self.suppressed = 0
+        self._sent: Deque[float] = deque()
+        self._queue: "queue.Queue[Optional[AlertEvent]]" = queue.Queue(max_queue)
+        self._thread = threading.Thread(
+            target=self._worker, name=f"alerts-{type(self).__name__}", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, event: AlertEvent) -> None:
+        """Kolejkuje zdarzenie bez czekania (odrzuca je przy pełnej kolejce)."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def handle(self, event: AlertEvent) -> None:
+        """Obsługuje zdarzenie. Funkcja do nadpisania przez klasy potomne."""
+        raise NotImplementedError("ThreadedSink must implement handle method")
+
+    def _allowed(self) -> bool:
+        """Sprawdza limit zdarzeń na minutę (okno przesuwne)."""
+        if self.max_per_minute is None:
+            return True
+        now = monotonic()
+        while self._sent and now - self._sent[0] >= 60:
+            self._sent.popleft()
+        if len(self._sent) >= self.max_per_minute:
+            return False
+        self._sent.append(now)
+        return True
+
+    def _worker(self) -> None:
+        """Pętla wątku: obsługuje kolejne zdarzenia z kolejki."""
+        while True:
+            event = self._queue.get()
+            try:
+                if event is None:
+                    return
+                if not self._allowed():
+                    self.suppressed += 1
+                    continue
+                self.handle(event)
+            except Exception:
+                logging.exception("Błąd ujścia alertów %s", type(self).__name__)
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka na obsłużenie zakolejkowanych zdarzeń.
+
+        Returns:
+            ``True`` jeśli kolejka została opróżniona przed upływem czasu.
+        """
+        done = threading.Event()
+
+        def wait():
+            self._queue.join()
+            done.set()
+
+        threading.Thread(target=wait, daemon=True).start()
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 2.0) -> None:
+        """Kończy wątek po obsłużeniu zakolejkowanych zdarzeń."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+class LogSink(ThreadedSink):
+    """
+    Zapisuje zdarzenia do pliku dziennika (po jednym wierszu) albo,
+    bez ``filename``, do modułu ``logging``.
+    """
+    def __init__(self, filename: Optional[str] = None, **kwargs):
+        self.filename = filename
+        super().__init__(**kwargs)
+
+    def handle(self, event: AlertEvent) -> None:
+        if self.filename is None:
+            level = logging.WARNING if event.state == FIRING else logging.INFO
+            logging.log(level, "Alert: %s", event.message)
+            return
+        stamp = datetime.fromtimestamp(event.timestamp).isoformat(timespec="seconds")
+        with open(self.filename, mode='a', encoding='utf-8') as file:
+            file.write(f"{stamp} {event.message}\n")
+
+
+class WebhookSink(ThreadedSink):
+    """
+    Wysyła zdarzenia jako JSON (``POST``) na podany adres HTTP.
+
+    Args:
+        url: Adres webhooka.
+        timeout: Limit czasu jednego żądania w sekundach.
+        **kwargs: Parametry ``ThreadedSink`` (domyślnie 30 zdarzeń na
+            minutę).
+    """
+    def __init__(self, url: str, timeout: float = 5.0, **kwargs):
+        self.url = url
+        self.timeout = timeout
+        kwargs.setdefault("max_per_minute", 30)
+        super().__init__(**kwargs)
+
+    def handle(self, event: AlertEvent) -> None:
+        # http.client i ssl są potrzebne tylko przy skonfigurowanym webhooku
+        import urllib.request
+
+        body = json.dumps({**asdict(event), "message": event.message}).encode("utf-8")
+        request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except OSError as exc:
+            logging.warning("Nie można wysłać alertu do %s: %s", self.url, exc)
+
+
+class BannerSink:
+    """
+    Ujście dla paska alertów w GUI: przechowuje aktywne alerty w pamięci.
+
+    ``emit`` tylko aktualizuje słownik, a wątek GUI odczytuje ``messages``
+    przy odświeżaniu - żadne okno modalne nie blokuje pętli wykresów.
+    """
+    def __init__(self, limit: int = 3):
+        """
+        Args:
+            limit: Maksymalna liczba komunikatów zwracanych przez ``text``.
+        """
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._active: Dict[Tuple[str, str], AlertEvent] = {}
+        self.version = 0
+
+    def emit(self, event: AlertEvent) -> None:
+        with self._lock:
+            key = (event.rule, event.series)
+            if event.state == FIRING:
+                self._active[key] = event
+            else:
+                self._active.pop(key, None)
+            self.version += 1
+
+    def messages(self) -> List[str]:
+        """Zwraca komunikaty aktywnych alertów (najnowsze pierwsze)."""
+        with self._lock:
+            events = sorted(self._active.values(), key=lambda e: -e.timestamp)
+        return [e.message for e in events]
+
+    def text(self) -> str:
+        """Zwraca tekst paska alertów (pusty, gdy brak alertów)."""
+        messages = self.messages()
+        if len(messages) > self.limit:
+            rest = len(messages) - self.limit
+            messages = messages[:self.limit] + [f"... i {rest} więcej"]
+        return " | ".join(messages)
@@ -0,0 +1,267 @@
+"""Przypadki pomiarowe: monitory, bufory, rysowanie i eksportery.
+
+Rozmiary danych podane w parametrach dotyczą ``scale=1``; przebieg
+z ``--scale 0.1`` mierzy dziesięciokrotnie mniejsze dane.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from unittest import mock
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import psutil  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from benchmarks.harness import benchmark  # noqa: E402
+from exporter.exporters import JSONExporter, MultiMetricExporter, NPZExporter  # noqa: E402
+from exporter.streaming import CSVStreamExporter, JSONLinesExporter  # noqa: E402
+from gui.renderer import BlitRenderer, make_fill  # noqa: E402
+from monitor.batch import SeriesIndex  # noqa: E402
+from monitor.cpu_monitor import CPUMonitor  # noqa: E402
+from monitor.disk_io_monitor import DiskIOMonitor  # noqa: E402
+from monitor.disk_monitor import DiskMonitor, DiskUsage  # noqa: E402
+from monitor.gpu_monitor import GPUMonitor  # noqa: E402
+from monitor.memory_monitor import MemoryMonitor  # noqa: E402
+from monitor.network_monitor import NetworkMonitor  # noqa: E402
+from monitor.nic_monitor import NICMonitor  # noqa: E402
+from monitor.process_monitor import ProcessMonitor  # noqa: E402
+from monitor.ring_buffer import RingBuffer  # noqa: E402
+
+EXPORT_COLUMNS = ("CPU", "RAM", "DISK_/", "NET_UP", "NET_DOWN")
+
+
+def _scaled(n: int, scale: float) -> int:
+    """Rozmiar danych przeskalowany przez ``scale`` (co najmniej 1)."""
+    return max(1, int(n * scale))
+
+
+# Monitory systemowe (odczyt rzeczywistego systemu)
+
+MONITORS = {
+    "cpu": CPUMonitor,
+    "ram": MemoryMonitor,
+    "disk": DiskMonitor,
+    "gpu": GPUMonitor,
+    "network": NetworkMonitor,
+    "nic": NICMonitor,
+    "diskio": DiskIOMonitor,
+}
+
+
+def _monitor_case(factory):
+    def case(scale):
+        monitor = factory()
+        monitor.get_usage()
+        yield monitor.get_usage, 1
+    return case
+
+
+for _name, _factory in MONITORS.items():
+    benchmark(f"monitor.{_name}", "monitor")(_monitor_case(_factory))
+
+
+# Tabela procesów
+
+class _FakeProcess:
+    """Proces o stałych wartościach - bez odczytu ``/proc``."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._cpu = (pid * 7919) % 1000 / 10
+        self._mem = (pid * 104729) % 1000 / 10
+
+    @contextmanager
+    def oneshot(self):
+        yield
+
+    def name(self):
+        return f"proc{self.pid}"
+
+    def cpu_percent(self, interval=None):
+        return self._cpu
+
+    def memory_percent(self):
+        return self._mem
+
+
+@contextmanager
+def _synthetic_processes(count: int):
+    """Podmienia ``psutil`` na tabelę ``count`` sztucznych procesów."""
+    table = {pid: _FakeProcess(pid) for pid in range(1, count + 1)}
+    with mock.patch.object(psutil, "pids", lambda: list(table)), \
+            mock.patch.object(psutil, "Process", table.__getitem__):
+        yield
+
+
+@benchmark("process.top_processes", "process", processes=10_000)
+def bench_top_processes(scale):
+    count = _scaled(10_000, scale)
+    with _synthetic_processes(count):
+        monitor = ProcessMonitor()
+        monitor.refresh()
+        yield monitor.get_top_processes, count
+
+
+# Bufory cykliczne
+
+@benchmark("buffer.append", "buffer", samples=10_000)
+def bench_buffer_append(scale):
+    count = _scaled(10_000, scale)
+    buffer = RingBuffer(3600)
+
+    def append():
+        for i in range(count):
+            buffer.append(i)
+    yield append, count
+
+
+@benchmark("buffer.view", "buffer", capacity=3600)
+def bench_buffer_view(scale):
+    buffer = RingBuffer(3600)
+    buffer.extend(np.arange(5000.0))
+    yield buffer.view, 3600
+
+
+@benchmark("buffer.trim", "buffer", capacity=86_400)
+def bench_buffer_trim(scale):
+    capacity = _scaled(86_400, scale)
+    buffer = RingBuffer(capacity)
+    buffer.extend(np.arange(capacity, dtype=np.float64))
+
+    def trim():
+        buffer.resize(capacity // 2)
+        buffer.resize(capacity)
+    yield trim, capacity
+
+
+@benchmark("tick.pack", "buffer", disks=64)
+def bench_tick_pack(scale):
+    disks = _scaled(64, scale)
+    readings = {
+        "disk": [DiskUsage(percent=float(i), used=0, total=1, mount=f"/mnt/d{i}")
+                 for i in range(disks)],
+    }
+    index = SeriesIndex([f"DISK_{u.mount}" for u in readings["disk"]])
+    buffer = RingBuffer(3600, width=len(index))
+    row = np.empty(len(index))
+
+    def tick():
+        buffer.append(index.pack(readings, 0.0, out=row).values)
+    yield tick, 1
+
+
+# Rysowanie (backend Agg)
+
+def _renderer(subplots: int, points: int):
+    """Buduje renderer z ``subplots`` wykresami i danymi ``points`` próbek."""
+    fig = Figure(figsize=(12, 8))
+    canvas = FigureCanvasAgg(fig)
+    renderer = BlitRenderer(canvas)
+    cols = int(np.ceil(np.sqrt(subplots)))
+    rows = int(np.ceil(subplots / cols))
+    for i in range(subplots):
+        ax = fig.add_subplot(rows, cols, i + 1)
+        ax.set_ylim(0, 100)
+        line, = ax.plot([], [])
+        renderer.add(f"S{i}", line, make_fill(ax, "blue"))
+    renderer.set_xlim(-(points - 1), 0)
+    x = np.arange(-(points - 1), 1, dtype=np.float64)
+    y = np.random.default_rng(0).uniform(0, 100, (subplots, points))
+    return canvas, renderer, x, y
+
+
+@benchmark("render.refresh_plot", "render", subplots=16, points=3600)
+def bench_refresh_plot(scale):
+    _, renderer, x, y = _renderer(16, 3600)
+    renderer.draw()
+
+    def refresh():
+        for i in range(len(y)):
+            renderer.update(f"S{i}", x, y[i])
+    yield refresh, len(y)
+
+
+@benchmark("render.blit", "render", subplots=16, points=3600)
+def bench_blit(scale):
+    _, renderer, x, y = _renderer(16, 3600)
+    for i in range(len(y)):
+        renderer.update(f"S{i}", x, y[i])
+    renderer.draw()
+    yield renderer.draw, 1
+
+
+@benchmark("render.canvas_draw", "render", subplots=16, points=3600)
+def bench_canvas_draw(scale):
+    canvas, renderer, x, y = _renderer(16, 3600)
+    for i in range(len(y)):
+        renderer.update(f"S{i}", x, y[i])
+    yield canvas.draw, 1
+
+
+# Eksportery
+
+def _export_data(rows: int):
+    x = np.arange(rows, dtype=np.int64)
+    rng = np.random.default_rng(0)
+    return x, {name: rng.uniform(0, 100, rows) for name in EXPORT_COLUMNS}
+
+
+@contextmanager
+def _tempfile(suffix: str):
+    directory = tempfile.TemporaryDirectory(prefix="bench-")
+    try:
+        yield os.path.join(directory.name, f"out{suffix}")
+    finally:
+        directory.cleanup()
+
+
+def _exporter_case(exporter, suffix):
+    def case(scale):
+        x, metrics = _export_data(_scaled(1_000_000, scale))
+        with _tempfile(suffix) as filename:
+            yield (lambda: exporter.export(filename, x, metrics)), len(x)
+    return case
+
+
+for _name, _exporter, _suffix in (
+    ("csv", MultiMetricExporter(), ".csv"),
+    ("json", JSONExporter(), ".json"),
+    ("npz", NPZExporter(), ".npz"),
+):
+    benchmark(f"exporter.{_name}", "exporter", min_calls=1, rows=1_000_000)(
+        _exporter_case(_exporter, _suffix)
+    )
+
+
+def _stream_case(factory, suffix):
+    def case(scale):
+        x, metrics = _export_data(_scaled(1_000_000, scale))
+        names = list(metrics)
+        rows = np.column_stack([metrics[n] for n in names]).tolist()
+        with _tempfile(suffix) as filename:
+            def write():
+                if os.path.exists(filename):
+                    # Strumień dopisuje - każdy pomiar zaczyna od pustego pliku
+                    os.unlink(filename)
+                with factory(filename) as stream:
+                    for t, row in zip(x.tolist(), rows):
+                        stream.write(t, dict(zip(names, row)))
+            yield write, len(x)
+    return case
+
+
+for _name, _factory, _suffix in (
+    ("csv_stream", CSVStreamExporter, ".csv"),
+    ("jsonl_stream", JSONLinesExporter, ".jsonl"),
+):
+    benchmark(f"exporter.{_name}", "exporter", min_calls=1, rows=1_000_000)(
+        _stream_case(_factory, _suffix)
+    )
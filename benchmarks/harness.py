@@ -0,0 +1,283 @@
+"""Pomiar wydajności i porównanie z zapisanym punktem odniesienia.
+
+Przypadki testowe rejestruje dekorator ``benchmark``. Funkcja przypadku
+jest generatorem: przygotowuje dane (czas przygotowania nie jest mierzony),
+zwraca przez ``yield`` mierzoną funkcję i liczbę elementów przetwarzanych
+w jednym wywołaniu, a po pomiarze sprząta (kod po ``yield``)::
+
+    @benchmark("buffer.append", "buffer", samples=10_000)
+    def bench_append(scale):
+        buffer = RingBuffer(3600)
+        yield lambda: [buffer.append(1.0) for _ in range(10_000)], 10_000
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+Case = Callable[[float], Iterator[Tuple[Callable[[], Any], int]]]
+
+
+@dataclass
+class Benchmark:
+    """Zarejestrowany przypadek pomiaru."""
+
+    name: str
+    group: str
+    case: Case
+    params: Dict[str, Any] = field(default_factory=dict)
+    min_calls: int = 3
+    min_time_s: float = 0.2
+
+
+@dataclass
+class BenchResult:
+    """Wynik pomiaru jednego przypadku (czasy jednego wywołania)."""
+
+    name: str
+    group: str
+    params: Dict[str, Any]
+    calls: int
+    items: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    p95_ms: float
+
+    @property
+    def throughput(self) -> float:
+        """Liczba elementów przetwarzanych na sekundę (wg mediany)."""
+        return self.items / (self.median_ms / 1000) if self.median_ms > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Zwraca wynik jako słownik JSON (z przepustowością)."""
+        return {**asdict(self), "throughput": self.throughput}
+
+
+@dataclass
+class Regression:
+    """Przypadek wolniejszy od punktu odniesienia o więcej niż tolerancja."""
+
+    name: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        """Stosunek bieżącego czasu do czasu odniesienia."""
+        return self.current_ms / self.baseline_ms
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str,
+    group: str,
+    min_calls: int = 3,
+    min_time_s: float = 0.2,
+    **params: Any,
+) -> Callable[[Case], Case]:
+    """
+    Rejestruje przypadek pomiaru.
+
+    Args:
+        name: Unikalna nazwa przypadku, np. ``exporter.csv``.
+        group: Grupa przypadków w raporcie.
+        min_calls: Minimalna liczba mierzonych wywołań.
+        min_time_s: Minimalny łączny czas pomiaru.
+        **params: Parametry przypadku zapisywane w wynikach (np. liczba
+            wierszy przy ``scale=1``); wyniki o różnych parametrach lub
+            skali nie są porównywane.
+    """
+    def decorator(case: Case) -> Case:
+        BENCHMARKS[name] = Benchmark(name, group, case, params, min_calls, min_time_s)
+        return case
+    return decorator
+
+
+def measure(
+    func: Callable[[], Any],
+    min_calls: int = 3,
+    min_time_s: float = 0.2,
+    max_calls: int = 10_000,
+) -> List[float]:
+    """
+    Wywołuje funkcję wielokrotnie i zwraca czasy wywołań w milisekundach.
+
+    Pomiar trwa co najmniej ``min_calls`` wywołań i ``min_time_s`` sekund
+    (ale nie więcej niż ``max_calls`` wywołań).
+    """
+    times: List[float] = []
+    total = 0.0
+    while len(times) < max_calls and (len(times) < min_calls or total < min_time_s):
+        start = perf_counter()
+        func()
+        elapsed = perf_counter() - start
+        total += elapsed
+        times.append(elapsed * 1000)
+    return times
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Percentyl ``q`` (0-1) metodą najbliższej rangi."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def run_benchmark(bench: Benchmark, scale: float = 1.0) -> BenchResult:
+    """
+    Przygotowuje i mierzy jeden przypadek.
+
+    Args:
+        bench: Przypadek do zmierzenia.
+        scale: Mnożnik rozmiaru danych (np. ``0.1`` dla szybkiego przebiegu).
+    """
+    setup = bench.case(scale)
+    try:
+        func, items = next(setup)
+        times = measure(func, bench.min_calls, bench.min_time_s)
+        # Wznowienie generatora wykonuje sprzątanie po ``yield``
+        next(setup, None)
+    finally:
+        setup.close()
+    return BenchResult(
+        name=bench.name,
+        group=bench.group,
+        params={**bench.params, "scale": scale},
+        calls=len(times),
+        items=items,
+        min_ms=min(times),
+        median_ms=statistics.median(times),
+        mean_ms=statistics.fmean(times),
+        p95_ms=_percentile(times, 0.95),
+    )
+
+
+def run_benchmarks(
+    patterns: Optional[List[str]] = None,
+    scale: float = 1.0,
+    progress: Optional[Callable[[BenchResult], None]] = None,
+) -> List[BenchResult]:
+    """
+    Mierzy zarejestrowane przypadki pasujące do wzorców ``fnmatch``.
+
+    Args:
+        patterns: Wzorce nazw (np. ``exporter.*``); ``None`` - wszystkie.
+        scale: Mnożnik rozmiaru danych.
+        progress: Funkcja wywoływana po każdym pomiarze.
+    """
+    results = []
+    for name, bench in BENCHMARKS.items():
+        if patterns and not any(fnmatch.fnmatchcase(name, p) for p in patterns):
+            continue
+        result = run_benchmark(bench, scale)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+def results_document(results: List[BenchResult], scale: float) -> Dict[str, Any]:
+    """Buduje dokument JSON z wynikami i opisem środowiska."""
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "scale": scale,
+        },
+        "results": {r.name: r.to_dict() for r in results},
+    }
+
+
+def save_results(filename: str, results: List[BenchResult], scale: float) -> None:
+    """Zapisuje wyniki do pliku JSON."""
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(results_document(results, scale), file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load_baseline(filename: str) -> Dict[str, Dict[str, Any]]:
+    """Wczytuje wyniki odniesienia (``{nazwa: wynik}``) z pliku JSON."""
+    with open(filename, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def compare(
+    results: List[BenchResult],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = 0.25,
+    min_delta_ms: float = 0.01,
+) -> List[Regression]:
+    """
+    Wskazuje przypadki wolniejsze od odniesienia.
+
+    Porównywane są najkrótsze czasy wywołania (jak w ``timeit`` - są
+    najmniej wrażliwe na obciążenie maszyny innymi procesami); przypadki
+    nieobecne w odniesieniu lub zmierzone z innymi parametrami są pomijane.
+
+    Args:
+        results: Bieżące wyniki.
+        baseline: Wyniki odniesienia z ``load_baseline``.
+        tolerance: Dopuszczalne spowolnienie (``0.25`` - o 25%).
+        min_delta_ms: Spowolnienia mniejsze w liczbach bezwzględnych są
+            pomijane (szum pomiaru wywołań trwających mikrosekundy).
+    """
+    regressions = []
+    for result in results:
+        ref = baseline.get(result.name)
+        if ref is None or ref.get("params") != result.params:
+            continue
+        limit = max(ref["min_ms"] * (1 + tolerance), ref["min_ms"] + min_delta_ms)
+        if result.min_ms > limit:
+            regressions.append(Regression(result.name, ref["min_ms"], result.min_ms))
+    return regressions
+
+
+def format_report(
+    results: List[BenchResult],
+    baseline: Optional[Dict[str, Dict[str, Any]]] = None,
+    regressions: Optional[List[Regression]] = None,
+) -> str:
+    """
+    Formatuje wyniki jako tabelę tekstową.
+
+    Kolumna ``odniesienie`` pokazuje zmianę najkrótszego czasu względem
+    odniesienia; ``!`` oznacza regresję.
+    """
+    baseline = baseline or {}
+    slow = {r.name for r in regressions or []}
+    lines = [
+        f"{'przypadek':<32} {'wywołań':>8} {'min ms':>10} {'mediana ms':>11} "
+        f"{'p95 ms':>10} {'elem./s':>12} {'odniesienie':>11}"
+    ]
+    for r in results:
+        ref = baseline.get(r.name)
+        delta = ""
+        if ref is not None and ref.get("params") == r.params and ref["min_ms"] > 0:
+            delta = f"{(r.min_ms / ref['min_ms'] - 1) * 100:+.0f}%"
+            if r.name in slow:
+                delta += " !"
+        lines.append(
+            f"{r.name:<32} {r.calls:>8} {r.min_ms:>10.3f} {r.median_ms:>11.3f} "
+            f"{r.p95_ms:>10.3f} {r.throughput:>12.0f} {delta:>11}"
+        )
+    if regressions:
+        lines.append("")
+        lines.append(f"Regresje wydajności: {len(regressions)}")
+        for reg in regressions:
+            lines.append(
+                f"  {reg.name}: {reg.baseline_ms:.3f} ms -> {reg.current_ms:.3f} ms "
+                f"(x{reg.ratio:.2f})"
+            )
+    return "\n".join(lines) + "\n"
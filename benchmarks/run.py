@@ -0,0 +1,100 @@
+"""Uruchamia pomiary wydajności i porównuje je z punktem odniesienia.
+
+::
+
+    python -m benchmarks.run                       # wszystkie przypadki
+    python -m benchmarks.run -k "exporter.*" --scale 0.1
+    python -m benchmarks.run --update-baseline     # zapis nowego odniesienia
+
+Raport tekstowy trafia do ``bench_output.txt``, wyniki w JSON - do pliku
+``--json``. Gdy któryś przypadek jest wolniejszy od odniesienia o więcej niż
+``--tolerance``, program kończy się kodem 1. Odniesienie zależy od maszyny;
+po zmianie sprzętu należy je odświeżyć (``--update-baseline``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks import cases  # noqa: F401 - rejestruje przypadki
+from benchmarks.harness import (
+    compare,
+    format_report,
+    load_baseline,
+    run_benchmarks,
+    save_results,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_OUTPUT = ROOT / "bench_output.txt"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parsuje argumenty wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Pomiary wydajności monitora zasobów.")
+    parser.add_argument(
+        "-k", dest="patterns", action="append",
+        help="mierz tylko przypadki pasujące do wzorca (np. 'render.*')",
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="mnożnik rozmiaru danych (np. 0.1 dla szybkiego przebiegu)",
+    )
+    parser.add_argument("--json", help="zapisz wyniki w formacie JSON")
+    parser.add_argument(
+        "--baseline", default=str(DEFAULT_BASELINE),
+        help="plik wyników odniesienia",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true",
+        help="zapisz wyniki jako nowe odniesienie zamiast porównywać",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="dopuszczalne spowolnienie względem odniesienia (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--output", default=str(DEFAULT_OUTPUT),
+        help="plik raportu tekstowego",
+    )
+    args = parser.parse_args(argv)
+    if args.scale <= 0 or args.tolerance < 0:
+        parser.error("skala musi być dodatnia, a tolerancja nieujemna")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punkt wejścia; zwraca kod wyjścia (1 przy regresji)."""
+    args = parse_args(argv)
+    results = run_benchmarks(
+        args.patterns,
+        scale=args.scale,
+        progress=lambda r: logging.info("%s: %.3f ms", r.name, r.median_ms),
+    )
+    if args.json:
+        save_results(args.json, results, args.scale)
+
+    baseline = {}
+    regressions = []
+    if args.update_baseline:
+        save_results(args.baseline, results, args.scale)
+    elif os.path.exists(args.baseline):
+        baseline = load_baseline(args.baseline)
+        regressions = compare(results, baseline, args.tolerance)
+
+    report = format_report(results, baseline, regressions)
+    with open(args.output, "w", encoding="utf-8") as file:
+        file.write(report)
+    print(report, end="")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
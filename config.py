@@ -2,8 +2,12 @@
 
 This module provides helper functions to persist and retrieve user settings
 from a ``config.json`` file located in the repository root. The configuration
-currently stores the update interval, history length and threshold values used
-by the application.
+currently stores the update and sampling intervals, history length, threshold values,
+the optional on-disk storage directory, whether the application publishes
+its own timing metrics, the number of processes listed in the process table
+and the optional address on which it collects metrics
+streamed by remote agents. Alert rules, the alert log file, an optional
+webhook URL and the re-alert cooldown are stored as well.
 """
 
 from __future__ import annotations
@@ -19,9 +23,19 @@ CONFIG_FILE = Path(__file__).with_name("config.json")
 # Default configuration used when the file does not exist or is invalid.
 DEFAULT_CONFIG: Dict[str, Any] = {
     "update_interval_ms": 1000,
+    "sample_interval_ms": 1000,
     "history_length": 60,
     "cpu_threshold": 90,
     "ram_threshold": 90,
+    "storage_dir": None,
+    "self_metrics": False,
+    "io_metrics": False,
+    "process_rows": 200,
+    "collector_listen": None,
+    "alert_rules": [],
+    "alert_log": None,
+    "alert_webhook": None,
+    "alert_cooldown_s": 30,
 }
 
 
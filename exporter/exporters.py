@@ -1,6 +1,21 @@
 import csv
 import json
-from typing import List, Dict
+import socket
+import struct
+import zipfile
+from time import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from monitor.instrumentation import INSTRUMENTATION
+from monitor.registry import REGISTRY
+
+
+def _to_list(values: Any) -> list:
+    """Zamienia tablice NumPy (np. widoki buforów) na listy dla JSON."""
+    return values.tolist() if hasattr(values, "tolist") else list(values)
 
 
 class Exporter:
@@ -8,7 +23,14 @@ class Exporter:
     Abstrakcyjna klasa bazowa dla eksporterów danych metryk.
 
     Pozwala na eksport danych do pliku (np. CSV) dla różnych rodzajów metryk.
+    Czas każdego wywołania ``export`` klasy potomnej jest mierzony jako
+    operacja ``export.<NazwaKlasy>``.
     """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "export" in cls.__dict__:
+            cls.export = INSTRUMENTATION.wrap(f"export.{cls.__name__}", cls.export)
+
     def export(self, filename: str, x_data: List[int], y_data: List[float]):
         """
         Eksportuje dane do pliku. Funkcja do nadpisania przez klasy potomne.
@@ -136,6 +158,40 @@ class NetworkExporter(Exporter):
             raise RuntimeError(f"Nie można zapisać pliku {filename}: {exc}") from exc
 
 
+class SeriesExporter(Exporter):
+    """
+    Eksporter pojedynczej serii do pliku CSV.
+
+    Nagłówek kolumny pochodzi ze schematu serii monitora, więc eksport nowej
+    metryki nie wymaga osobnej klasy.
+
+    Args:
+        label: Etykieta kolumny, np. ``Dysk / (%)``.
+    """
+    def __init__(self, label: str):
+        self.label = label
+
+    def export(self, filename: str, x_data: List[int], y_data: List[float]):
+        """
+        Eksportuje serię do pliku CSV.
+        """
+        try:
+            with open(filename, mode='w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(["Czas (s)", self.label])
+                writer.writerows(zip(x_data, y_data))
+        except OSError as exc:
+            raise RuntimeError(f"Nie można zapisać pliku {filename}: {exc}") from exc
+
+    @classmethod
+    def for_series(cls, name: str) -> "SeriesExporter":
+        """Tworzy eksporter z etykietą i jednostką ze schematu serii ``name``."""
+        match = REGISTRY.describe(name)
+        if match is None:
+            return cls(name)
+        return cls(f"{match.title} ({match.schema.unit})")
+
+
 class MultiMetricExporter(Exporter):
     """
     Eksporter wielu metryk jednocześnie do jednego pliku CSV.
@@ -183,6 +239,126 @@ class JSONExporter(Exporter):
         """Zapisuje dane do pliku JSON."""
         try:
             with open(filename, mode='w', encoding='utf-8') as file:
-                json.dump({"x_data": x_data, "metrics": metrics}, file)
+                json.dump(
+                    {
+                        "x_data": _to_list(x_data),
+                        "metrics": {k: _to_list(v) for k, v in metrics.items()},
+                    },
+                    file,
+                )
         except OSError as exc:
             raise RuntimeError(f"Nie można zapisać pliku {filename}: {exc}") from exc
+
+
+NPZ_META_KEY = "__meta__"
+
+
+def _series_unit(name: str) -> str:
+    """Jednostka metryki ze schematu serii (pusta dla nieznanych metryk)."""
+    match = REGISTRY.describe(name)
+    return match.schema.unit if match is not None else ""
+
+
+class NPZExporter(Exporter):
+    """
+    Kolumnowy eksport wszystkich metryk do jednego pliku NumPy ``.npz``.
+
+    Każda seria jest osobną, typowaną kolumną zapisywaną jednym blokiem
+    (bez formatowania tekstu wartość po wartości). Plik zawiera też
+    metadane JSON: host, jednostki, punkty montowania i nazwy GPU.
+    Nieskompresowany plik można odczytać bez kopiowania przez ``load_npz``.
+
+    Args:
+        compress: Czy kompresować kolumny (mniejszy plik, ale odczyt
+            wymaga dekompresji zamiast mapowania pamięci).
+        dtype: Typ kolumn wartości, np. ``float32`` dla o połowę mniejszego
+            pliku.
+    """
+    def __init__(self, compress: bool = False, dtype=np.float64):
+        self.compress = compress
+        self.dtype = np.dtype(dtype)
+
+    def export(
+        self,
+        filename: str,
+        x_data: List[int],
+        metrics: Dict[str, List[float]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Zapisuje oś czasu i wszystkie metryki do pliku ``.npz``.
+
+        Args:
+            filename: Nazwa pliku.
+            x_data: Oś czasu.
+            metrics: Słownik metryk (nazwa: wartości).
+            metadata: Dodatkowe metadane dołączane do pliku.
+        """
+        x = np.asarray(x_data)
+        columns = {"x": x}
+        for name, values in metrics.items():
+            columns[quote(name, safe="")] = np.asarray(values, dtype=self.dtype)
+        meta = {
+            "host": socket.gethostname(),
+            "created": time(),
+            "series": list(metrics),
+            "units": {name: _series_unit(name) for name in metrics},
+            "mounts": [n[len("DISK_"):] for n in metrics if n.startswith("DISK_")],
+            "gpus": [n[len("GPU_"):] for n in metrics if n.startswith("GPU_")],
+            **(metadata or {}),
+        }
+        columns[NPZ_META_KEY] = np.array(json.dumps(meta))
+        save = np.savez_compressed if self.compress else np.savez
+        try:
+            with open(filename, mode='wb') as file:
+                save(file, **columns)
+        except OSError as exc:
+            raise RuntimeError(f"Nie można zapisać pliku {filename}: {exc}") from exc
+
+
+def _member_offset(file, info: zipfile.ZipInfo) -> int:
+    """Zwraca pozycję danych składnika archiwum ZIP w pliku."""
+    file.seek(info.header_offset)
+    header = file.read(30)
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    return info.header_offset + 30 + name_len + extra_len
+
+
+def load_npz(
+    filename: str, mmap: bool = True
+) -> Tuple[np.ndarray, Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Wczytuje plik zapisany przez ``NPZExporter``.
+
+    Kolumny nieskompresowanego pliku są mapowane do pamięci (bez kopiowania
+    i bez wczytywania całego pliku); skompresowane są dekompresowane.
+
+    Args:
+        filename: Nazwa pliku ``.npz``.
+        mmap: Czy mapować nieskompresowane kolumny do pamięci.
+
+    Returns:
+        Krotka ``(x, metryki, metadane)``.
+    """
+    columns: Dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(filename) as archive, open(filename, 'rb') as file:
+        for info in archive.infolist():
+            key = unquote(info.filename[:-len(".npy")])
+            if mmap and info.compress_type == zipfile.ZIP_STORED and key != NPZ_META_KEY:
+                file.seek(_member_offset(file, info))
+                version = np.lib.format.read_magic(file)
+                read_header = (
+                    np.lib.format.read_array_header_1_0 if version == (1, 0)
+                    else np.lib.format.read_array_header_2_0
+                )
+                shape, fortran, dtype = read_header(file)
+                columns[key] = np.memmap(
+                    filename, dtype=dtype, mode='r', offset=file.tell(),
+                    shape=shape, order='F' if fortran else 'C',
+                )
+            else:
+                with archive.open(info) as member:
+                    columns[key] = np.lib.format.read_array(member)
+    meta = json.loads(str(columns.pop(NPZ_META_KEY, "{}")))
+    x = columns.pop("x")
+    return x, {name: columns[name] for name in meta.get("series", columns)}, meta
@@ -0,0 +1,269 @@
+"""Wbudowany serwer HTTP z metrykami w formacie Prometheus.
+
+Serwer nie wywołuje monitorów: treść odpowiedzi ``/metrics`` jest
+renderowana raz na takt zbierania (``MetricsServer.refresh``) z ostatnich
+odczytów w ``SnapshotStore`` i przechowywana jako gotowe bajty. Dowolna
+liczba klientów odpytujących serwer nie zwiększa więc obciążenia.
+
+Endpointy:
+
+- ``/metrics`` - ostatnie odczyty w formacie tekstowym Prometheus,
+- ``/api/history?series=CPU,RAM&start=..&end=..&max_points=..`` - historia
+  wybranych serii w JSON (``{"t": [...], "series": {...}}``).
+"""
+
+import json
+import logging
+import math
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from monitor.instrumentation import INSTRUMENTATION
+from monitor.metrics import flatten
+from monitor.registry import REGISTRY
+from monitor.sampler import SnapshotStore
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "resource_monitor"
+
+# (nazwa, etykiety) -> metryka Prometheus
+Sample = Tuple[str, Dict[str, str]]
+# (nazwy, start, koniec, max punktów) -> (czas, {seria: wartości})
+HistorySource = Callable[
+    [Optional[List[str]], Optional[float], Optional[float], Optional[int]],
+    Tuple[np.ndarray, Dict[str, np.ndarray]],
+]
+
+_SELF_STATS = ("calls", "errors", "mean_ms", "p95_ms", "max_ms")
+_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def prometheus_sample(name: str) -> Sample:
+    """
+    Zamienia nazwę metryki aplikacji na nazwę i etykiety Prometheus.
+
+    Nazwa i etykiety wynikają ze schematu serii monitora (``family``,
+    ``label``, ``labels``); metryki ``SELF_...`` są rozkładane na
+    statystykę i operację.
+
+    Args:
+        name: Nazwa metryki, np. ``CPU``, ``DISK_/`` lub ``NET_UP``.
+
+    Returns:
+        Krotka ``(nazwa metryki, etykiety)``.
+    """
+    match = REGISTRY.describe(name)
+    if match is not None:
+        schema = match.schema
+        labels = dict(schema.labels)
+        if schema.key is not None:
+            labels[schema.label or schema.key] = match.key
+        family = schema.family or f"{match.spec.task}_{schema.field}"
+        return f"{PREFIX}_{family}", labels
+    if name.startswith("SELF_"):
+        for stat in _SELF_STATS:
+            if name.endswith(f"_{stat}"):
+                operation = name[len("SELF_"):-len(stat) - 1]
+                return f"{PREFIX}_self_{stat}", {"operation": operation}
+    return f"{PREFIX}_{_INVALID.sub('_', name).lower()}", {}
+
+
+def _families() -> Dict[str, Tuple[str, str]]:
+    """Zwraca ``metryka Prometheus: (opis, typ)`` ze schematów serii."""
+    families = {}
+    for spec in REGISTRY.specs():
+        for schema in spec.series:
+            family = schema.family or f"{spec.task}_{schema.field}"
+            families[f"{PREFIX}_{family}"] = (schema.description, schema.kind)
+    return families
+
+
+def _escape(value: str) -> str:
+    """Escapuje wartość etykiety zgodnie z formatem tekstowym."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Formatuje wartość próbki (z obsługą NaN i nieskończoności)."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_prometheus(values: Dict[str, float]) -> bytes:
+    """
+    Renderuje metryki w formacie tekstowym Prometheus.
+
+    Args:
+        values: Słownik ``metryka: wartość`` (jak z ``flatten``).
+
+    Returns:
+        Treść odpowiedzi ``/metrics``.
+    """
+    families: Dict[str, List[str]] = {}
+    for name, value in values.items():
+        if value is None:
+            continue
+        metric, labels = prometheus_sample(name)
+        label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        sample = f"{metric}{{{label_text}}}" if label_text else metric
+        families.setdefault(metric, []).append(f"{sample} {_format_value(value)}")
+
+    known = _families()
+    lines: List[str] = []
+    for metric in sorted(families):
+        description, kind = known.get(metric, ("", None))
+        if description:
+            lines.append(f"# HELP {metric} {description}")
+        if kind is None:
+            kind = "counter" if metric.endswith(("_calls", "_errors")) else "gauge"
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.extend(families[metric])
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _json_values(values: Iterable[float]) -> list:
+    """Zamienia wartości na listę JSON (NaN -> ``null``)."""
+    return [None if v != v else v for v in np.asarray(values).tolist()]
+
+
+class MetricsServer:
+    """
+    Lekki serwer HTTP udostępniający ostatnie odczyty i historię metryk.
+
+    Odpowiedź ``/metrics`` jest renderowana w ``refresh`` - wywoływanym raz
+    na takt zbierania - i serwowana z pamięci podręcznej. Serwer działa
+    w wątkach-demonach i nie importuje modułów GUI.
+
+    Args:
+        store: Magazyn ostatnich odczytów monitorów.
+        host: Adres nasłuchiwania (domyślnie tylko lokalnie).
+        port: Port; ``0`` wybiera wolny port.
+        history: Źródło historii dla ``/api/history``; ``None`` wyłącza
+            endpoint.
+    """
+    def __init__(
+        self,
+        store: SnapshotStore,
+        host: str = "127.0.0.1",
+        port: int = 9108,
+        history: Optional[HistorySource] = None,
+    ):
+        self.store = store
+        self.history = history
+        self._lock = threading.Lock()
+        self._body = b""
+        self._seq = -1
+        self.renders = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Adres ``(host, port)``, na którym nasłuchuje serwer."""
+        return self._httpd.server_address[:2]
+
+    def refresh(self) -> bool:
+        """
+        Renderuje treść ``/metrics`` z ostatnich odczytów.
+
+        Returns:
+            ``True`` jeśli treść została odświeżona, ``False`` jeśli od
+            poprzedniego wywołania nie pojawiły się nowe odczyty.
+        """
+        seq = self.store.seq
+        if seq == self._seq:
+            return False
+        values: Dict[str, float] = {}
+        with INSTRUMENTATION.timed("export.prometheus"):
+            for name, snap in self.store.snapshot().items():
+                values.update(flatten(name, snap.value))
+            body = render_prometheus(values)
+        with self._lock:
+            self._body = body
+            self._seq = seq
+            self.renders += 1
+        return True
+
+    def body(self) -> bytes:
+        """Zwraca ostatnio wyrenderowaną treść ``/metrics``."""
+        with self._lock:
+            return self._body
+
+    def start(self) -> None:
+        """Uruchamia serwer w wątku w tle."""
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="metrics-http", daemon=True
+        )
+        self._thread.start()
+        logging.info("Serwer metryk nasłuchuje na %s:%d", *self.address)
+
+    def stop(self) -> None:
+        """Zatrzymuje serwer i zwalnia port."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def history_json(self, query: Dict[str, List[str]]) -> Dict[str, object]:
+        """
+        Buduje odpowiedź ``/api/history`` z parametrów zapytania.
+
+        Raises:
+            ValueError: Przy niepoprawnych parametrach.
+        """
+        def number(key, cast=float):
+            return cast(query[key][0]) if key in query else None
+
+        names = None
+        if "series" in query:
+            names = [n for part in query["series"] for n in part.split(",") if n]
+        x, series = self.history(
+            names, number("start"), number("end"), number("max_points", int)
+        )
+        return {
+            "t": _json_values(x),
+            "series": {name: _json_values(v) for name, v in series.items()},
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/metrics":
+                    self._send(200, server.body(), PROMETHEUS_CONTENT_TYPE)
+                elif url.path == "/api/history" and server.history is not None:
+                    try:
+                        data = server.history_json(parse_qs(url.query))
+                    except (ValueError, KeyError) as exc:
+                        self._send(400, str(exc).encode("utf-8"), "text/plain")
+                        return
+                    self._send(200, json.dumps(data).encode("utf-8"), "application/json")
+                else:
+                    self._send(404, b"Not found\n", "text/plain")
+
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug("HTTP %s - " + format, self.address_string(), *args)
+
+        return Handler
@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+import logging
+import math
+import os
+import threading
+from time import monotonic
+from typing import Dict, List, Optional
+
+from monitor.instrumentation import INSTRUMENTATION
+
+
+def _is_missing(value) -> bool:
+    """Czy wartość oznacza brak próbki (``None`` lub NaN)."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _csv_cell(value):
+    """Zamienia brak próbki na puste pole CSV."""
+    return '' if _is_missing(value) else value
+
+
+class StreamingExporter:
+    """
+    Abstrakcyjna klasa bazowa eksporterów strumieniowych.
+
+    W przeciwieństwie do klas z ``exporters.py``, które przy każdym eksporcie
+    zapisują całą historię od nowa, eksporter strumieniowy trzyma plik otwarty
+    w trybie dopisywania i zapisuje tylko nowe próbki. Zapisy są buforowane,
+    a bufor jest opróżniany co ``flush_every_s`` sekund (opcjonalnie
+    z ``fsync``), więc koszt jednej próbki nie zależy od długości historii.
+
+    Args:
+        filename: Ścieżka pliku; istniejący plik jest kontynuowany.
+        flush_every_s: Co ile sekund opróżniać bufor na dysk.
+        fsync: Czy po opróżnieniu bufora wywoływać ``os.fsync``.
+        buffer_size: Rozmiar bufora zapisu w bajtach.
+    """
+    def __init__(
+        self,
+        filename: str,
+        flush_every_s: float = 1.0,
+        fsync: bool = False,
+        buffer_size: int = 64 * 1024,
+    ):
+        self.filename = filename
+        self.flush_every_s = flush_every_s
+        self.fsync = fsync
+        self.rows = 0
+        self._lock = threading.Lock()
+        try:
+            self._resumed = os.path.getsize(filename) > 0
+        except OSError:
+            self._resumed = False
+        try:
+            self._file: Optional[io.TextIOBase] = open(
+                filename, mode='a', newline='', encoding='utf-8',
+                buffering=buffer_size,
+            )
+        except OSError as exc:
+            raise RuntimeError(f"Nie można otworzyć pliku {filename}: {exc}") from exc
+        self._last_flush = monotonic()
+
+    def write(self, timestamp: float, values: Dict[str, float]) -> None:
+        """
+        Dopisuje jedną próbkę wszystkich metryk.
+
+        Args:
+            timestamp: Czas próbki.
+            values: Słownik ``metryka: wartość``.
+        """
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError(f"Eksporter {self.filename} został zamknięty")
+            try:
+                self._write_row(timestamp, values)
+                self.rows += 1
+                if monotonic() - self._last_flush >= self.flush_every_s:
+                    self._flush()
+            except OSError as exc:
+                raise RuntimeError(
+                    f"Nie można zapisać pliku {self.filename}: {exc}"
+                ) from exc
+
+    def _write_row(self, timestamp: float, values: Dict[str, float]) -> None:
+        """Zapisuje wiersz do bufora. Funkcja do nadpisania przez klasy potomne."""
+        raise NotImplementedError("StreamingExporter must implement _write_row")
+
+    def flush(self) -> None:
+        """Opróżnia bufor na dysk (z ``fsync``, jeśli włączono)."""
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+
+    def _flush(self) -> None:
+        """Opróżnia bufor; wywoływane z założoną blokadą."""
+        with INSTRUMENTATION.timed(f"export.{type(self).__name__}.flush"):
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        self._last_flush = monotonic()
+
+    def close(self) -> None:
+        """Opróżnia bufor i zamyka plik."""
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CSVStreamExporter(StreamingExporter):
+    """
+    Strumieniowy eksport wielu metryk do pliku CSV.
+
+    Kolumny są ustalane przy pierwszym wierszu (lub podane jawnie);
+    metryki, które pojawią się później, są pomijane z ostrzeżeniem, a brakujące
+    wartości zapisywane jako puste pola - tak jak w ``MultiMetricExporter``.
+
+    Args:
+        filename: Ścieżka pliku CSV.
+        columns: Kolejność kolumn metryk; ``None`` - z pierwszej próbki.
+        **kwargs: Parametry ``StreamingExporter``.
+    """
+    def __init__(self, filename: str, columns: Optional[List[str]] = None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.columns = list(columns) if columns is not None else None
+        self._writer = csv.writer(self._file)
+        self._ignored: set = set()
+        if self._resumed and self.columns is None:
+            self.columns = self._read_header()
+
+    def _read_header(self) -> Optional[List[str]]:
+        """Odczytuje kolumny z nagłówka kontynuowanego pliku."""
+        with open(self.filename, newline='', encoding='utf-8') as file:
+            header = next(csv.reader(file), None)
+        return header[1:] if header else None
+
+    def _write_row(self, timestamp: float, values: Dict[str, float]) -> None:
+        if self.columns is None:
+            self.columns = list(values)
+        if not self._resumed:
+            self._writer.writerow(["Czas (s)"] + self.columns)
+            self._resumed = True
+        extra = values.keys() - set(self.columns) - self._ignored
+        if extra:
+            logging.warning(
+                "Pomijam nowe metryki w %s: %s", self.filename, ", ".join(sorted(extra))
+            )
+            self._ignored |= extra
+        self._writer.writerow(
+            [timestamp] + [_csv_cell(values.get(name)) for name in self.columns]
+        )
+
+
+class JSONLinesExporter(StreamingExporter):
+    """
+    Strumieniowy eksport do formatu JSON Lines (jeden obiekt JSON na wiersz).
+
+    Każdy wiersz ma postać ``{"t": czas, "<metryka>": wartość, ...}``;
+    wartości NaN są zapisywane jako ``null``. Nowe metryki mogą pojawiać się
+    w dowolnym momencie.
+    """
+    def _write_row(self, timestamp: float, values: Dict[str, float]) -> None:
+        row = {"t": timestamp}
+        for name, value in values.items():
+            row[name] = None if _is_missing(value) else value
+        self._file.write(json.dumps(row) + "\n")
+
+
+def open_stream(filename: str, fmt: Optional[str] = None, **kwargs) -> StreamingExporter:
+    """
+    Tworzy eksporter strumieniowy odpowiedni dla formatu pliku.
+
+    Args:
+        filename: Ścieżka pliku.
+        fmt: ``csv`` lub ``jsonl``; domyślnie wg rozszerzenia
+            (``.jsonl``/``.ndjson`` - JSON Lines, pozostałe - CSV).
+        **kwargs: Parametry eksportera.
+    """
+    if fmt is None:
+        fmt = "jsonl" if filename.endswith((".jsonl", ".ndjson")) else "csv"
+    if fmt.lower() in ("jsonl", "json"):
+        return JSONLinesExporter(filename, **kwargs)
+    return CSVStreamExporter(filename, **kwargs)
@@ -0,0 +1,252 @@
+"""Tabela procesów w ``ttk.Treeview`` aktualizowana przyrostowo.
+
+Widżet nie jest czyszczony i wypełniany od nowa w każdym takcie: tabela
+pamięta, które procesy (PID) są wyświetlane i z jakimi wartościami, więc do
+Tk trafiają tylko wstawienia, zmiany i usunięcia wierszy, które faktycznie
+się zmieniły. Zaznaczenie i pozycja przewinięcia nie są przy tym tracone.
+
+Tabela jest wirtualizowana: ``Treeview`` zawiera tylko widoczne okno
+``height`` wierszy, a pasek przewijania przesuwa to okno po pełnej,
+posortowanej liście procesów (setki pozycji bez setek widżetów).
+Sortowanie po kliknięciu nagłówka działa na ostatnim odczycie monitora
+procesów - nie odpytuje ponownie systemu.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+from monitor.instrumentation import instrumented
+from monitor.process_monitor import ProcessUsage
+
+# (kolumna, nagłówek, szerokość w pikselach)
+COLUMNS = (
+    ("pid", "PID", 70),
+    ("name", "Nazwa", 220),
+    ("cpu", "CPU %", 70),
+    ("ram", "RAM %", 70),
+)
+
+SORT_KEYS: Dict[str, Callable[[ProcessUsage], object]] = {
+    "pid": lambda p: p.pid,
+    "name": lambda p: p.name.lower(),
+    "cpu": lambda p: p.cpu_percent,
+    "ram": lambda p: p.memory_percent,
+}
+
+
+def row_values(process: ProcessUsage) -> Tuple:
+    """Zwraca wartości komórek wiersza procesu (w kolejności ``COLUMNS``)."""
+    return (
+        process.pid,
+        process.name,
+        f"{process.cpu_percent:.1f}",
+        f"{process.memory_percent:.1f}",
+    )
+
+
+@dataclass
+class TableStats:
+    """Liczniki operacji na widżecie od utworzenia tabeli."""
+
+    inserts: int = 0
+    updates: int = 0
+    deletes: int = 0
+    moves: int = 0
+
+
+class ProcessTable:
+    """
+    Wirtualizowana tabela procesów z przyrostową aktualizacją widżetu.
+
+    Args:
+        tree: Widżet ``ttk.Treeview`` z kolumnami ``COLUMNS``.
+        height: Liczba widocznych wierszy (rozmiar okna wirtualizacji).
+        scrollbar: Pionowy ``ttk.Scrollbar`` sterujący oknem; opcjonalny.
+        sort_column: Kolumna sortowania (klucz ``SORT_KEYS``).
+        descending: Czy sortować malejąco.
+    """
+    def __init__(
+        self,
+        tree,
+        height: int = 10,
+        scrollbar=None,
+        sort_column: str = "cpu",
+        descending: bool = True,
+    ):
+        self.tree = tree
+        self.height = height
+        self.scrollbar = scrollbar
+        self.sort_column = sort_column
+        self.descending = descending
+        self.rows: List[ProcessUsage] = []
+        self.offset = 0
+        self.stats = TableStats()
+        # PID -> wartości wyświetlanego wiersza (identyfikator wiersza to PID)
+        self._shown: Dict[int, Tuple] = {}
+        # Zaznaczone PID, także te przewinięte poza widoczne okno
+        self.selected: Set[int] = set()
+
+    @property
+    def sort_by(self) -> str:
+        """Kryterium ``ProcessMonitor.get_top_processes`` zgodne z sortowaniem."""
+        return "memory" if self.sort_column == "ram" else "cpu"
+
+    def update(self, processes: Sequence[ProcessUsage]) -> None:
+        """
+        Wyświetla nowy odczyt procesów.
+
+        Args:
+            processes: Procesy z ostatniego odczytu monitora.
+        """
+        self.rows = self._sorted(processes)
+        pids = {p.pid for p in self.rows}
+        self.selected &= pids
+        self.render()
+
+    def sort(self, column: str) -> None:
+        """
+        Sortuje tabelę według kolumny (ponowne kliknięcie odwraca kolejność).
+
+        Args:
+            column: Nazwa kolumny z ``COLUMNS``.
+        """
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            # Liczby od największych, nazwy i PID alfabetycznie/rosnąco
+            self.descending = column in ("cpu", "ram")
+        self.rows = self._sorted(self.rows)
+        self.offset = 0
+        self.render()
+
+    def _sorted(self, processes: Sequence[ProcessUsage]) -> List[ProcessUsage]:
+        """Zwraca procesy w bieżącej kolejności sortowania."""
+        key = SORT_KEYS[self.sort_column]
+        # PID jako drugi klucz - równe wartości nie zamieniają się miejscami
+        ordered = sorted(processes, key=lambda p: p.pid)
+        return sorted(ordered, key=key, reverse=self.descending)
+
+    def scroll(self, rows: int) -> None:
+        """Przesuwa widoczne okno o ``rows`` wierszy (ujemne - w górę)."""
+        self._set_offset(self.offset + rows)
+
+    def yview(self, *args) -> None:
+        """
+        Obsługuje polecenia paska przewijania (``command`` ``ttk.Scrollbar``).
+
+        Args:
+            *args: ``("moveto", ułamek)`` lub ``("scroll", n, "units"|"pages")``.
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._set_offset(round(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def _set_offset(self, offset: int) -> None:
+        """Ustawia początek widocznego okna i odświeża widżet."""
+        offset = max(0, min(offset, len(self.rows) - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def on_select(self, _event=None) -> None:
+        """Zapamiętuje zaznaczenie widocznych wierszy (``<<TreeviewSelect>>``)."""
+        visible = set(self._shown)
+        chosen = {int(iid) for iid in self.tree.selection()}
+        self.selected = (self.selected - visible) | (chosen & visible)
+
+    @instrumented("render.process_table")
+    def render(self) -> None:
+        """Uzgadnia zawartość widżetu z widocznym oknem posortowanych procesów."""
+        self.offset = max(0, min(self.offset, len(self.rows) - self.height))
+        visible = self.rows[self.offset:self.offset + self.height]
+        wanted = {p.pid: row_values(p) for p in visible}
+
+        gone = [str(pid) for pid in self._shown if pid not in wanted]
+        if gone:
+            self.tree.delete(*gone)
+            self.stats.deletes += len(gone)
+
+        children = [iid for iid in self.tree.get_children() if int(iid) in wanted]
+        for index, process in enumerate(visible):
+            iid = str(process.pid)
+            values = wanted[process.pid]
+            old = self._shown.get(process.pid)
+            if old is None:
+                self.tree.insert("", index, iid=iid, values=values)
+                children.insert(index, iid)
+                self.stats.inserts += 1
+                if process.pid in self.selected:
+                    self.tree.selection_add(iid)
+                continue
+            if old != values:
+                self.tree.item(iid, values=values)
+                self.stats.updates += 1
+            if children[index] != iid:
+                self.tree.move(iid, "", index)
+                children.remove(iid)
+                children.insert(index, iid)
+                self.stats.moves += 1
+
+        self._shown = wanted
+        self._update_scrollbar()
+
+    def _update_scrollbar(self) -> None:
+        """Ustawia suwak zgodnie z położeniem okna na liście procesów."""
+        if self.scrollbar is None:
+            return
+        total = len(self.rows)
+        if total <= self.height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.height) / total)
+
+
+def build_process_table(parent, height: int = 10) -> ProcessTable:
+    """
+    Tworzy widżety tabeli procesów (``Treeview`` i pasek przewijania).
+
+    Args:
+        parent: Kontener, w którym umieszczana jest tabela.
+        height: Liczba widocznych wierszy.
+
+    Returns:
+        Tabela podłączona do nagłówków, paska przewijania i kółka myszy.
+    """
+    import tkinter as tk
+    from tkinter import ttk
+
+    tree = ttk.Treeview(
+        parent,
+        columns=[name for name, _, _ in COLUMNS],
+        show="headings",
+        height=height,
+        selectmode="extended",
+    )
+    scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL)
+    table = ProcessTable(tree, height=height, scrollbar=scrollbar)
+    scrollbar.configure(command=table.yview)
+
+    for name, title, width in COLUMNS:
+        tree.heading(name, text=title, command=lambda c=name: table.sort(c))
+        tree.column(name, width=width, stretch=name == "name")
+    tree.bind("<<TreeviewSelect>>", table.on_select)
+    # Treeview zawiera tylko widoczne wiersze, więc przewijanie kółkiem
+    # przesuwa okno tabeli zamiast samego widżetu
+    tree.bind("<MouseWheel>", lambda e: _wheel(table, -1 if e.delta > 0 else 1))
+    tree.bind("<Button-4>", lambda _e: _wheel(table, -1))
+    tree.bind("<Button-5>", lambda _e: _wheel(table, 1))
+
+    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+    return table
+
+
+def _wheel(table: ProcessTable, direction: int, step: int = 3) -> str:
+    """Przewija tabelę kółkiem myszy i blokuje domyślną obsługę zdarzenia."""
+    table.scroll(direction * step)
+    return "break"
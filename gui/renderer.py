@@ -0,0 +1,202 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, List
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from monitor.instrumentation import INSTRUMENTATION
+
+
+@dataclass
+class FrameStats:
+    """Statystyki czasu rysowania klatek."""
+
+    budget_ms: float
+    frames: int = 0
+    full_redraws: int = 0
+    over_budget: int = 0
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+    total_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        """Średni czas rysowania klatki w milisekundach."""
+        return self.total_ms / self.frames if self.frames else 0.0
+
+    def record(self, elapsed_ms: float, full: bool) -> None:
+        """Zapisuje czas rysowania jednej klatki."""
+        self.frames += 1
+        self.full_redraws += int(full)
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.budget_ms:
+            self.over_budget += 1
+
+
+class _Series:
+    """Linia i wypełnienie jednej metryki wraz z buforem wierzchołków."""
+
+    def __init__(self, line, fill: PolyCollection, autoscale: bool):
+        self.line = line
+        self.fill = fill
+        self.autoscale = autoscale
+        self.path = fill.get_paths()[0]
+        self.path.codes = None
+        self.verts = np.zeros((0, 2))
+
+    def set_data(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Aktualizuje linię i wielokąt wypełnienia bez tworzenia artystów."""
+        n = len(x)
+        self.line.set_data(x, y)
+        if len(self.verts) < n + 3:
+            # Bufor rośnie tylko przy zmianie długości historii
+            self.verts = np.zeros((max(n + 3, 2 * len(self.verts)), 2))
+        verts = self.verts[:n + 3] if n else self.verts[:0]
+        if n:
+            # Wielokąt: (x0, 0) -> punkty danych -> (xn, 0) -> (x0, 0)
+            verts[0] = (x[0], 0.0)
+            verts[1:n + 1, 0] = x
+            verts[1:n + 1, 1] = y
+            np.nan_to_num(verts[1:n + 1, 1], copy=False, nan=0.0)
+            verts[n + 1] = (x[-1], 0.0)
+            verts[n + 2] = (x[0], 0.0)
+        self.path.vertices = verts
+        self.fill.stale = True
+
+
+class BlitRenderer:
+    """
+    Renderer wykresów wykorzystujący blitting matplotlib.
+
+    Statyczne elementy osi (siatka, opisy, podziałki) są rysowane raz,
+    a ich tło jest zapamiętywane. W każdej klatce przywracane jest tło,
+    rysowane są tylko linie i wypełnienia (aktualizowane w miejscu),
+    a zmienione obszary są kopiowane na ekran. Pełne przerysowanie
+    następuje tylko po zmianie zakresów osi lub rozmiaru okna.
+    """
+    def __init__(self, canvas, budget_ms: float = 1000.0):
+        """
+        Args:
+            canvas: Płótno matplotlib (np. ``FigureCanvasTkAgg``).
+            budget_ms: Budżet czasu na jedną klatkę w milisekundach.
+        """
+        self.canvas = canvas
+        self.series: Dict[str, _Series] = {}
+        self.stats = FrameStats(budget_ms=budget_ms)
+        self._backgrounds: Dict[object, object] = {}
+        self._dirty = True
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    def add(self, label: str, line, fill: PolyCollection, autoscale=False):
+        """
+        Rejestruje linię i wypełnienie metryki jako animowane artysty.
+
+        Args:
+            label: Nazwa metryki.
+            line: Obiekt ``Line2D`` metryki.
+            fill: ``PolyCollection`` z pojedynczym wielokątem wypełnienia.
+            autoscale: Czy powiększać oś Y, gdy dane przekroczą zakres.
+        """
+        line.set_animated(True)
+        fill.set_animated(True)
+        self.series[label] = _Series(line, fill, autoscale)
+        self._dirty = True
+
+    def remove(self, label: str) -> None:
+        """Wyrejestrowuje metrykę (np. po odłączeniu dysku)."""
+        if self.series.pop(label, None) is not None:
+            self._dirty = True
+
+    def clear(self) -> None:
+        """Wyrejestrowuje wszystkie metryki (np. przed przebudową wykresów)."""
+        self.series.clear()
+        self._backgrounds = {}
+        self._dirty = True
+
+    def update(self, label: str, x: np.ndarray, y: np.ndarray) -> None:
+        """Aktualizuje dane metryki; rysowanie następuje w ``draw``."""
+        series = self.series[label]
+        series.set_data(x, y)
+        if series.autoscale and len(y):
+            peak = np.nanmax(y) if not np.all(np.isnan(y)) else 0.0
+            ax = series.line.axes
+            bottom, top = ax.get_ylim()
+            if peak > top:
+                ax.set_ylim(bottom, _nice_limit(peak))
+                self._dirty = True
+
+    def set_xlim(self, left: float, right: float) -> None:
+        """Ustawia wspólny zakres osi X; zmiana wymusza pełne przerysowanie."""
+        for ax in self._axes():
+            if ax.get_xlim() != (left, right):
+                ax.set_xlim(left, right)
+                self._dirty = True
+
+    def invalidate(self) -> None:
+        """Wymusza pełne przerysowanie przy następnej klatce."""
+        self._dirty = True
+
+    def draw(self) -> float:
+        """
+        Rysuje klatkę i zwraca czas jej rysowania w milisekundach.
+        """
+        start = perf_counter()
+        full = self._dirty or not self._backgrounds
+        if full:
+            # draw_event zapamięta tło i dorysuje animowane artysty
+            self.canvas.draw()
+        else:
+            for ax, background in self._backgrounds.items():
+                self.canvas.restore_region(background)
+                self._draw_artists(ax)
+                self.canvas.blit(ax.bbox)
+        elapsed_ms = (perf_counter() - start) * 1000
+        self.stats.record(elapsed_ms, full)
+        INSTRUMENTATION.record("render.full" if full else "render.blit", elapsed_ms)
+        return elapsed_ms
+
+    def _axes(self) -> List[object]:
+        """Zwraca osie, na których leżą zarejestrowane metryki."""
+        axes: List[object] = []
+        for series in self.series.values():
+            if series.line.axes not in axes:
+                axes.append(series.line.axes)
+        return axes
+
+    def _draw_artists(self, ax) -> None:
+        """Rysuje animowane artysty leżące na danej osi."""
+        for series in self.series.values():
+            if series.line.axes is ax:
+                ax.draw_artist(series.fill)
+                ax.draw_artist(series.line)
+
+    def _on_draw(self, _event) -> None:
+        """Po pełnym rysowaniu zapamiętuje tło osi i dorysowuje dane."""
+        self._backgrounds = {
+            ax: self.canvas.copy_from_bbox(ax.bbox) for ax in self._axes()
+        }
+        for ax in self._backgrounds:
+            self._draw_artists(ax)
+        self._dirty = False
+
+
+def _nice_limit(value: float) -> float:
+    """Zaokrągla górną granicę osi w górę do 1, 2 lub 5 razy potęga 10."""
+    if value <= 0:
+        return 1.0
+    exponent = np.floor(np.log10(value))
+    for step in (1, 2, 5, 10):
+        limit = step * 10 ** exponent
+        if limit >= value:
+            return float(limit)
+    return float(10 ** (exponent + 1))
+
+
+def make_fill(ax, color: str, alpha: float = 0.3) -> PolyCollection:
+    """Tworzy pusty wielokąt wypełnienia, aktualizowany później w miejscu."""
+    fill = PolyCollection([np.zeros((3, 2))], color=color, alpha=alpha)
+    ax.add_collection(fill, autolim=False)
+    return fill
@@ -0,0 +1,485 @@
+"""Headless (bez GUI) tryb zbierania metryk.
+
+Moduł uruchamia monitory z pakietu ``monitor`` w wątku próbkującym,
+zapisuje historię w buforach cyklicznych i okresowo eksportuje ją za pomocą
+eksporterów z pakietu ``exporter``. Nie importuje tkinter ani matplotlib,
+dzięki czemu nadaje się do uruchamiania jako usługa systemowa na serwerach
+bez ekranu::
+
+    python headless.py --output metrics.csv --export-every 60
+
+Do ciągłego zapisu służy ``--stream``: każda próbka jest dopisywana do pliku
+(CSV lub JSON Lines) bez przepisywania całej historii::
+
+    python headless.py --stream metrics.jsonl
+
+Z ``--http-port`` ostatnie odczyty są dostępne dla Prometheusa pod
+``/metrics``, a historia w JSON pod ``/api/history``::
+
+    python headless.py --http-port 9108
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import signal
+import threading
+from time import monotonic, time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from alerts.engine import AlertEngine, rule_from_dict
+from alerts.sinks import LogSink, WebhookSink
+from config import load_config
+from exporter.exporters import Exporter, JSONExporter, MultiMetricExporter, NPZExporter
+from exporter.prometheus import MetricsServer
+from exporter.streaming import StreamingExporter, open_stream
+from monitor.executor import CollectionExecutor
+from monitor.metrics import flatten
+from monitor.registry import REGISTRY
+from monitor.ring_buffer import RingBuffer
+from monitor.sampler import Sampler, SnapshotStore
+from monitor.topology import TopologyCache
+from storage.replay import ReplaySource, parse_speed
+from storage.rollup import TieredStore
+from storage.timeseries_store import StoreRecorder
+
+
+def snapshot_metrics(store: SnapshotStore) -> Dict[str, float]:
+    """Spłaszcza ostatnie odczyty monitorów do słownika ``metryka: wartość``.
+
+    Parameters
+    ----------
+    store:
+        Magazyn z odczytami publikowanymi przez ``Sampler``.
+
+    Returns
+    -------
+    Dict[str, float]
+        Wartości pod tymi samymi nazwami, których używa GUI.
+    """
+
+    values: Dict[str, float] = {}
+    for name, snap in store.snapshot().items():
+        values.update(flatten(name, snap.value))
+    return values
+
+
+class HeadlessCollector:
+    """Zbiera metryki bez GUI i okresowo eksportuje historię do pliku."""
+
+    def __init__(
+        self,
+        sample_interval_ms: int = 1000,
+        history_length: int = 3600,
+        output: Optional[str] = None,
+        fmt: str = "csv",
+        export_every_s: float = 60.0,
+        store_dir: Optional[str] = None,
+        retention_s: Optional[float] = None,
+        export_window_s: Optional[float] = None,
+        max_points: int = 1440,
+        self_metrics: bool = False,
+        io_metrics: bool = False,
+        stream: Optional[str] = None,
+        stream_fsync: bool = False,
+        http_port: Optional[int] = None,
+        http_host: str = "127.0.0.1",
+        alert_rules: Optional[List[dict]] = None,
+        alert_log: Optional[str] = None,
+        alert_webhook: Optional[str] = None,
+        replay: Optional[ReplaySource] = None,
+    ):
+        """
+        Args:
+            sample_interval_ms: Odstęp między próbkami w milisekundach.
+            history_length: Liczba próbek przechowywanych w pamięci.
+            output: Plik eksportu; ``None`` wyłącza eksport.
+            fmt: Format eksportu (``csv``, ``json`` lub kolumnowy ``npz``).
+            export_every_s: Co ile sekund eksportować historię.
+            store_dir: Katalog trwałego magazynu szeregów czasowych;
+                ``None`` wyłącza zapis na dysk.
+            retention_s: Czas przechowywania danych w magazynie.
+            export_window_s: Eksportuj ostatnie ``export_window_s`` sekund
+                z magazynu zamiast historii z pamięci.
+            max_points: Maksymalna liczba wierszy eksportu z magazynu;
+                dłuższe okna są eksportowane z poziomów agregacji.
+            self_metrics: Czy zbierać i eksportować czasy działania samego
+                kolektora (``SELF_...``).
+            io_metrics: Czy zbierać metryki poszczególnych interfejsów
+                sieciowych (``NIC_...``) i urządzeń dyskowych (``IO_...``).
+            stream: Plik, do którego każda próbka jest dopisywana na bieżąco
+                (CSV lub JSON Lines wg rozszerzenia); ``None`` wyłącza zapis.
+            stream_fsync: Czy wywoływać ``fsync`` po opróżnieniu bufora
+                strumienia.
+            http_port: Port serwera metryk (``/metrics`` i
+                ``/api/history``); ``None`` wyłącza serwer.
+            http_host: Adres nasłuchiwania serwera metryk.
+            alert_rules: Reguły alertów (słowniki jak w ``config.json``);
+                ``None`` lub pusta lista wyłącza alerty.
+            alert_log: Plik dziennika alertów; domyślnie ``logging``.
+            alert_webhook: Adres webhooka powiadamianego o alertach.
+            replay: Nagranie odtwarzane zamiast odczytów monitorów (np. do
+                konwersji formatu lub ponownej oceny alertów).
+        """
+        self.sample_interval_ms = sample_interval_ms
+        self.history_length = history_length
+        self.output = output
+        self.fmt = fmt.lower()
+        self.export_every_s = export_every_s
+        self.export_window_s = export_window_s
+        self.max_points = max_points
+
+        self.replay = replay
+        self.store = replay.store if replay is not None else SnapshotStore()
+        self.executor = CollectionExecutor()
+        self.sampler = Sampler(self.store, self.executor)
+        if replay is None:
+            self.add_monitors(io_metrics, self_metrics)
+
+        self.t_data = RingBuffer(history_length)
+        self.history: Dict[str, RingBuffer] = {}
+        self._stop = threading.Event()
+        self.stream: Optional[StreamingExporter] = None
+        if stream:
+            self.stream = open_stream(stream, fsync=stream_fsync)
+        self.alerts: Optional[AlertEngine] = None
+        if alert_rules:
+            sinks = [LogSink(alert_log)]
+            if alert_webhook:
+                sinks.append(WebhookSink(alert_webhook))
+            self.alerts = AlertEngine([rule_from_dict(r) for r in alert_rules], sinks)
+            self.alerts.attach(self.store)
+        self.server: Optional[MetricsServer] = None
+        if http_port is not None:
+            self.server = MetricsServer(
+                self.store, http_host, http_port, history=self.history_frame
+            )
+        self.recorder: Optional[StoreRecorder] = None
+        if store_dir:
+            self.recorder = StoreRecorder(
+                TieredStore(store_dir, retention_s=retention_s), self.store
+            )
+
+    def add_monitors(self, io_metrics: bool = False, self_metrics: bool = False) -> None:
+        """
+        Rejestruje w wątku próbkującym monitory z rejestru
+        (``monitor.registry.REGISTRY``).
+
+        Args:
+            io_metrics: Czy dodać monitory interfejsów i urządzeń dyskowych.
+            self_metrics: Czy dodać czasy działania samego kolektora.
+        """
+        sample_s = self.sample_interval_ms / 1000
+        REGISTRY.load_entry_points()
+        # Lista partycji i prędkości interfejsów odczytywane rzadko, wspólnie
+        self.topology = TopologyCache()
+        options = {"io_metrics": io_metrics, "self_metrics": self_metrics}
+        for spec in REGISTRY.specs(options):
+            monitor = REGISTRY.create(spec.task, topology=self.topology)
+            self.sampler.add(spec.task, monitor.get_usage, sample_s)
+
+    def record(self, timestamp: Optional[float] = None) -> Dict[str, float]:
+        """
+        Dopisuje do historii jeden wiersz z ostatnich odczytów.
+
+        Args:
+            timestamp: Czas wiersza (czas uniksowy w s); domyślnie czas
+                zegarowy najnowszego odczytu (przy odtwarzaniu - czas
+                z nagrania).
+        """
+        values = snapshot_metrics(self.store)
+        if timestamp is None:
+            snapshots = self.store.snapshot().values()
+            wall_ns = max((snap.wall_ns for snap in snapshots), default=0)
+            timestamp = wall_ns / 1e9 if wall_ns else time()
+        now = timestamp
+        self.t_data.append(now)
+        for name in values:
+            if name not in self.history:
+                # Seria pojawiła się później - uzupełniamy brakujące próbki
+                buffer = RingBuffer(self.history_length)
+                buffer.extend([math.nan] * (len(self.t_data) - 1))
+                self.history[name] = buffer
+        for name, buffer in self.history.items():
+            buffer.append(values.get(name, math.nan))
+        if self.stream is not None:
+            self.stream.write(now, values)
+        return values
+
+    def export(self) -> None:
+        """Eksportuje bieżącą historię do pliku ``output``."""
+        if not self.output:
+            return
+        exporter: Exporter
+        if self.fmt == "json":
+            exporter = JSONExporter()
+        elif self.fmt == "npz":
+            exporter = NPZExporter()
+        else:
+            exporter = MultiMetricExporter()
+        if self.export_window_s and self.recorder is not None:
+            self.recorder.tsdb.flush()
+            x, metrics = self.recorder.tsdb.frame(
+                start=time() - self.export_window_s,
+                max_points=self.max_points,
+                raw_interval_s=self.sample_interval_ms / 1000,
+            )
+            exporter.export(self.output, x, metrics)
+            return
+        metrics = {name: buf.view() for name, buf in self.history.items()}
+        exporter.export(self.output, self.t_data.view(), metrics)
+
+    def history_frame(
+        self,
+        names: Optional[List[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        max_points: Optional[int] = None,
+    ):
+        """
+        Zwraca historię serii z przedziału czasu (źródło ``/api/history``).
+
+        Z włączonym magazynem dane pochodzą z dysku (z poziomów agregacji
+        dla długich okien), w przeciwnym razie z buforów w pamięci.
+
+        Args:
+            names: Nazwy serii; ``None`` - wszystkie.
+            start: Początek przedziału (czas uniksowy w sekundach).
+            end: Koniec przedziału.
+            max_points: Maksymalna liczba punktów na serię.
+
+        Returns:
+            Krotka ``(czas, {seria: wartości})``.
+
+        Raises:
+            KeyError: Dla nieznanej serii.
+        """
+        if self.recorder is not None:
+            self.recorder.tsdb.flush()
+            return self.recorder.tsdb.frame(
+                names, start, end, max_points,
+                raw_interval_s=self.sample_interval_ms / 1000,
+            )
+        t = self.t_data.view()
+        lo = 0 if start is None else np.searchsorted(t, start, side="left")
+        hi = len(t) if end is None else np.searchsorted(t, end, side="right")
+        step = 1
+        if max_points and hi - lo > max_points:
+            step = math.ceil((hi - lo) / max_points)
+        names = list(self.history) if names is None else names
+        return t[lo:hi:step], {
+            name: self.history[name].view()[lo:hi:step] for name in names
+        }
+
+    def stop(self) -> None:
+        """Przerywa pętlę ``run`` (np. z obsługi sygnału)."""
+        self._stop.set()
+        if self.replay is not None:
+            self.replay.stop()
+
+    def _on_replay_row(self, timestamp: float) -> None:
+        """Zapisuje wiersz opublikowany przez odtwarzane nagranie."""
+        self.record(timestamp)
+        if self.server is not None:
+            self.server.refresh()
+
+    def run(self, duration_s: Optional[float] = None) -> None:
+        """
+        Zbiera próbki aż do wywołania ``stop`` lub upływu ``duration_s``.
+
+        Args:
+            duration_s: Maksymalny czas działania w sekundach.
+        """
+        self.sampler.start()
+        if self.server is not None:
+            self.server.start()
+        try:
+            if self.replay is not None:
+                # Tempo wyznacza nagranie - każdy wiersz trafia do historii
+                self.replay.run(on_row=self._on_replay_row)
+            else:
+                self._run_live(duration_s)
+        finally:
+            self._shutdown()
+
+    def _run_live(self, duration_s: Optional[float]) -> None:
+        """
+        Zapisuje wiersze z odczytów wątku próbkującego i okresowo eksportuje.
+
+        Terminy zapisu są bezwzględne: czas zapisu nie przesuwa kolejnych
+        wierszy, a terminy przegapione (np. przy eksporcie) są pomijane.
+        """
+        interval_s = self.sample_interval_ms / 1000
+        started = last_export = deadline = monotonic()
+        while True:
+            deadline += interval_s
+            now = monotonic()
+            if now > deadline:
+                deadline += (now - deadline) // interval_s * interval_s + interval_s
+            if self._stop.wait(deadline - now):
+                return
+            self.record()
+            if self.server is not None:
+                self.server.refresh()
+            now = monotonic()
+            if now - last_export >= self.export_every_s:
+                self.export()
+                if self.recorder is not None:
+                    self.recorder.tsdb.flush()
+                last_export = now
+            if duration_s is not None and now - started >= duration_s:
+                return
+
+    def _shutdown(self) -> None:
+        """Zatrzymuje próbkowanie i serwer, eksportuje historię i zamyka pliki."""
+        if self.server is not None:
+            self.server.stop()
+        self.sampler.stop()
+        self.executor.shutdown()
+        if self.alerts is not None:
+            self.alerts.detach()
+            for sink in self.alerts.sinks:
+                sink.close()
+        self.export()
+        if self.stream is not None:
+            self.stream.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parsuje argumenty wiersza poleceń trybu headless."""
+    config = load_config()
+    parser = argparse.ArgumentParser(
+        description="Zbieranie metryk systemowych bez interfejsu graficznego."
+    )
+    parser.add_argument(
+        "--interval-ms", type=int, default=config["sample_interval_ms"],
+        help="odstęp między próbkami w milisekundach",
+    )
+    parser.add_argument(
+        "--history", type=int, default=config["history_length"],
+        help="liczba próbek przechowywanych w pamięci",
+    )
+    parser.add_argument("--output", help="plik eksportu (CSV, JSON lub NPZ)")
+    parser.add_argument(
+        "--format", choices=["csv", "json", "npz"], default="csv",
+        help="format pliku eksportu",
+    )
+    parser.add_argument(
+        "--export-every", type=float, default=60.0,
+        help="co ile sekund zapisywać historię",
+    )
+    parser.add_argument(
+        "--store", default=config.get("storage_dir"),
+        help="katalog trwałego magazynu szeregów czasowych",
+    )
+    parser.add_argument(
+        "--retention-days", type=float, default=None,
+        help="po ilu dniach usuwać dane z magazynu",
+    )
+    parser.add_argument(
+        "--export-window", type=float, default=None,
+        help="eksportuj ostatnie N sekund z magazynu (wymaga --store)",
+    )
+    parser.add_argument(
+        "--max-points", type=int, default=1440,
+        help="maksymalna liczba wierszy eksportu z magazynu",
+    )
+    parser.add_argument(
+        "--stream",
+        help="dopisuj każdą próbkę do pliku (CSV lub .jsonl) na bieżąco",
+    )
+    parser.add_argument(
+        "--fsync", action="store_true",
+        help="wywołuj fsync przy każdym opróżnieniu bufora strumienia",
+    )
+    parser.add_argument(
+        "--http-port", type=int, default=None,
+        help="udostępniaj /metrics (Prometheus) i /api/history na tym porcie",
+    )
+    parser.add_argument(
+        "--http-host", default="127.0.0.1",
+        help="adres nasłuchiwania serwera metryk",
+    )
+    parser.add_argument(
+        "--alert-log", default=config.get("alert_log"),
+        help="plik dziennika alertów (reguły z config.json: alert_rules)",
+    )
+    parser.add_argument(
+        "--alert-webhook", default=config.get("alert_webhook"),
+        help="adres HTTP powiadamiany o alertach",
+    )
+    parser.add_argument(
+        "--self-metrics", action="store_true",
+        default=config.get("self_metrics", False),
+        help="zbieraj i eksportuj czasy działania samego kolektora",
+    )
+    parser.add_argument(
+        "--io-metrics", action="store_true",
+        default=config.get("io_metrics", False),
+        help="zbieraj metryki poszczególnych interfejsów sieciowych i dysków",
+    )
+    parser.add_argument(
+        "--replay",
+        help="odtwórz nagranie (CSV, JSON, JSON Lines, NPZ lub katalog magazynu) "
+        "zamiast zbierać metryki",
+    )
+    parser.add_argument(
+        "--speed", type=parse_speed, default=None,
+        help="prędkość odtwarzania: 1, 10, 100... lub max (domyślnie)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=None,
+        help="zakończ po tylu sekundach (domyślnie działa do przerwania)",
+    )
+    parser.set_defaults(alert_rules=config.get("alert_rules"))
+    args = parser.parse_args(argv)
+    if args.interval_ms <= 0 or args.history <= 0:
+        parser.error("interwał i długość historii muszą być dodatnie")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Punkt wejścia trybu headless."""
+    args = parse_args(argv)
+    collector = HeadlessCollector(
+        sample_interval_ms=args.interval_ms,
+        history_length=args.history,
+        output=args.output,
+        fmt=args.format,
+        export_every_s=args.export_every,
+        store_dir=args.store,
+        export_window_s=args.export_window,
+        max_points=args.max_points,
+        self_metrics=args.self_metrics,
+        io_metrics=args.io_metrics,
+        stream=args.stream,
+        stream_fsync=args.fsync,
+        http_port=args.http_port,
+        http_host=args.http_host,
+        alert_rules=args.alert_rules,
+        alert_log=args.alert_log,
+        alert_webhook=args.alert_webhook,
+        replay=(
+            ReplaySource.from_file(args.replay, speed=args.speed)
+            if args.replay else None
+        ),
+        retention_s=(
+            args.retention_days * 86_400 if args.retention_days else None
+        ),
+    )
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: collector.stop())
+    try:
+        collector.run(duration_s=args.duration)
+    except KeyboardInterrupt:
+        logging.info("Przerwano zbieranie metryk")
+
+
+if __name__ == "__main__":
+    main()
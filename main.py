@@ -1,41 +1,63 @@
+"""Monitor zasobów systemowych z interfejsem graficznym (tkinter + matplotlib).
+
+Start aplikacji jest możliwie krótki: matplotlib, renderer wykresów,
+eksportery, kolektor metryk i biblioteki GPU są importowane dopiero przy
+pierwszym użyciu, a wątek próbkujący rusza przed zbudowaniem wykresów.
+Ma to znaczenie przy uruchamianiu przez SSH z przekierowaniem X.
+"""
+
+import argparse
+import logging
 import math
-from typing import Dict, List
+from collections import deque
+from time import time_ns
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional, Tuple
 import tkinter as tk
-from tkinter import messagebox, ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.animation as animation
-
-from monitor.cpu_monitor import CPUMonitor
-from monitor.memory_monitor import MemoryMonitor
-from monitor.disk_monitor import DiskMonitor
-from monitor.gpu_monitor import GPUMonitor
-from monitor.network_monitor import NetworkMonitor
+from tkinter import ttk
+import numpy as np
+
+from gui.process_table import build_process_table
+from monitor.batch import SeriesIndex
+from monitor.executor import CollectionExecutor
+from monitor.instrumentation import instrumented
 from monitor.process_monitor import ProcessMonitor
+from monitor.registry import REGISTRY
+from monitor.ring_buffer import ColumnView, RingBuffer
+from monitor.sampler import Sampler, SnapshotStore
+from monitor.topology import TopologyCache
 from monitor.utils import safe_call
+from storage.rollup import DEFAULT_TIERS, RollupHistory, TieredStore, select_tier
+from storage.timeseries_store import StoreRecorder
 
-from exporter.exporters import (
-    Exporter,
-    CPUExporter, RAMExporter, DiskExporter, GPUExporter,
-    NetworkExporter, MultiMetricExporter, JSONExporter
-)
+from alerts.engine import AlertEngine, ThresholdRule, rule_from_dict
+from alerts.sinks import BannerSink, LogSink, WebhookSink
+from config import DEFAULT_CONFIG, load_config, save_config
 
-from config import load_config, save_config
+if TYPE_CHECKING:
+    from storage.replay import ReplaySource
 
 
 class ResourceMonitorApp:
     """
     Główna klasa aplikacji monitorującej zasoby systemowe z interfejsem GUI.
 
-    Inicjalizuje i obsługuje monitory CPU, RAM, dysków, GPU oraz sieci.
-    Wyświetla dane w postaci wykresów oraz umożliwia eksport wybranych
-    metryk do pliku CSV.
+    Monitory, wykresy i eksport wynikają z rejestru monitorów
+    (``monitor.registry.REGISTRY``): każda seria ze schematem ``plot``
+    ma własny wykres i może być eksportowana do pliku CSV, JSON lub NPZ.
     """
+    # Powyżej tej liczby punktów wykres korzysta z poziomu agregacji
+    MAX_PLOT_POINTS = 1500
+    # Pozycja listy hostów oznaczająca maszynę lokalną
+    LOCAL_HOST = "lokalny"
+    # Alert procesu gaśnie dopiero o tyle punktów procentowych poniżej progu
+    THRESHOLD_HYSTERESIS = 5.0
+
     def __init__(
         self,
         root,
         update_interval_ms: int = 1000,
         history_length: int = 60,
+        replay: Optional["ReplaySource"] = None,
     ):
         """
         Inicjalizuje aplikację, monitory oraz bufory danych, buduje GUI.
@@ -44,6 +66,7 @@ class ResourceMonitorApp:
             root: Obiekt głównego okna tkinter.
             update_interval_ms: Czas odświeżania wykresów w milisekundach.
             history_length: Liczba ostatnich próbek przechowywanych w buforze.
+            replay: Nagranie odtwarzane zamiast odczytów monitorów.
         """
         self.root = root
         self.root.title("Monitor zasobów systemowych")
@@ -52,7 +75,19 @@ class ResourceMonitorApp:
 
         config = load_config()
         self.update_interval_ms = config.get("update_interval_ms", update_interval_ms)
+        self.sample_interval_ms = config.get(
+            "sample_interval_ms", self.update_interval_ms
+        )
         self.history_length = config.get("history_length", history_length)
+        self.storage_dir = config.get("storage_dir")
+        self.self_metrics = config.get("self_metrics", False)
+        self.io_metrics = config.get("io_metrics", False)
+        self.process_rows = config.get("process_rows", DEFAULT_CONFIG["process_rows"])
+        self.collector_listen = config.get("collector_listen")
+        self.alert_config = {
+            key: config.get(key, DEFAULT_CONFIG[key])
+            for key in ("alert_rules", "alert_log", "alert_webhook", "alert_cooldown_s")
+        }
         self.cpu_threshold_var = tk.StringVar(
             master=self.root, value=str(config.get("cpu_threshold", 90))
         )
@@ -60,34 +95,105 @@ class ResourceMonitorApp:
             master=self.root, value=str(config.get("ram_threshold", 90))
         )
 
-        # Inicjalizacja monitorów
-        self.cpu = CPUMonitor()
-        self.ram = MemoryMonitor()
-        self.gpu = GPUMonitor()
-        self.disk = DiskMonitor()
-        self.network = NetworkMonitor()
+        # Inicjalizacja monitorów z rejestru (także z pakietów zewnętrznych);
+        # opcje konfiguracji włączają monitory bez wykresów
+        REGISTRY.load_entry_points()
+        self.specs = REGISTRY.specs(
+            {"io_metrics": self.io_metrics, "self_metrics": self.self_metrics}
+        )
+        # Wspólna, rzadko odświeżana topologia (partycje, interfejsy, GPU)
+        self.topology = TopologyCache()
+        self.monitors = {
+            spec.task: REGISTRY.create(spec.task, topology=self.topology)
+            for spec in self.specs
+        }
+        self.plot_specs = [
+            spec for spec in self.specs if any(s.plot for s in spec.series)
+        ]
         self.process_monitor = ProcessMonitor()
 
-        # Bufory danych
-        self.frame_count = 0
-        self.x_data: List[int] = []
-        self.cpu_data: List[float] = []
-        self.ram_data: List[float] = []
-        self.disk_data: Dict[str, List[float]] = {
-            d.mount: []
-            for d in self.disk.get_usage()
-        }
-        self.gpu_data: Dict[str, List[float]] = {}
-        self.network_data: Dict[str, List[float]] = {
-            "NET_UP": [], "NET_DOWN": []
-        }
-        self.process_tree = None
+        # Próbkowanie w osobnym wątku - GUI czyta tylko ostatnie odczyty;
+        # w trybie odtwarzania odczyty publikuje nagranie zamiast monitorów
+        self.replay = replay
+        self.replay_scale = None
+        self._replay_dragging = False
+        # Wiersze nagrania czekające na wykresy - przy odtwarzaniu
+        # przyspieszonym w jednym takcie GUI pojawia się ich wiele
+        self._replay_rows: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        if replay is not None:
+            replay.subscribe(self.queue_replay_row)
+        self.store = replay.store if replay is not None else SnapshotStore()
+        self.executor = CollectionExecutor()
+        self.sampler = Sampler(self.store, self.executor)
+        self._last_seq = 0
+        if replay is None:
+            self.register_sampler_tasks()
+        # Opcjonalny zapis wszystkich próbek w trwałym magazynie na dysku
+        self.recorder = None
+        if self.storage_dir:
+            self.recorder = StoreRecorder(
+                TieredStore(self.storage_dir), self.store
+            )
+        # Opcjonalny kolektor metryk przesyłanych przez agentów z innych hostów
+        self.collector = None
+        if self.collector_listen:
+            from agent.collector import Collector
+
+            self.collector = Collector(self.collector_listen, self.history_length)
+            try:
+                self.collector.start()
+            except OSError:
+                logging.exception("Nie można uruchomić kolektora metryk")
+                self.collector = None
+        # Magazyn wyświetlanego hosta (domyślnie lokalnego)
+        self.view_store = self.store
+
+        # Alerty oceniane w wątku próbkującym; GUI tylko wyświetla pasek
+        self.banner = BannerSink()
+        sinks = [self.banner, LogSink(self.alert_config["alert_log"])]
+        if self.alert_config["alert_webhook"]:
+            sinks.append(WebhookSink(self.alert_config["alert_webhook"]))
+        self.alerts = AlertEngine(
+            [rule_from_dict(r) for r in self.alert_config["alert_rules"]],
+            sinks,
+            cooldown_s=self.alert_config["alert_cooldown_s"],
+        )
+        self._thresholds = (None, None)
+        self.sync_threshold_rules()
+        self.alerts.attach(self.store)
+        self.alert_var = None
+        self._banner_version = -1
+
+        # Bufory danych: jeden wiersz na takt (wartości wszystkich serii
+        # w kolejności ``self.index``), ``self.series`` - kolumny wierszy
+        # według nazw wykresów. Tanie monitory (``preload``) są odczytywane
+        # od razu; wykrycie GPU (import biblioteki, odpytanie sterownika) nie
+        # opóźnia startu - serie urządzeń dodaje ``sync_series`` po
+        # pierwszym odczycie. Oś czasu to czas zegarowy taktów (czas
+        # uniksowy w s), więc eksporty i wykresy pokazują rzeczywiste odstępy
+        self.x_data = RingBuffer(self.history_length)
+        self.index = SeriesIndex(())
+        self.samples = RingBuffer(self.history_length, width=0)
+        self.series: Dict[str, ColumnView] = {}
+        readings = {}
+        if replay is None:
+            readings = {
+                spec.task: self.monitors[spec.task].get_usage()
+                for spec in self.plot_specs if spec.preload
+            }
+        self.set_series(self.plot_names(readings))
+        self.process_table = None
+        self._process_seq = -1
 
-        self.disk_mounts = list(self.disk_data.keys())
         self.fig = None
         self.ax = []
         self.lines = {}
         self.fills = {}
+        self.renderer = None
+        self._x_rel = np.zeros(0)
+        self.rollups: Dict[str, RollupHistory] = {}
+        self._plot_tier = None
+        self._now_s = 0.0
 
         self.build_gui()
 
@@ -101,17 +207,10 @@ class ResourceMonitorApp:
         frame.pack(pady=10)
 
         self.selected_metric = tk.StringVar()
-        options = (
-            ["CPU", "RAM"]
-            + [f"DISK_{m}" for m in self.disk_mounts]
-            + [f"GPU_{g.name}" for g in self.gpu.get_usage()]
-            + ["NET_UP", "NET_DOWN", "WSZYSTKO"]
-        )
-
         self.metric_menu = ttk.Combobox(
             frame,
             textvariable=self.selected_metric,
-            values=options
+            values=self.metric_options()
         )
         self.metric_menu.set("CPU")
         self.metric_menu.pack(side=tk.LEFT, padx=5)
@@ -120,7 +219,7 @@ class ResourceMonitorApp:
         export_format_menu = ttk.Combobox(
             frame,
             textvariable=self.export_format_var,
-            values=["CSV", "JSON"],
+            values=["CSV", "JSON", "NPZ"],
             width=6
         )
         export_format_menu.pack(side=tk.LEFT, padx=5)
@@ -146,19 +245,30 @@ class ResourceMonitorApp:
         apply_btn = ttk.Button(settings, text="Zastosuj", command=self.apply_settings)
         apply_btn.pack(side=tk.LEFT, padx=5)
 
+        if self.collector is not None:
+            ttk.Label(settings, text="Host").pack(side=tk.LEFT, padx=5)
+            self.host_var = tk.StringVar(value=self.LOCAL_HOST)
+            host_menu = ttk.Combobox(settings, textvariable=self.host_var, width=15)
+            host_menu.configure(
+                postcommand=lambda: host_menu.configure(
+                    values=[self.LOCAL_HOST] + self.collector.hosts()
+                )
+            )
+            host_menu.bind(
+                "<<ComboboxSelected>>", lambda _e: self.select_host(self.host_var.get())
+            )
+            host_menu.pack(side=tk.LEFT)
+
+        if self.replay is not None:
+            self.build_replay_controls()
+
+        self.alert_var = tk.StringVar(master=self.root, value="")
+        ttk.Label(self.root, textvariable=self.alert_var, foreground="red").pack()
+
         process_frame = ttk.Frame(self.root)
         process_frame.pack(pady=5, fill=tk.BOTH)
 
-        self.process_tree = ttk.Treeview(
-            process_frame,
-            columns=("pid", "cpu", "ram"),
-            show="headings",
-            height=5,
-        )
-        self.process_tree.heading("pid", text="PID")
-        self.process_tree.heading("cpu", text="CPU %")
-        self.process_tree.heading("ram", text="RAM %")
-        self.process_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.process_table = build_process_table(process_frame, height=8)
 
         thresholds = ttk.Frame(process_frame)
         thresholds.pack(side=tk.RIGHT, padx=5)
@@ -172,60 +282,232 @@ class ResourceMonitorApp:
             side=tk.LEFT, padx=2
         )
 
-        # Układ wykresów
-        metrics_count = (
-            2
-            + len(self.disk_mounts)
-            + len(self.gpu.get_usage())
-            + 2
+        # Próbkowanie rusza przed importem matplotlib i budową wykresów
+        if self.replay is not None:
+            self.replay.start()
+        else:
+            self.sampler.start()
+        self.build_plots()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.timer = self.canvas.new_timer(interval=self.update_interval_ms)
+        self.timer.add_callback(self.update_plot, None)
+        self.timer.start()
+
+    def build_replay_controls(self):
+        """Buduje kontrolki odtwarzania: prędkość i suwak położenia."""
+        frame = ttk.Frame(self.root)
+        frame.pack(pady=5, fill=tk.X)
+
+        ttk.Label(frame, text="Odtwarzanie").pack(side=tk.LEFT, padx=5)
+        speed = self.replay.speed
+        self.replay_speed_var = tk.StringVar(
+            value="max" if speed is None else f"{speed:g}x"
+        )
+        speed_menu = ttk.Combobox(
+            frame,
+            textvariable=self.replay_speed_var,
+            values=["1x", "10x", "100x", "max"],
+            width=6,
+        )
+        speed_menu.bind("<<ComboboxSelected>>", lambda _e: self.set_replay_speed())
+        speed_menu.bind("<Return>", lambda _e: self.set_replay_speed())
+        speed_menu.pack(side=tk.LEFT, padx=5)
+
+        self.replay_scale = ttk.Scale(
+            frame,
+            from_=self.replay.start_time,
+            to=max(self.replay.end_time, self.replay.start_time + 1e-9),
+            orient=tk.HORIZONTAL,
         )
+        self.replay_scale.bind("<ButtonPress-1>", self._on_replay_drag)
+        self.replay_scale.bind(
+            "<ButtonRelease-1>", lambda _e: self.seek_replay(self.replay_scale.get())
+        )
+        self.replay_scale.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+
+    def _on_replay_drag(self, _event):
+        """Wstrzymuje przesuwanie suwaka przez timer podczas przeciągania."""
+        self._replay_dragging = True
+
+    def set_replay_speed(self):
+        """Ustawia prędkość odtwarzania z listy (np. ``10x`` lub ``max``)."""
+        from storage.replay import parse_speed
+
+        try:
+            self.replay.speed = parse_speed(self.replay_speed_var.get())
+        except ValueError:
+            return
+
+    def seek_replay(self, t):
+        """
+        Przewija odtwarzane nagranie do chwili ``t``.
+
+        Historia wykresów jest czyszczona, aby nie łączyć danych sprzed
+        i po przewinięciu.
+
+        Args:
+            t: Czas w jednostkach osi nagrania.
+        """
+        self._replay_dragging = False
+        self._replay_rows.clear()
+        self.replay.seek(t)
+        self.reset_view()
+
+    def reset_view(self):
+        """Czyści historię wykresów (po zmianie źródła danych)."""
+        for buffer in (self.x_data, self.samples):
+            buffer.clear()
+        self.rollups.clear()
+        self._last_seq = -1
+        self._process_seq = -1
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+    def build_plots(self):
+        """
+        Tworzy siatkę wykresów dla bieżącego zestawu metryk.
+
+        Przy ponownym wywołaniu (po podłączeniu lub odłączeniu dysku albo
+        GPU) czyści figurę i tworzy wykresy od nowa na tym samym płótnie.
+        """
+        from gui.renderer import BlitRenderer
+
+        metrics_count = len(self.series_buffers())
         cols = math.ceil(math.sqrt(metrics_count))
         rows = math.ceil(metrics_count / cols)
-        self.fig, axs = plt.subplots(rows, cols, figsize=(cols * 5, rows * 3))
+        if self.fig is None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from matplotlib.figure import Figure
+
+            self.fig = Figure(figsize=(cols * 5, rows * 3))
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self.root)
+            self.renderer = BlitRenderer(self.canvas, budget_ms=self.update_interval_ms)
+        else:
+            self.fig.clear()
+            self.renderer.clear()
+            self.lines.clear()
+            self.fills.clear()
+        axs = self.fig.subplots(rows, cols, squeeze=False)
         self.fig.tight_layout(pad=3.0)
         self.ax = axs.flatten()
 
         plot_idx = 0
-        plot_idx = self.init_plot("CPU", "blue", self.cpu_data, plot_idx)
-        plot_idx = self.init_plot("RAM", "green", self.ram_data, plot_idx)
-
-        for mount in self.disk_mounts:
-            plot_idx = self.init_plot(
-                f"DISK_{mount}", "orange",
-                self.disk_data[mount],
-                plot_idx
-            )
-
-        for g in self.gpu.get_usage():
-            name = f"GPU_{g.name}"
-            self.gpu_data[g.name] = []
+        for name, buffer in self.series.items():
+            match = REGISTRY.describe(name)
+            schema = match.schema
             plot_idx = self.init_plot(
-                name,
-                "purple",
-                self.gpu_data[g.name],
-                plot_idx
-            )
-
-        for net in ["NET_UP", "NET_DOWN"]:
-            plot_idx = self.init_plot(
-                net,
-                "brown",
-                self.network_data[net],
-                plot_idx
+                name, schema.color, buffer, plot_idx,
+                unit=schema.unit, ylim=schema.range,
             )
 
         for i in range(plot_idx, len(self.ax)):
             self.ax[i].axis("off")
 
         self.ax[-1].set_xlabel("Czas (s)")
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.root)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.ani = animation.FuncAnimation(
-            self.fig,
-            self.update_plot,
-            interval=self.update_interval_ms
+        self.update_xlim()
+
+    def metric_options(self):
+        """Zwraca nazwy metryk dostępnych do eksportu."""
+        return list(self.series_buffers()) + ["WSZYSTKO"]
+
+    def plot_names(self, readings: Dict[str, object]):
+        """
+        Zwraca nazwy serii z wykresami dla podanych odczytów monitorów.
+
+        Serie pojedyncze są zawsze obecne; serie urządzeń (dyski, GPU...)
+        wynikają z odczytu, a bez odczytu pozostają bez zmian.
+
+        Args:
+            readings: Słownik ``zadanie: wynik monitora``.
+        """
+        names = []
+        for spec in self.plot_specs:
+            value = readings.get(spec.task)
+            for schema in spec.series:
+                if not schema.plot:
+                    continue
+                if schema.key is None:
+                    names.append(schema.name)
+                elif value is None:
+                    names.extend(n for n in self.series if schema.match(n) is not None)
+                else:
+                    names.extend(
+                        schema.series_name(getattr(u, schema.key))
+                        for u in spec.items(value)
+                    )
+        return names
+
+    def sync_series(self, store):
+        """
+        Dodaje i usuwa serie urządzeń (dysków, GPU...) zgodnie z ostatnimi
+        odczytami.
+
+        Lista partycji i GPU zmienia się rzadko (monitory odświeżają ją
+        z ``TopologyCache``), więc zwykle kończy się na porównaniu zbiorów.
+        Nowe serie są wypełniane wartościami NaN do długości historii.
+
+        Args:
+            store: Magazyn odczytów wyświetlanego hosta.
+
+        Returns:
+            ``True`` jeśli zestaw serii się zmienił.
+        """
+        names = self.plot_names(
+            {spec.task: store.latest(spec.task) for spec in self.plot_specs}
+        )
+        if set(names) == set(self.series):
+            return False
+        for name in set(self.series) - set(names):
+            self.rollups.pop(name, None)
+        self.set_series(names)
+        logging.info("Zmiana zestawu wykresów: %s", list(self.series))
+        if self.fig is not None:
+            self.build_plots()
+            self.metric_menu.configure(values=self.metric_options())
+        return True
+
+    def set_series(self, names):
+        """
+        Ustawia zestaw serii (kolumn wierszy taktów).
+
+        Historia serii obecnych w poprzednim zestawie jest przepisywana,
+        nowe serie są wypełniane wartościami NaN do długości historii.
+
+        Args:
+            names: Nazwy serii w kolejności wykresów.
+        """
+        old_index, old = self.index, self.samples
+        index = SeriesIndex(names)
+        samples = RingBuffer(self.history_length, width=len(index))
+        if len(old):
+            rows = np.full((len(old), len(index)), math.nan)
+            history = old.view()
+            for name, column in index.positions.items():
+                if name in old_index:
+                    rows[:, column] = history[:, old_index.positions[name]]
+            samples.extend(rows)
+        self.index = index
+        self.samples = samples
+        self._row = np.empty(len(index))
+        self.series = {name: samples.column(i) for i, name in enumerate(index)}
+
+    def register_sampler_tasks(self):
+        """Rejestruje monitory w wątku próbkującym z bieżącymi interwałami."""
+        sample_s = self.sample_interval_ms / 1000
+        for task, monitor in self.monitors.items():
+            self.sampler.add(task, monitor.get_usage, sample_s)
+        # Lista procesów jest tylko wyświetlana, więc wystarczy tempo GUI
+        self.sampler.add(
+            "processes",
+            self.top_processes,
+            max(sample_s, self.update_interval_ms / 1000),
         )
 
+    def top_processes(self):
+        """Odczytuje procesy o najwyższym użyciu wg kolumny sortowania tabeli."""
+        sort_by = self.process_table.sort_by if self.process_table else "cpu"
+        return self.process_monitor.get_top_processes(self.process_rows, sort_by)
+
     def apply_settings(self):
         """Aktualizuje parametry interwału odświeżania i długości historii."""
         try:
@@ -237,25 +519,86 @@ class ResourceMonitorApp:
             return
         self.update_interval_ms = new_interval
         self.history_length = new_history
-        if hasattr(self, "ani") and self.ani:
-            self.ani.event_source.interval = self.update_interval_ms
+        if getattr(self, "timer", None):
+            self.timer.interval = self.update_interval_ms
+        self.sampler.set_interval(
+            "processes",
+            max(self.sample_interval_ms, self.update_interval_ms) / 1000,
+        )
         self.trim_buffers()
+        if getattr(self, "renderer", None):
+            self.renderer.stats.budget_ms = self.update_interval_ms
+            self.update_xlim()
+
+    def sync_threshold_rules(self):
+        """
+        Aktualizuje reguły alertów procesów na podstawie progów z GUI.
+
+        Reguły są wymieniane tylko po zmianie progu, więc wywołanie w każdym
+        takcie jest tanie.
+        """
+        thresholds = []
+        for var in (self.cpu_threshold_var, self.ram_threshold_var):
+            try:
+                thresholds.append(float(var.get()))
+            except (ValueError, AttributeError):
+                thresholds.append(None)
+        thresholds = tuple(thresholds)
+        if thresholds == self._thresholds:
+            return
+        self._thresholds = thresholds
+        for (name, metric), thr in zip(
+            [("process_cpu", "PROCESS_*_CPU"), ("process_ram", "PROCESS_*_RAM")],
+            thresholds,
+        ):
+            if thr is None:
+                self.alerts.remove_rule(name)
+            else:
+                self.alerts.add_rule(
+                    ThresholdRule(name, metric, thr, hysteresis=self.THRESHOLD_HYSTERESIS)
+                )
+
+    def select_host(self, name):
+        """
+        Przełącza wykresy na odczyty wybranego hosta.
+
+        Args:
+            name: Nazwa hosta z kolektora lub ``LOCAL_HOST`` dla maszyny
+                lokalnej.
+        """
+        if name == self.LOCAL_HOST or self.collector is None:
+            store = self.store
+        else:
+            store = self.collector.host(name).store
+        if store is self.view_store:
+            return
+        self.view_store = store
+        self.reset_view()
+
+    def update_xlim(self):
+        """
+        Ustawia stały zakres osi X: od najstarszej próbki do chwili obecnej.
+
+        Dane są rysowane względem najnowszej próbki, dzięki czemu zakres
+        osi nie zmienia się co klatkę i tło wykresów może być buforowane.
+        """
+        span = (self.history_length - 1) * self.update_interval_ms / 1000
+        self.renderer.set_xlim(-max(span, 1e-3), 0)
 
     def trim_buffers(self):
-        """Przycina bufory danych do ustalonej długości historii."""
-        if len(self.x_data) > self.history_length:
-            excess = len(self.x_data) - self.history_length
-            del self.x_data[:excess]
-            del self.cpu_data[:excess]
-            del self.ram_data[:excess]
-            for key in self.disk_data:
-                del self.disk_data[key][:excess]
-            for key in self.gpu_data:
-                del self.gpu_data[key][:excess]
-            for key in self.network_data:
-                del self.network_data[key][:excess]
-
-    def init_plot(self, label, color, data_buffer, idx):
+        """
+        Dopasowuje pojemność buforów do ustalonej długości historii.
+
+        Bufory cykliczne same odrzucają najstarsze próbki, więc wystarczy
+        wywołać tę metodę po zmianie ``history_length``.
+        """
+        for buffer in (self.x_data, self.samples):
+            buffer.resize(self.history_length)
+        window_s = self.history_length * self.update_interval_ms / 1000
+        for rollup in self.rollups.values():
+            rollup.resize(window_s)
+
+    def init_plot(self, label, color, data_buffer, idx, unit="%", ylim=(0.0, 100.0)):
         """
         Tworzy nowy wykres dla danej metryki.
 
@@ -264,91 +607,124 @@ class ResourceMonitorApp:
             color: Kolor wykresu.
             data_buffer: Bufor z danymi.
             idx: Indeks wykresu na siatce matplotlib.
+            unit: Jednostka osi Y.
+            ylim: Zakres osi Y ``(min, max)``; przy ``max`` równym ``None``
+                zakres osi powiększa się wraz z danymi.
 
         Returns:
             Nowy indeks wykresu.
         """
+        from gui.renderer import make_fill
+
         line, = self.ax[idx].plot([], [], label=label, color=color)
-        fill = self.ax[idx].fill_between([], [], [], color=color, alpha=0.3)
-        self.ax[idx].set_ylim(0, 100)
+        fill = make_fill(self.ax[idx], color)
+        low, high = ylim
+        self.ax[idx].set_ylim(low, 100 if high is None else high)
         self.ax[idx].set_title(label)
-        self.ax[idx].set_ylabel("%")
+        self.ax[idx].set_ylabel(unit)
         self.ax[idx].grid(True)
         self.lines[label] = line
         self.fills[label] = fill
+        self.renderer.add(label, line, fill, autoscale=high is None)
         return idx + 1
 
     @safe_call()
+    @instrumented("render.tick")
     def update_plot(self, frame):
         """
-        Aktualizuje dane oraz rysuje wykresy w regularnych odstępach czasu.
-        Funkcja jest wywoływana co sekundę przez animację matplotlib.
+        Odczytuje najnowsze dane z magazynu i odświeża wykresy.
+        Funkcja jest wywoływana cyklicznie przez timer płótna matplotlib;
+        same monitory działają w wątku próbkującym.
         Args:
-            frame: Numer aktualnej klatki animacji (ignorowany).
+            frame: Argument wywołania timera (ignorowany).
         """
-        self.x_data.append(self.frame_count)
-        self.cpu_data.append(self.cpu.get_usage().percent)
-        self.ram_data.append(self.ram.get_usage().percent)
+        store = self.view_store
+        seq = store.seq
+        if seq == self._last_seq:
+            return
+        self._last_seq = seq
+
+        self.sync_series(store)
+        if self.replay is not None and store is self.store:
+            # Każdy wiersz nagrania z czasem nagrania
+            rows = [self._replay_rows.popleft() for _ in range(len(self._replay_rows))]
+        else:
+            rows = [self.latest_row(store)]
+        for t, readings in rows:
+            now_s = t if not len(self.x_data) else max(t, self.x_data.last)
+            self.append_row(readings, now_s)
+        if not len(self.x_data):
+            return
 
-        for usage in self.disk.get_usage():
-            self.disk_data[usage.mount].append(usage.percent)
+        interval_s = self.update_interval_ms / 1000
+        x = self.x_data.view()
+        now_s = float(x[-1])
+        self._x_rel = x - now_s
+        self._now_s = now_s
+        self._plot_tier = select_tier(
+            DEFAULT_TIERS, x[-1] - x[0], self.MAX_PLOT_POINTS, interval_s
+        )
+        for name, buffer in self.series.items():
+            self.refresh_plot(name, buffer)
 
-        for usage in self.gpu.get_usage():
-            self.gpu_data[usage.name].append(usage.percent)
+        processes = store.get("processes")
+        if self.process_table and processes is not None:
+            # Lista procesów odświeża się rzadziej niż wykresy
+            if processes.seq != self._process_seq:
+                self._process_seq = processes.seq
+                self.process_table.update(processes.value)
 
-        net = self.network.get_usage()
-        self.network_data["NET_UP"].append(net.upload_kbps)
-        self.network_data["NET_DOWN"].append(net.download_kbps)
+        if self.replay_scale is not None and not self._replay_dragging:
+            self.replay_scale.set(self.replay.time)
 
-        self.trim_buffers()
+        self.sync_threshold_rules()
+        if self.alert_var is not None and self.banner.version != self._banner_version:
+            self._banner_version = self.banner.version
+            self.alert_var.set(self.banner.text())
 
-        self.frame_count += 1
-        self.refresh_plot("CPU", self.cpu_data)
-        self.refresh_plot("RAM", self.ram_data)
-        for k in self.disk_data:
-            self.refresh_plot(f"DISK_{k}", self.disk_data[k])
-        for k in self.gpu_data:
-            self.refresh_plot(f"GPU_{k}", self.gpu_data[k])
-        for k in self.network_data:
-            self.refresh_plot(k, self.network_data[k])
-
-        processes = self.process_monitor.get_top_processes()
-        if self.process_tree:
-            self.process_tree.delete(*self.process_tree.get_children())
-            for p in processes:
-                self.process_tree.insert(
-                    "", tk.END, values=(p.pid, f"{p.cpu_percent:.1f}", f"{p.memory_percent:.1f}")
-                )
+        self.renderer.draw()
 
-        try:
-            cpu_thr = float(self.cpu_threshold_var.get())
-        except (ValueError, AttributeError):
-            cpu_thr = None
-        try:
-            ram_thr = float(self.ram_threshold_var.get())
-        except (ValueError, AttributeError):
-            ram_thr = None
-
-        if (cpu_thr is not None) or (ram_thr is not None):
-            for p in processes:
-                if (
-                    (cpu_thr is not None and p.cpu_percent > cpu_thr)
-                    or (ram_thr is not None and p.memory_percent > ram_thr)
-                ):
-                    messagebox.showwarning(
-                        "Próg przekroczony",
-                        f"Proces {p.name} (PID {p.pid}) przekracza próg",
-                    )
-                    break
+    def queue_replay_row(self, t: float, readings: Dict[str, Any]) -> None:
+        """Kolejkuje wiersz nagrania do zapisu w najbliższym takcie GUI."""
+        self._replay_rows.append((t, readings))
 
-        for ax in self.ax:
-            ax.set_xlim(
-                max(0, self.frame_count - self.history_length),
-                self.frame_count + 1,
-            )
+    def latest_row(self, store) -> Tuple[float, Dict[str, Any]]:
+        """
+        Zwraca ostatnie odczyty zadań wykresów jako jeden wiersz.
+
+        Czasem wiersza jest czas najnowszego odczytu (a nie chwila
+        odświeżenia wykresów).
 
-        self.canvas.draw()
+        Returns:
+            Krotka ``(czas uniksowy w s, {zadanie: wynik})``.
+        """
+        snapshots = [store.get(task) for task in self.index.tasks]
+        readings = {
+            task: snap.value
+            for task, snap in zip(self.index.tasks, snapshots) if snap is not None
+        }
+        wall_ns = max((snap.wall_ns for snap in snapshots if snap is not None), default=0)
+        return (wall_ns or time_ns()) / 1e9, readings
 
+    def append_row(self, readings: Dict[str, Any], now_s: float) -> None:
+        """
+        Zapisuje wiersz (takt) do wspólnego bufora i poziomów agregacji.
+
+        Args:
+            readings: Wyniki monitorów ``{zadanie: wynik}``.
+            now_s: Czas wiersza w sekundach.
+        """
+        batch = self.index.pack(readings, now_s, out=self._row)
+        self.x_data.append(batch.timestamp)
+        self.samples.append(batch.values)
+        window_s = self.history_length * self.update_interval_ms / 1000
+        for label, buffer in self.series_buffers().items():
+            rollup = self.rollups.get(label)
+            if rollup is None:
+                rollup = self.rollups[label] = RollupHistory(window_s, DEFAULT_TIERS)
+            rollup.add(now_s, buffer.last)
+
+    @instrumented("render.refresh_plot")
     def refresh_plot(self, label, data):
         """
         Aktualizuje pojedynczy wykres na podstawie nowo zebranych danych.
@@ -359,111 +735,122 @@ class ResourceMonitorApp:
         """
         if len(data) != len(self.x_data):
             return
-        line = self.lines[label]
-        line.set_data(self.x_data, data)
-        if self.fills[label]:
-            self.fills[label].remove()
-        self.fills[label] = line.axes.fill_between(
-            self.x_data,
-            data,
-            alpha=0.3,
-            color=line.get_color()
-        )
+        if self._plot_tier is not None and label in self.rollups:
+            # Długa historia - rysujemy średnie z poziomu agregacji
+            t, y = self.rollups[label].view(self._plot_tier)
+            self.renderer.update(label, t - self._now_s, y)
+            return
+        self.renderer.update(label, self._x_rel, data.view())
 
     def on_close(self) -> None:
         """Handle application shutdown and persist settings."""
-        try:
-            cpu_thr = int(self.cpu_threshold_var.get())
-        except (ValueError, tk.TclError):
-            cpu_thr = 90
-        try:
-            ram_thr = int(self.ram_threshold_var.get())
-        except (ValueError, tk.TclError):
-            ram_thr = 90
+        cpu_thr = self._threshold(self.cpu_threshold_var)
+        ram_thr = self._threshold(self.ram_threshold_var)
+        self._shutdown()
         save_config(
             {
                 "update_interval_ms": self.update_interval_ms,
+                "sample_interval_ms": self.sample_interval_ms,
                 "history_length": self.history_length,
                 "cpu_threshold": cpu_thr,
                 "ram_threshold": ram_thr,
+                "storage_dir": self.storage_dir,
+                "self_metrics": self.self_metrics,
+                "io_metrics": self.io_metrics,
+                "process_rows": self.process_rows,
+                "collector_listen": self.collector_listen,
+                **self.alert_config,
             }
         )
         safe_call()(self.root.destroy)()
 
+    @staticmethod
+    def _threshold(var, default: int = 90) -> int:
+        """Odczytuje próg z pola formularza (``default`` dla błędnej wartości)."""
+        try:
+            return int(var.get())
+        except (ValueError, tk.TclError):
+            return default
+
+    def _shutdown(self) -> None:
+        """Zatrzymuje próbkowanie, monitory, alerty, kolektor i zapis na dysk."""
+        self.sampler.stop()
+        if self.replay is not None:
+            self.replay.stop()
+        self.executor.shutdown()
+        for monitor in self.monitors.values():
+            # Np. GPUMonitor kończy sesję NVML
+            if hasattr(monitor, "close"):
+                monitor.close()
+        self.alerts.detach()
+        for sink in self.alerts.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+        if self.collector is not None:
+            self.collector.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def series_buffers(self) -> Dict[str, ColumnView]:
+        """Zwraca bufory historii wszystkich metryk według nazw wykresów."""
+        return dict(self.series)
+
+    def all_metrics(self) -> Dict[str, np.ndarray]:
+        """Zwraca widoki (bez kopiowania) historii wszystkich metryk."""
+        return {k: v.view() for k, v in self.series_buffers().items()}
+
     def export_selected(self):
         """
-        Eksportuje wybraną przez użytkownika metrykę do pliku CSV lub JSON.
-        Obsługuje eksport pojedynczych oraz wszystkich metryk naraz.
+        Eksportuje wybraną przez użytkownika metrykę do pliku CSV, JSON
+        lub kolumnowego NPZ. Obsługuje eksport pojedynczych oraz wszystkich
+        metryk naraz.
         """
+        from exporter.exporters import (
+            Exporter, MultiMetricExporter, JSONExporter, NPZExporter, SeriesExporter
+        )
+
         key = self.selected_metric.get()
         fmt = self.export_format_var.get()
         exporter: Exporter
 
-        if fmt == "JSON":
-            exporter = JSONExporter()
+        if fmt in ("JSON", "NPZ"):
+            exporter = JSONExporter() if fmt == "JSON" else NPZExporter()
+            ext = fmt.lower()
             if key == "WSZYSTKO":
-                data = {
-                    "CPU": self.cpu_data,
-                    "RAM": self.ram_data,
-                    **{f"DISK_{k}": v for k, v in self.disk_data.items()},
-                    **{f"GPU_{k}": v for k, v in self.gpu_data.items()},
-                    **self.network_data,
-                }
-                exporter.export("all_metrics.json", self.x_data, data)
-                return
-            elif key == "CPU":
-                data = {"CPU": self.cpu_data}
-            elif key == "RAM":
-                data = {"RAM": self.ram_data}
-            elif key.startswith("DISK_"):
-                mount = key.split("_", 1)[1]
-                data = {f"DISK_{mount}": self.disk_data[mount]}
-            elif key.startswith("GPU_"):
-                name = key.split("_", 1)[1]
-                data = {f"GPU_{name}": self.gpu_data[name]}
-            elif key in ["NET_UP", "NET_DOWN"]:
-                data = {key: self.network_data[key]}
-            else:
-                return
-
-            exporter.export(f"{key.lower()}_data.json", self.x_data, data)
+                data = self.all_metrics()
+                exporter.export(f"all_metrics.{ext}", self.x_data.view(), data)
+            elif key in self.series:
+                data = {key: self.series[key].view()}
+                exporter.export(f"{key.lower()}_data.{ext}", self.x_data.view(), data)
             return
 
-        if key == "CPU":
-            exporter = CPUExporter()
-            data = self.cpu_data
-        elif key == "RAM":
-            exporter = RAMExporter()
-            data = self.ram_data
-        elif key.startswith("DISK_"):
-            mount = key.split("_", 1)[1]
-            exporter = DiskExporter(mount)
-            data = self.disk_data[mount]
-        elif key.startswith("GPU_"):
-            name = key.split("_", 1)[1]
-            exporter = GPUExporter(name)
-            data = self.gpu_data[name]
-        elif key in ["NET_UP", "NET_DOWN"]:
-            exporter = NetworkExporter(key)
-            data = self.network_data[key]
-        elif key == "WSZYSTKO":
+        if key == "WSZYSTKO":
             exporter = MultiMetricExporter()
-            data = {
-                "CPU": self.cpu_data,
-                "RAM": self.ram_data,
-                **{f"DISK_{k}": v for k, v in self.disk_data.items()},
-                **{f"GPU_{k}": v for k, v in self.gpu_data.items()},
-                **self.network_data,
-            }
-            exporter.export("all_metrics.csv", self.x_data, data)
-            return
-        else:
-            return
-
-        exporter.export(f"{key.lower()}_data.csv", self.x_data, data)
+            data = self.all_metrics()
+            exporter.export("all_metrics.csv", self.x_data.view(), data)
+        elif key in self.series:
+            # Etykieta kolumny i jednostka pochodzą ze schematu serii
+            exporter = SeriesExporter.for_series(key)
+            data = self.series[key].view()
+            exporter.export(f"{key.lower()}_data.csv", self.x_data.view(), data)
 
 
 if __name__ == "__main__":
+    import storage.replay as replay_mod
+
+    parser = argparse.ArgumentParser(description="Monitor zasobów systemowych.")
+    parser.add_argument(
+        "--replay",
+        help="odtwórz nagranie (CSV, JSON, JSON Lines, NPZ lub katalog magazynu)",
+    )
+    parser.add_argument(
+        "--speed", type=replay_mod.parse_speed, default=1.0,
+        help="prędkość odtwarzania: 1, 10, 100... lub max",
+    )
+    args = parser.parse_args()
+    replay = None
+    if args.replay:
+        replay = replay_mod.ReplaySource.from_file(args.replay, speed=args.speed)
     root = tk.Tk()
-    app = ResourceMonitorApp(root)
+    app = ResourceMonitorApp(root, replay=replay)
     root.mainloop()
@@ -1,18 +1,100 @@
+import dataclasses
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import ClassVar, Dict, Optional, Tuple, Type
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseUsage:
     """Dane o użyciu zasobu."""
 
     percent: float
 
 
+KEY = "{key}"
+
+
+@dataclass
+class SeriesSchema:
+    """
+    Opis jednej serii (metryki) publikowanej przez monitor.
+
+    Na podstawie schematów generowane są nazwy metryk (``flatten``),
+    odtwarzanie wyników z metryk (``unflatten``), wykresy GUI, jednostki
+    w eksportach i nazwy metryk Prometheus.
+
+    Args:
+        name: Nazwa metryki; dla monitorów wielu urządzeń zawiera znacznik
+            ``{key}`` zastępowany nazwą urządzenia, np. ``DISK_{key}``.
+        field: Pole wyniku monitora z wartością serii.
+        key: Pole wyniku z nazwą urządzenia (liczność: jedna seria na
+            urządzenie); ``None`` - pojedyncza seria.
+        unit: Jednostka wartości.
+        kind: Typ metryki: ``gauge`` albo ``counter``.
+        range: Zakres wartości ``(min, max)``; ``max`` równe ``None`` -
+            zakres nieograniczony (oś wykresu skaluje się do danych).
+        plot: Czy seria ma wykres w GUI.
+        color: Kolor wykresu.
+        title: Opis serii w eksporcie CSV (``{key}`` jak w ``name``);
+            domyślnie nazwa metryki.
+        family: Nazwa metryki Prometheus (bez przedrostka aplikacji);
+            domyślnie nazwa metryki małymi literami.
+        label: Nazwa etykiety Prometheus z nazwą urządzenia; domyślnie
+            ``key``.
+        labels: Stałe etykiety Prometheus, np. ``{"direction": "up"}``.
+        description: Opis metryki (``# HELP`` w Prometheusie).
+    """
+
+    name: str
+    field: str = "percent"
+    key: Optional[str] = None
+    unit: str = "%"
+    kind: str = "gauge"
+    range: Tuple[float, Optional[float]] = (0.0, 100.0)
+    plot: bool = True
+    color: str = "blue"
+    title: Optional[str] = None
+    family: Optional[str] = None
+    label: Optional[str] = None
+    labels: Dict[str, str] = dataclasses.field(default_factory=dict)
+    description: str = ""
+
+    def series_name(self, key: Optional[str] = None) -> str:
+        """Zwraca nazwę metryki dla urządzenia ``key``."""
+        return self.name if self.key is None else self.name.replace(KEY, str(key))
+
+    def match(self, name: str) -> Optional[str]:
+        """
+        Sprawdza, czy metryka ``name`` należy do tej serii.
+
+        Returns:
+            Nazwa urządzenia (``""`` dla serii pojedynczej) albo ``None``,
+            gdy nazwa nie pasuje.
+        """
+        if self.key is None:
+            return "" if name == self.name else None
+        prefix, _, suffix = self.name.partition(KEY)
+        if (
+            len(name) > len(prefix) + len(suffix)
+            and name.startswith(prefix)
+            and name.endswith(suffix)
+        ):
+            return name[len(prefix):len(name) - len(suffix)]
+        return None
+
+
 class BaseMonitor(ABC):
     """
     Abstrakcyjna klasa bazowa dla wszystkich monitorów.
+
+    Monitor deklaruje nazwę zadania próbkowania (``TASK``), klasę wyniku
+    (``USAGE``) i publikowane serie (``SERIES``); na tej podstawie
+    ``monitor.registry`` włącza go do próbkowania, zapisu, wykresów
+    i eksportu.
     """
+    TASK: ClassVar[str] = ""
+    USAGE: ClassVar[Optional[Type[BaseUsage]]] = None
+    SERIES: ClassVar[Tuple[SeriesSchema, ...]] = ()
 
     @abstractmethod
     def get_usage(self) -> BaseUsage:
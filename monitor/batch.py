@@ -0,0 +1,107 @@
+"""Zwarta reprezentacja jednego taktu wszystkich serii.
+
+Zamiast słownika ``metryka: wartość`` budowanego w każdym takcie (``flatten``)
+takt to ``SampleBatch``: znacznik czasu i tablica ``float64`` z wartościami
+serii w stałej kolejności ``SeriesIndex``. Plan wypełniania tablicy (która
+kolumna odpowiada któremu polu którego wyniku monitora) jest wyliczany raz,
+przy zmianie zestawu serii, więc takt nie tworzy nazw metryk ani obiektów
+pośrednich - tylko zapisuje pola wyników do gotowej tablicy.
+"""
+
+import math
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .registry import REGISTRY, MonitorRegistry
+
+
+class SampleBatch(NamedTuple):
+    """Jeden takt: znacznik czasu i wartości serii w kolejności indeksu."""
+
+    timestamp: float
+    values: np.ndarray
+
+
+# (pole z nazwą urządzenia lub None, pole wartości, urządzenie -> kolumna)
+_Entry = Tuple[Optional[str], str, Dict[str, int]]
+
+
+class SeriesIndex:
+    """
+    Stała kolejność serii (nazwa -> kolumna) z planem pakowania wyników.
+
+    Args:
+        names: Nazwy serii w kolejności kolumn.
+        registry: Rejestr monitorów opisujący serie; serie nieznane
+            rejestrowi mają zawsze wartość NaN.
+    """
+    def __init__(self, names: Sequence[str], registry: MonitorRegistry = REGISTRY):
+        self.names: Tuple[str, ...] = tuple(names)
+        self.positions: Dict[str, int] = {n: i for i, n in enumerate(self.names)}
+        plan: Dict[str, Dict[Tuple[Optional[str], str], Dict[str, int]]] = {}
+        for column, name in enumerate(self.names):
+            match = registry.describe(name)
+            if match is None:
+                continue
+            entries = plan.setdefault(match.spec.task, {})
+            schema = match.schema
+            entries.setdefault((schema.key, schema.field), {})[match.key] = column
+        self._plan: Dict[str, List[_Entry]] = {
+            task: [(key, field, columns) for (key, field), columns in entries.items()]
+            for task, entries in plan.items()
+        }
+
+    @property
+    def tasks(self) -> List[str]:
+        """Zadania próbkowania, z których pochodzą wartości serii."""
+        return list(self._plan)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def pack(
+        self,
+        readings: Dict[str, Any],
+        timestamp: float,
+        out: Optional[np.ndarray] = None,
+    ) -> SampleBatch:
+        """
+        Zapisuje wyniki monitorów do tablicy wartości taktu.
+
+        Args:
+            readings: Słownik ``zadanie: wynik monitora`` (brak wyniku -
+                NaN w kolumnach jego serii).
+            timestamp: Znacznik czasu taktu.
+            out: Tablica wielokrotnego użytku o długości ``len(self)``;
+                domyślnie nowa.
+
+        Returns:
+            Takt z wartościami w kolejności ``names``.
+        """
+        values = np.empty(len(self.names)) if out is None else out
+        values.fill(math.nan)
+        for task, entries in self._plan.items():
+            value = readings.get(task)
+            if value is None:
+                continue
+            items = value if isinstance(value, (list, tuple)) else (value,)
+            for key, field, columns in entries:
+                if key is None:
+                    values[columns[""]] = getattr(items[0], field)
+                    continue
+                for item in items:
+                    column = columns.get(getattr(item, key))
+                    if column is not None:
+                        values[column] = getattr(item, field)
+        return SampleBatch(timestamp, values)
+
+    def unpack(self, batch: SampleBatch) -> Dict[str, float]:
+        """Zamienia takt na słownik ``metryka: wartość`` (np. dla eksportu)."""
+        return dict(zip(self.names, batch.values.tolist()))
@@ -0,0 +1,75 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+COUNTER_WRAP = 2 ** 32
+
+
+class CounterDeltas:
+    """
+    Liczy przyrosty liczników systemowych wielu urządzeń naraz.
+
+    Odczyt wszystkich urządzeń (``psutil.*_counters(perdisk/pernic=True)``)
+    jest zamieniany na macierz ``urządzenia x pola`` i odejmowany od
+    poprzedniej jednym działaniem numpy. Ujemny przyrost licznika mniejszego
+    niż 2**32 jest traktowany jako przepełnienie 32-bitowego licznika;
+    w pozostałych przypadkach (reset urządzenia) przyrost jest nieznany
+    (NaN). Urządzenia, które pojawiły się od poprzedniego odczytu, również
+    mają przyrost NaN.
+    """
+    def __init__(self, fields: Sequence[str]):
+        """
+        Args:
+            fields: Nazwy pól liczników (atrybuty krotek psutil).
+        """
+        self.fields = list(fields)
+        self._names: List[str] = []
+        self._values: Optional[np.ndarray] = None
+        self._time_ns: Optional[int] = None
+
+    def update(
+        self, counters: Dict[str, object], timestamp_ns: int
+    ) -> Tuple[List[str], np.ndarray, float]:
+        """
+        Zapamiętuje odczyt i zwraca przyrosty względem poprzedniego.
+
+        Args:
+            counters: Słownik ``urządzenie: krotka liczników``.
+            timestamp_ns: Chwila odczytu w nanosekundach
+                (``time.monotonic_ns()``, wspólny zegar wszystkich przepływności).
+
+        Returns:
+            Krotka ``(urządzenia, przyrosty, czas)``, gdzie ``przyrosty`` to
+            macierz ``len(urządzenia) x len(fields)``, a ``czas`` to odstęp
+            od poprzedniego odczytu w sekundach (0 przy pierwszym wywołaniu).
+        """
+        names = list(counters)
+        values = np.array(
+            [[getattr(c, f, 0) for f in self.fields] for c in counters.values()],
+            dtype=np.float64,
+        ).reshape(len(names), len(self.fields))
+
+        prev = self._values
+        if prev is not None and names != self._names:
+            # Zmiana zestawu urządzeń - wyrównanie wierszy po nazwach
+            index = {name: i for i, name in enumerate(self._names)}
+            aligned = np.full_like(values, np.nan)
+            for row, name in enumerate(names):
+                if name in index:
+                    aligned[row] = prev[index[name]]
+            prev = aligned
+
+        elapsed = 0.0 if self._time_ns is None else (timestamp_ns - self._time_ns) / 1e9
+        if prev is None:
+            deltas = np.full_like(values, np.nan)
+        else:
+            deltas = values - prev
+            wrapped = deltas < 0
+            if wrapped.any():
+                fix = np.where(prev < COUNTER_WRAP, COUNTER_WRAP, np.nan)
+                deltas[wrapped] += fix[wrapped]
+
+        self._names = names
+        self._values = values
+        self._time_ns = timestamp_ns
+        return names, deltas, elapsed
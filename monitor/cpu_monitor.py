@@ -1,21 +1,109 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 import psutil
 
-from .base_monitor import BaseMonitor, BaseUsage
+from .base_monitor import BaseMonitor, BaseUsage, SeriesSchema
 
 
-@dataclass
+@dataclass(slots=True)
 class CPUUsage(BaseUsage):
-    """Przechowuje informacje o aktualnym wykorzystaniu CPU."""
+    """
+    Przechowuje informacje o aktualnym wykorzystaniu CPU.
+
+    Oprócz łącznego obciążenia zawiera obciążenie każdego rdzenia oraz
+    udział czasu użytkownika, systemu, oczekiwania na I/O i ``steal``
+    (wszystko w procentach).
+    """
+
+    per_core: List[float] = field(default_factory=list)
+    user: float = 0.0
+    system: float = 0.0
+    iowait: float = 0.0
+    steal: float = 0.0
+
+
+def _field(times, name: str) -> float:
+    """Zwraca pole ``cpu_times`` lub 0.0, jeśli platforma go nie udostępnia."""
+    return getattr(times, name, 0.0)
+
+
+def _total(times) -> float:
+    """
+    Łączny czas rdzenia. Czasy ``guest`` są już wliczone w ``user``/``nice``,
+    więc odejmujemy je, tak jak robi to psutil.
+    """
+    return sum(times) - _field(times, "guest") - _field(times, "guest_nice")
 
 
 class CPUMonitor(BaseMonitor):
     """
     Monitor CPU.
+
+    Domyślnie działa w trybie różnicowym: pamięta poprzedni odczyt
+    ``psutil.cpu_times(percpu=True)`` i liczy wykorzystanie od ostatniego
+    wywołania, bez blokowania. Podanie ``interval`` przywraca blokujące
+    ``psutil.cpu_percent(interval=...)``.
     """
+    TASK = "cpu"
+    USAGE = CPUUsage
+    SERIES = (
+        SeriesSchema(
+            "CPU", color="blue", family="cpu_percent",
+            description="Użycie CPU w procentach.",
+        ),
+    )
+
+    def __init__(self, interval: Optional[float] = None):
+        """
+        Args:
+            interval: Czas pomiaru w sekundach dla trybu blokującego;
+                ``None`` oznacza tryb różnicowy.
+        """
+        self.interval = interval
+        self._last_times = (
+            psutil.cpu_times(percpu=True) if interval is None else None
+        )
+
     def get_usage(self) -> CPUUsage:
         """
         Zwraca dane o aktualnym użyciu CPU.
         """
-        return CPUUsage(percent=psutil.cpu_percent(interval=1))
+        if self.interval is not None:
+            return CPUUsage(percent=psutil.cpu_percent(interval=self.interval))
+
+        current = psutil.cpu_times(percpu=True)
+        previous, self._last_times = self._last_times, current
+        if previous is None or len(previous) != len(current):
+            # Zmiana liczby rdzeni - liczymy od startu systemu
+            previous = [None] * len(current)
+
+        per_core: List[float] = []
+        total_sum = busy_sum = 0.0
+        parts = {"user": 0.0, "system": 0.0, "iowait": 0.0, "steal": 0.0}
+        for prev, cur in zip(previous, current):
+            total = _total(cur) - (_total(prev) if prev is not None else 0.0)
+            idle = (_field(cur, "idle") + _field(cur, "iowait")) - (
+                _field(prev, "idle") + _field(prev, "iowait")
+                if prev is not None else 0.0
+            )
+            if total <= 0:
+                per_core.append(0.0)
+                continue
+            busy = min(max(total - idle, 0.0), total)
+            per_core.append(busy / total * 100)
+            total_sum += total
+            busy_sum += busy
+            for name in parts:
+                delta = _field(cur, name) - (
+                    _field(prev, name) if prev is not None else 0.0
+                )
+                parts[name] += max(delta, 0.0)
+
+        if total_sum <= 0:
+            return CPUUsage(percent=0.0, per_core=per_core)
+        return CPUUsage(
+            percent=busy_sum / total_sum * 100,
+            per_core=per_core,
+            **{name: value / total_sum * 100 for name, value in parts.items()},
+        )
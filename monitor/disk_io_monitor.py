@@ -0,0 +1,120 @@
+import math
+from dataclasses import dataclass
+from time import monotonic_ns
+from typing import Dict, List, Sequence
+
+import numpy as np
+import psutil
+
+from .base_monitor import BaseMonitor, BaseUsage, SeriesSchema
+from .counters import CounterDeltas
+
+DISK_IO_FIELDS = (
+    "read_bytes", "write_bytes", "read_count", "write_count",
+    "read_time", "write_time", "busy_time",
+)
+# Przyrostek nazwy metryki -> pole wyniku monitora
+DISK_IO_SERIES = {
+    "READ": "read_kbps",
+    "WRITE": "write_kbps",
+    "READ_IOPS": "read_iops",
+    "WRITE_IOPS": "write_iops",
+    "AWAIT": "await_ms",
+    "BUSY": "percent",
+}
+_DISK_IO_UNITS = {"READ": "KB/s", "WRITE": "KB/s", "AWAIT": "ms", "BUSY": "%"}
+_DISK_IO_HELP = {
+    "READ": "Odczyt z urządzenia w KB/s.",
+    "WRITE": "Zapis na urządzenie w KB/s.",
+    "AWAIT": "Średni czas obsługi operacji dyskowej w ms.",
+}
+
+
+@dataclass(slots=True)
+class DiskIOUsage(BaseUsage):
+    """
+    Obciążenie wejścia/wyjścia jednego urządzenia blokowego.
+
+    ``percent`` to odsetek czasu, w którym urządzenie obsługiwało żądania
+    (NaN, gdy system go nie udostępnia), a ``await_ms`` - średni czas
+    obsługi jednej operacji w ostatnim takcie.
+    """
+
+    name: str
+    read_kbps: float
+    write_kbps: float
+    read_iops: float
+    write_iops: float
+    await_ms: float
+
+
+class DiskIOMonitor(BaseMonitor):
+    """
+    Monitor wejścia/wyjścia dysków.
+
+    W każdym takcie wykonuje jeden odczyt
+    ``psutil.disk_io_counters(perdisk=True)`` i wylicza przyrosty wszystkich
+    urządzeń naraz (``CounterDeltas``).
+    """
+    TASK = "diskio"
+    USAGE = DiskIOUsage
+    SERIES = tuple(
+        SeriesSchema(
+            f"IO_{{key}}_{suffix}", field=field, key="name", label="disk",
+            unit=_DISK_IO_UNITS.get(suffix, "1/s"),
+            range=(0.0, 100.0 if suffix == "BUSY" else None),
+            plot=False, family=f"disk_io_{suffix.lower()}",
+            description=_DISK_IO_HELP.get(suffix, ""),
+        )
+        for suffix, field in DISK_IO_SERIES.items()
+    )
+
+    def __init__(self, exclude: Sequence[str] = ("loop", "ram", "zram")):
+        """
+        Args:
+            exclude: Prefiksy nazw pomijanych urządzeń (wirtualnych).
+        """
+        self.exclude = tuple(exclude)
+        self.deltas = CounterDeltas(DISK_IO_FIELDS)
+        counters = self._counters()
+        self.busy_time = any(hasattr(c, "busy_time") for c in counters.values())
+        self.deltas.update(counters, monotonic_ns())
+
+    def _counters(self) -> Dict[str, object]:
+        """Odczytuje liczniki urządzeń z pominięciem wykluczonych."""
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+        return {
+            name: c for name, c in counters.items()
+            if not name.startswith(self.exclude)
+        }
+
+    def get_usage(self) -> List[DiskIOUsage]:
+        """
+        Zwraca listę obiektów DiskIOUsage dla wszystkich urządzeń.
+        """
+        names, deltas, elapsed = self.deltas.update(self._counters(), monotonic_ns())
+        if elapsed <= 0:
+            return []
+        rates = deltas[:, :4] / elapsed
+        rates[:, :2] /= 1024  # B/s -> KB/s
+        ops = deltas[:, 2] + deltas[:, 3]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            await_ms = np.where(ops > 0, (deltas[:, 4] + deltas[:, 5]) / ops, 0.0)
+        if self.busy_time:
+            # busy_time w ms, odstęp w s
+            busy = np.minimum(deltas[:, 6] / (elapsed * 10), 100.0)
+        else:
+            busy = np.full(len(names), math.nan)
+
+        return [
+            DiskIOUsage(
+                percent=float(busy[i]),
+                name=name,
+                read_kbps=float(rates[i, 0]),
+                write_kbps=float(rates[i, 1]),
+                read_iops=float(rates[i, 2]),
+                write_iops=float(rates[i, 3]),
+                await_ms=float(await_ms[i]),
+            )
+            for i, name in enumerate(names)
+        ]
@@ -1,12 +1,13 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 import psutil
 
-from .base_monitor import BaseMonitor, BaseUsage
+from .base_monitor import BaseMonitor, BaseUsage, SeriesSchema
+from .topology import TopologyCache
 
 
-@dataclass
+@dataclass(slots=True)
 class DiskUsage(BaseUsage):
     """Przechowuje informacje o użyciu danego dysku."""
 
@@ -18,13 +19,32 @@ class DiskUsage(BaseUsage):
 class DiskMonitor(BaseMonitor):
     """
     Monitor dysku.
+
+    Lista partycji pochodzi z ``TopologyCache`` i nie jest odczytywana
+    w każdym takcie.
     """
+    TASK = "disk"
+    USAGE = DiskUsage
+    SERIES = (
+        SeriesSchema(
+            "DISK_{key}", key="mount", color="orange", title="Dysk {key}",
+            family="disk_percent", description="Zajętość dysku w procentach.",
+        ),
+    )
+
+    def __init__(self, topology: Optional[TopologyCache] = None):
+        """
+        Args:
+            topology: Wspólna pamięć topologii; domyślnie własna instancja.
+        """
+        self.topology = topology if topology is not None else TopologyCache()
+
     def get_usage(self) -> List[DiskUsage]:
         """
         Zwraca listę obiektów DiskUsage dla wszystkich zamontowanych dysków.
         """
         usages = []
-        for part in psutil.disk_partitions():
+        for part in self.topology.partitions():
             try:
                 usage = psutil.disk_usage(part.mountpoint)
                 usages.append(DiskUsage(
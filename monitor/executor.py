@@ -0,0 +1,195 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future, wait
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class _DaemonPool:
+    """
+    Minimalna pula wątków-demonów.
+
+    ``ThreadPoolExecutor`` dołącza swoje wątki przy zamykaniu interpretera,
+    więc monitor zawieszony w wywołaniu systemowym (np. na martwym udziale
+    NFS) blokowałby zakończenie programu. Wątki-demony tego nie robią.
+    """
+    def __init__(self, max_workers: int):
+        self._max_workers = max_workers
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._threads: list = []
+        self._idle = 0
+        self._shutdown = False
+
+    def submit(self, func: Callable, *args) -> Future:
+        """Kolejkuje wywołanie i zwraca jego ``Future``."""
+        future: Future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Pula została zamknięta")
+            self._queue.put((future, func, args))
+            if self._idle <= 0 and len(self._threads) < self._max_workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"collector-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+            else:
+                self._idle -= 1
+        return future
+
+    def _worker(self) -> None:
+        """Pętla wątku: wykonuje kolejne zadania z kolejki."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, func, args = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args))
+                except BaseException as exc:
+                    future.set_exception(exc)
+            with self._lock:
+                self._idle += 1
+
+    def shutdown(self) -> None:
+        """Zatrzymuje bezczynne wątki, nie czekając na zawieszone."""
+        with self._lock:
+            self._shutdown = True
+            for _ in self._threads:
+                self._queue.put(None)
+
+
+@dataclass
+class _Running:
+    """Wywołanie monitora, które jeszcze się nie zakończyło."""
+
+    future: Future
+    started: float
+    deadline: float
+    timed_out: bool = False
+
+
+class CollectionExecutor:
+    """
+    Współbieżne wykonywanie monitorów z limitami czasu.
+
+    Każdy monitor działa w puli wątków, więc czas zbierania jednej rundy
+    to czas najwolniejszego monitora, a nie suma wszystkich. Jeśli
+    poprzednie wywołanie monitora wciąż trwa (np. ``disk_usage`` na
+    zawieszonym udziale NFS), kolejne jest pomijane zamiast czekać -
+    pozostałe monitory działają dalej bez opóźnień.
+
+    Używane są wątki, a nie procesy: monitory trzymają stan między
+    wywołaniami (np. poprzednie liczniki sieci lub uchwyty procesów), a psutil
+    zwalnia GIL na czas wywołań systemowych.
+    """
+    def __init__(self, max_workers: int = 16):
+        """
+        Args:
+            max_workers: Maksymalna liczba wątków puli.
+        """
+        self._pool = _DaemonPool(max_workers)
+        self._lock = threading.Lock()
+        self._running: Dict[str, _Running] = {}
+        self.skipped: Dict[str, int] = {}
+        self.timeouts: Dict[str, int] = {}
+
+    def busy(self, name: str) -> bool:
+        """Czy poprzednie wywołanie monitora ``name`` wciąż trwa."""
+        with self._lock:
+            running = self._running.get(name)
+            return running is not None and not running.future.done()
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        callback: Optional[Callable[[Any], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[Future]:
+        """
+        Uruchamia monitor w puli wątków.
+
+        Args:
+            name: Nazwa monitora.
+            func: Funkcja zbierająca.
+            callback: Funkcja wywoływana z wynikiem (w wątku puli), zanim
+                zakończy się zwrócony ``Future``.
+            timeout: Limit czasu w sekundach; po jego przekroczeniu
+                wywołanie jest raportowane jako przeterminowane.
+
+        Returns:
+            ``Future`` wywołania lub ``None``, jeśli poprzednie wywołanie
+            jeszcze trwa i to zostało pominięte.
+        """
+        now = monotonic()
+        with self._lock:
+            running = self._running.get(name)
+            if running is not None and not running.future.done():
+                self.skipped[name] = self.skipped.get(name, 0) + 1
+                if now >= running.deadline and not running.timed_out:
+                    running.timed_out = True
+                    self.timeouts[name] = self.timeouts.get(name, 0) + 1
+                    logging.warning(
+                        "Monitor %s nie odpowiada od %.1f s - pomijam kolejne odczyty",
+                        name, now - running.started,
+                    )
+                return None
+            future = self._pool.submit(self._call, name, func, callback)
+            self._running[name] = _Running(
+                future=future,
+                started=now,
+                deadline=now + timeout if timeout is not None else float("inf"),
+            )
+            return future
+
+    @staticmethod
+    def _call(name: str, func: Callable[[], Any], callback) -> Any:
+        """Wywołuje monitor i przekazuje wynik do ``callback``."""
+        try:
+            value = func()
+        except Exception:
+            logging.exception("Błąd podczas próbkowania %s", name)
+            return None
+        if callback is not None:
+            callback(value)
+        return value
+
+    def collect(
+        self, tasks: Dict[str, Callable[[], Any]], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Uruchamia wszystkie monitory współbieżnie i czeka najwyżej ``timeout``.
+
+        Returns:
+            Wyniki monitorów, które zdążyły się poprawnie zakończyć przed
+            terminem.
+        """
+        futures = {
+            name: future
+            for name, func in tasks.items()
+            if (future := self.submit(name, func, timeout=timeout)) is not None
+        }
+        self.wait(futures.values(), timeout)
+        return {
+            name: future.result()
+            for name, future in futures.items()
+            if future.done() and future.result() is not None
+        }
+
+    @staticmethod
+    def wait(futures: Iterable[Future], timeout: Optional[float] = None) -> None:
+        """Czeka na zakończenie wywołań, najwyżej ``timeout`` sekund."""
+        futures = list(futures)
+        if futures:
+            wait(futures, timeout)
+
+    def shutdown(self) -> None:
+        """Zamyka pulę, nie czekając na zawieszone monitory."""
+        self._pool.shutdown()
@@ -1,23 +1,302 @@
-from dataclasses import dataclass
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .base_monitor import BaseMonitor, BaseUsage
+from .base_monitor import BaseMonitor, BaseUsage, SeriesSchema
+from .topology import TopologyCache
 
-try:
-    import GPUtil
-    GPU_BACKEND = "gputil"
-except ImportError:
-    try:
-        import wmi
-        GPU_BACKEND = "wmi"
-    except ImportError:
-        GPU_BACKEND = None
+# Biblioteki GPU są importowane dopiero przy pierwszym odczycie - sam import
+# GPUtil (distutils, setuptools) trwa dłużej niż start całej aplikacji
+pynvml = None
+GPUtil = None
+wmi = None
+_UNDETECTED = "undetected"
+GPU_BACKEND = _UNDETECTED
+_detect_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class GPUProcessUsage:
+    """Użycie GPU przez pojedynczy proces."""
+
+    pid: int
+    memory_mb: Optional[float] = None
+    sm_percent: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GPUUsage(BaseUsage):
-    """Przechowuje informacje o użyciu GPU."""
+    """
+    Przechowuje informacje o użyciu GPU.
+
+    Pola inne niż ``percent`` są wypełniane, jeśli backend je udostępnia
+    (komplet - tylko NVML); w przeciwnym razie mają wartość ``None``.
+    """
 
     name: str
+    memory_used_mb: Optional[float] = None
+    memory_total_mb: Optional[float] = None
+    temperature_c: Optional[float] = None
+    power_w: Optional[float] = None
+    processes: List[GPUProcessUsage] = field(default_factory=list)
+
+
+class GPUBackend:
+    """
+    Źródło odczytów GPU.
+
+    Backend otwiera połączenie z biblioteką raz, w konstruktorze, a ``read``
+    wykonuje tylko tanie zapytania o bieżące wartości.
+    """
+    name = ""
+
+    def read(self) -> List[GPUUsage]:
+        """Zwraca bieżące odczyty wszystkich GPU."""
+        raise NotImplementedError
+
+    def devices(self) -> List[str]:
+        """Zwraca nazwy wykrytych GPU (wpis ``gpus`` w ``TopologyCache``)."""
+        return [usage.name for usage in self.read()]
+
+    def refresh(self) -> None:
+        """Odświeża listę urządzeń po zmianie topologii."""
+
+    def close(self) -> None:
+        """Zwalnia zasoby biblioteki."""
+
+
+class NVMLBackend(GPUBackend):
+    """
+    Backend NVIDIA Management Library (``pynvml`` z pakietu ``nvidia-ml-py``).
+
+    Uchwyty urządzeń są przechowywane między odczytami; każdy odczyt to kilka
+    wywołań biblioteki NVML w procesie - bez uruchamiania ``nvidia-smi``.
+    Lista urządzeń jest odczytywana ponownie, gdy zmieni się liczba GPU lub
+    zapytanie o urządzenie zakończy się błędem (karta odłączona). Wartości,
+    których karta nie obsługuje (np. pobór mocy), mają wartość ``None``.
+
+    Args:
+        nvml: Moduł zgodny z ``pynvml``; domyślnie zaimportowany ``pynvml``.
+    """
+    name = "nvml"
+
+    def __init__(self, nvml=None):
+        self.nvml = nvml if nvml is not None else pynvml
+        self.nvml.nvmlInit()
+        self._devices: List[Tuple[Any, str]] = []
+        self._count = 0
+        # Znacznik czasu ostatniej próbki użycia procesów (per urządzenie);
+        # NVML zwraca tylko próbki nowsze od podanego
+        self._last_seen: Dict[int, int] = {}
+        self.refresh()
+
+    def devices(self) -> List[str]:
+        # Tylko nazwy - bez zapytań o bieżące wartości
+        nvml = self.nvml
+        names = []
+        for index in range(nvml.nvmlDeviceGetCount()):
+            try:
+                name = nvml.nvmlDeviceGetName(nvml.nvmlDeviceGetHandleByIndex(index))
+            except nvml.NVMLError:
+                continue
+            names.append(name.decode("utf-8", "replace") if isinstance(name, bytes) else name)
+        return names
+
+    def refresh(self) -> None:
+        """
+        Odczytuje listę urządzeń i ich uchwyty od nowa.
+
+        Urządzenia, o które NVML nie potrafi już zapytać (np. odłączone,
+        ale jeszcze liczone przez sterownik), są pomijane.
+        """
+        nvml = self.nvml
+        devices = []
+        self._count = nvml.nvmlDeviceGetCount()
+        for index in range(self._count):
+            try:
+                handle = nvml.nvmlDeviceGetHandleByIndex(index)
+                name = nvml.nvmlDeviceGetName(handle)
+            except nvml.NVMLError as exc:
+                logging.warning("Pominięto GPU %d: %s", index, exc)
+                continue
+            if isinstance(name, bytes):
+                name = name.decode("utf-8", "replace")
+            devices.append((handle, name))
+        if self._devices:
+            logging.info("Lista GPU: %s", [name for _, name in devices])
+        # Indeksy mogły się przesunąć - próbki procesów liczymy od nowa
+        self._devices = devices
+        self._last_seen.clear()
+
+    def _optional(self, call: Callable, *args):
+        """Wywołuje funkcję NVML; ``None``, jeśli karta jej nie obsługuje."""
+        try:
+            return call(*args)
+        except self.nvml.NVMLError:
+            return None
+
+    def read(self) -> List[GPUUsage]:
+        nvml = self.nvml
+        if nvml.nvmlDeviceGetCount() != self._count:
+            self.refresh()
+        usages = []
+        stale = False
+        for index, (handle, name) in enumerate(self._devices):
+            try:
+                util = nvml.nvmlDeviceGetUtilizationRates(handle)
+            except nvml.NVMLError as exc:
+                logging.warning("Brak odczytu GPU %s: %s", name, exc)
+                stale = True
+                continue
+            memory = self._optional(nvml.nvmlDeviceGetMemoryInfo, handle)
+            temperature = self._optional(
+                nvml.nvmlDeviceGetTemperature, handle, nvml.NVML_TEMPERATURE_GPU
+            )
+            power_mw = self._optional(nvml.nvmlDeviceGetPowerUsage, handle)
+            usages.append(GPUUsage(
+                name=name,
+                percent=float(util.gpu),
+                memory_used_mb=memory.used / 2**20 if memory is not None else None,
+                memory_total_mb=memory.total / 2**20 if memory is not None else None,
+                temperature_c=float(temperature) if temperature is not None else None,
+                power_w=power_mw / 1000 if power_mw is not None else None,
+                processes=self._processes(index, handle),
+            ))
+        if stale:
+            self.refresh()
+        return usages
+
+    def _processes(self, index: int, handle) -> List[GPUProcessUsage]:
+        """Zwraca procesy korzystające z GPU z pamięcią i użyciem SM."""
+        nvml = self.nvml
+        found: Dict[int, GPUProcessUsage] = {}
+        for call in (
+            nvml.nvmlDeviceGetComputeRunningProcesses,
+            nvml.nvmlDeviceGetGraphicsRunningProcesses,
+        ):
+            for proc in self._optional(call, handle) or []:
+                used = getattr(proc, "usedGpuMemory", None)
+                usage = found.setdefault(proc.pid, GPUProcessUsage(pid=proc.pid))
+                if used is not None:
+                    usage.memory_mb = (usage.memory_mb or 0.0) + used / 2**20
+        samples = self._optional(
+            nvml.nvmlDeviceGetProcessUtilization, handle, self._last_seen.get(index, 0)
+        )
+        for sample in samples or []:
+            self._last_seen[index] = max(self._last_seen.get(index, 0), sample.timeStamp)
+            usage = found.setdefault(sample.pid, GPUProcessUsage(pid=sample.pid))
+            usage.sm_percent = float(sample.smUtil)
+        return list(found.values())
+
+    def close(self) -> None:
+        self.nvml.nvmlShutdown()
+
+
+class GPUtilBackend(GPUBackend):
+    """
+    Backend GPUtil - zapasowy, gdy NVML jest niedostępny.
+
+    Każdy odczyt uruchamia ``nvidia-smi`` i parsuje jego wynik, więc jest
+    o rzędy wielkości wolniejszy od ``NVMLBackend``.
+
+    Args:
+        module: Moduł zgodny z ``GPUtil``; domyślnie zaimportowany ``GPUtil``.
+    """
+    name = "gputil"
+
+    def __init__(self, module=None):
+        self.module = module if module is not None else GPUtil
+
+    def read(self) -> List[GPUUsage]:
+        return [
+            GPUUsage(
+                name=gpu.name,
+                percent=gpu.load * 100,
+                memory_used_mb=getattr(gpu, "memoryUsed", None),
+                memory_total_mb=getattr(gpu, "memoryTotal", None),
+                temperature_c=getattr(gpu, "temperature", None),
+            )
+            for gpu in self.module.getGPUs()
+        ]
+
+
+class WMIBackend(GPUBackend):
+    """
+    Backend liczników wydajności GPU w Windows (WMI).
+
+    Połączenie WMI jest tworzone raz i używane we wszystkich odczytach.
+    """
+    name = "wmi"
+
+    def __init__(self, module=None):
+        module = module if module is not None else wmi
+        self.connection = module.WMI(namespace="root\\cimv2")
+
+    def read(self) -> List[GPUUsage]:
+        usages = []
+        for gpu in (
+            self.connection.Win32_PerfFormattedData_GPUPerformanceCounters_GPUEngine()
+        ):
+            name = getattr(gpu, "Name", "GPU")
+            try:
+                load = float(getattr(gpu, "UtilizationPercentage", 0.0))
+            except (ValueError, AttributeError):
+                load = 0.0
+            usages.append(GPUUsage(name=name, percent=load))
+        return usages
+
+
+BACKENDS = {
+    NVMLBackend.name: NVMLBackend,
+    GPUtilBackend.name: GPUtilBackend,
+    WMIBackend.name: WMIBackend,
+}
+
+
+def _nvml_available() -> bool:
+    """Importuje ``pynvml`` i sprawdza, czy biblioteka NVML daje się otworzyć."""
+    global pynvml
+    try:
+        import pynvml
+    except ImportError:
+        return False
+    try:
+        pynvml.nvmlInit()
+    except pynvml.NVMLError:
+        # Pakiet jest zainstalowany, ale brak sterownika NVIDIA
+        return False
+    pynvml.nvmlShutdown()
+    return True
+
+
+def detect_backend():
+    """
+    Zwraca nazwę dostępnego backendu GPU, importując go przy pierwszym użyciu.
+
+    Kolejność: NVML, GPUtil, WMI.
+
+    Returns:
+        ``"nvml"``, ``"gputil"``, ``"wmi"`` albo ``None``, gdy żadna
+        biblioteka nie jest dostępna.
+    """
+    global GPU_BACKEND, GPUtil, wmi
+    with _detect_lock:
+        if GPU_BACKEND != _UNDETECTED:
+            return GPU_BACKEND
+        if _nvml_available():
+            GPU_BACKEND = "nvml"
+            return GPU_BACKEND
+        try:
+            import GPUtil
+            GPU_BACKEND = "gputil"
+        except ImportError:
+            try:
+                import wmi
+                GPU_BACKEND = "wmi"
+            except ImportError:
+                GPU_BACKEND = None
+        return GPU_BACKEND
 
 
 class GPUMonitor(BaseMonitor):
@@ -25,40 +304,83 @@ class GPUMonitor(BaseMonitor):
     Monitor GPU.
     Sprawdza dostępność GPU i zwraca informacje o jego użyciu.
     Jeśli nie można znaleźć GPU, zwraca pustą listę.
+
+    Args:
+        backend: Backend odczytów; domyślnie wykrywany przy pierwszym
+            odczycie (``detect_backend``).
+        topology: Wspólna pamięć topologii; po otwarciu backendu monitor
+            rejestruje w niej wpis ``gpus`` (lista GPU odświeżana po upływie
+            TTL), a zmiana listy odświeża urządzenia backendu.
     """
-    def __init__(self):
+    TASK = "gpu"
+    USAGE = GPUUsage
+    SERIES = (
+        SeriesSchema(
+            "GPU_{key}", key="name", color="purple", title="GPU {key}",
+            family="gpu_percent", label="gpu",
+            description="Obciążenie GPU w procentach.",
+        ),
+    )
+
+    def __init__(
+        self,
+        backend: Optional[GPUBackend] = None,
+        topology: Optional[TopologyCache] = None,
+    ):
+        self._backend = backend
+        self._opened = backend is not None
+        self._lock = threading.Lock()
+        self.topology = topology
+        if backend is not None:
+            self._watch(backend)
+
+    def _watch(self, backend: GPUBackend) -> None:
+        """Rejestruje listę GPU backendu jako wpis topologii."""
+        if self.topology is None:
+            return
+        self.topology.register("gpus", backend.devices)
+        self.topology.subscribe("gpus", lambda key, old, new: backend.refresh())
+
+    @property
+    def backend(self) -> Optional[GPUBackend]:
+        """Backend odczytów, otwierany przy pierwszym użyciu."""
+        with self._lock:
+            if not self._opened:
+                self._opened = True
+                name = detect_backend()
+                if name is not None:
+                    try:
+                        self._backend = BACKENDS[name]()
+                    except Exception:
+                        logging.exception("Nie można otworzyć backendu GPU %s", name)
+                    else:
+                        self._watch(self._backend)
+            return self._backend
+
+    @property
+    def available(self) -> bool:
         """
-        Inicjalizuje monitor GPU.
-        Sprawdza, czy dostępne są biblioteki do monitorowania GPU.
+        Czy dostępna jest biblioteka do monitorowania GPU.
+        Pierwsze sprawdzenie importuje bibliotekę (``detect_backend``).
         """
-        self.available = GPU_BACKEND is not None
+        return self.backend is not None
 
     def get_usage(self) -> list[GPUUsage]:
         """
         Zwraca listę obiektów GPUUsage dla wszystkich dostępnych GPU.
         Jeśli GPU nie jest dostępne, zwraca pustą listę.
         """
-        if not self.available:
+        backend = self.backend
+        if backend is None:
             return []
+        if self.topology is not None:
+            # Po upływie TTL odczyt listy GPU; zmiana odświeża backend
+            self.topology.gpus()
+        return backend.read()
 
-        if GPU_BACKEND == "gputil":
-            usages = []
-            for gpu in GPUtil.getGPUs():
-                usages.append(GPUUsage(name=gpu.name, percent=gpu.load * 100))
-            return usages
-
-        elif GPU_BACKEND == "wmi":
-            w = wmi.WMI(namespace="root\\cimv2")
-            usages = []
-            for gpu in (
-                w.Win32_PerfFormattedData_GPUPerformanceCounters_GPUEngine()
-            ):
-                name = getattr(gpu, "Name", "GPU")
-                try:
-                    load = float(getattr(gpu, "UtilizationPercentage", 0.0))
-                except (ValueError, AttributeError):
-                    load = 0.0
-                usages.append(GPUUsage(name=name, percent=load))
-            return usages
-
-        return []
+    def close(self) -> None:
+        """Zamyka backend (np. kończy sesję NVML)."""
+        with self._lock:
+            if self._backend is not None:
+                self._backend.close()
+                self._backend = None
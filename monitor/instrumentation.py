@@ -0,0 +1,182 @@
+import functools
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# Górne granice przedziałów histogramu opóźnień w milisekundach
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000,
+)
+
+
+@dataclass
+class LatencyStats:
+    """Histogram opóźnień oraz liczniki wywołań i błędów jednej operacji."""
+
+    name: str
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    buckets: List[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+
+    @property
+    def mean_ms(self) -> float:
+        """Średni czas wywołania w milisekundach."""
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def observe(self, elapsed_ms: float, error: bool = False) -> None:
+        """Zapisuje czas jednego wywołania."""
+        self.calls += 1
+        self.errors += int(error)
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Szacuje kwantyl opóźnienia na podstawie histogramu.
+
+        Args:
+            q: Kwantyl z przedziału ``[0, 1]``, np. ``0.95``.
+
+        Returns:
+            Górna granica przedziału zawierającego kwantyl (dla ostatniego,
+            otwartego przedziału - największy zmierzony czas).
+        """
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def copy(self) -> "LatencyStats":
+        """Zwraca niezależną kopię statystyk."""
+        return LatencyStats(
+            name=self.name,
+            calls=self.calls,
+            errors=self.errors,
+            total_ms=self.total_ms,
+            max_ms=self.max_ms,
+            last_ms=self.last_ms,
+            buckets=list(self.buckets),
+        )
+
+
+class Instrumentation:
+    """
+    Bezpieczny wątkowo rejestr czasów wykonania monitorów, rysowania
+    i eksportu.
+
+    Nazwy operacji mają postać ``<rodzaj>.<nazwa>``, np. ``collect.cpu``,
+    ``render.blit`` lub ``export.CPUExporter``. Statystyki można odczytać w trakcie
+    działania (``snapshot``) albo spłaszczyć do metryk (``metrics``)
+    i publikować jak wyniki zwykłego monitora.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, LatencyStats] = {}
+
+    def record(self, name: str, elapsed_ms: float, error: bool = False) -> None:
+        """
+        Zapisuje czas jednego wywołania operacji.
+
+        Args:
+            name: Nazwa operacji.
+            elapsed_ms: Czas wykonania w milisekundach.
+            error: Czy wywołanie zakończyło się wyjątkiem.
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = LatencyStats(name)
+            stats.observe(elapsed_ms, error)
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Mierzy czas bloku ``with``; wyjątek jest liczony jako błąd."""
+        start = perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(name, (perf_counter() - start) * 1000, error)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Zwraca funkcję ``func``, której każde wywołanie jest mierzone."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.timed(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def get(self, name: str) -> LatencyStats:
+        """Zwraca kopię statystyk operacji (puste, jeśli jej nie mierzono)."""
+        with self._lock:
+            stats = self._stats.get(name)
+            return stats.copy() if stats is not None else LatencyStats(name)
+
+    def snapshot(self) -> Dict[str, LatencyStats]:
+        """Zwraca kopie statystyk wszystkich operacji."""
+        with self._lock:
+            return {name: stats.copy() for name, stats in self._stats.items()}
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Spłaszcza statystyki do metryk ``SELF_<operacja>_<statystyka>``.
+
+        Returns:
+            Słownik z kluczami ``..._calls``, ``..._errors``, ``..._mean_ms``,
+            ``..._p95_ms`` i ``..._max_ms`` dla każdej operacji.
+        """
+        values: Dict[str, float] = {}
+        for name, stats in sorted(self.snapshot().items()):
+            prefix = f"SELF_{name}"
+            values[f"{prefix}_calls"] = stats.calls
+            values[f"{prefix}_errors"] = stats.errors
+            values[f"{prefix}_mean_ms"] = stats.mean_ms
+            values[f"{prefix}_p95_ms"] = stats.quantile(0.95)
+            values[f"{prefix}_max_ms"] = stats.max_ms
+        return values
+
+    def reset(self) -> None:
+        """Usuwa wszystkie zebrane statystyki."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Wspólny rejestr używany przez wątek próbkujący, GUI i eksport
+INSTRUMENTATION = Instrumentation()
+
+
+def timed(name: str):
+    """Skrót do ``INSTRUMENTATION.timed(name)``."""
+    return INSTRUMENTATION.timed(name)
+
+
+def instrumented(name: str) -> Callable:
+    """
+    Dekorator mierzący czas każdego wywołania funkcji we wspólnym rejestrze.
+
+    Args:
+        name: Nazwa operacji, np. ``render.tick``.
+    """
+    def decorator(func: Callable) -> Callable:
+        return INSTRUMENTATION.wrap(name, func)
+
+    return decorator
@@ -2,10 +2,10 @@ from dataclasses import dataclass
 
 import psutil
 
-from .base_monitor import BaseMonitor, BaseUsage
+from .base_monitor import BaseMonitor, BaseUsage, SeriesSchema
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryUsage(BaseUsage):
     """Przechowuje informacje o aktualnym wykorzystaniu pamięci RAM."""
 
@@ -17,6 +17,15 @@ class MemoryMonitor(BaseMonitor):
     """
     Monitor pamięci RAM.
     """
+    TASK = "ram"
+    USAGE = MemoryUsage
+    SERIES = (
+        SeriesSchema(
+            "RAM", color="green", family="ram_percent",
+            description="Użycie pamięci RAM w procentach.",
+        ),
+    )
+
     def get_usage(self) -> MemoryUsage:
         """
         Zwraca dane o użyciu pamięci RAM.
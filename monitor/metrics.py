@@ -0,0 +1,43 @@
+from typing import Any, Dict
+
+from .registry import REGISTRY
+
+__all__ = ["flatten", "unflatten"]
+
+
+def flatten(name: str, value: Any) -> Dict[str, float]:
+    """
+    Zamienia wynik monitora na słownik ``nazwa metryki: wartość``.
+
+    Nazwy metryk wynikają ze schematów serii monitorów (``SERIES``) w
+    ``monitor.registry.REGISTRY``: ``CPU``, ``RAM``, ``DISK_<mount>``,
+    ``GPU_<nazwa>``, ``NET_UP``/``NET_DOWN``, ``NIC_<interfejs>_<przyrostek>``,
+    ``IO_<dysk>_<przyrostek>``; zadanie ``self`` publikuje gotowe metryki
+    ``SELF_...``.
+
+    Args:
+        name: Nazwa zadania próbkowania (``cpu``, ``ram``, ``disk``...).
+        value: Wynik ``get_usage`` danego monitora.
+
+    Returns:
+        Słownik metryk; pusty dla nieznanych zadań.
+    """
+    return REGISTRY.flatten(name, value)
+
+
+def unflatten(values: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Odtwarza wyniki monitorów ze spłaszczonych metryk (odwrotność ``flatten``).
+
+    Służy do publikowania w ``SnapshotStore`` danych odebranych z innego
+    hosta, aby GUI mogło je czytać tak samo jak odczyty lokalne. Pola,
+    których nie da się odtworzyć (np. ``used``/``total``), mają wartość NaN.
+
+    Args:
+        values: Słownik ``metryka: wartość``.
+
+    Returns:
+        Słownik ``zadanie: wynik`` dla zarejestrowanych zadań (tylko tych,
+        dla których są dane).
+    """
+    return REGISTRY.unflatten(values)
@@ -1,12 +1,14 @@
 from dataclasses import dataclass
-from time import time
+from time import monotonic_ns
+from typing import Optional
 
 import psutil
 
-from .base_monitor import BaseMonitor, BaseUsage
+from .base_monitor import BaseMonitor, BaseUsage, SeriesSchema
+from .topology import TopologyCache
 
 
-@dataclass
+@dataclass(slots=True)
 class NetworkUsage(BaseUsage):
     """Przechowuje informacje o aktualnym użyciu sieci."""
 
@@ -18,24 +20,48 @@ class NetworkMonitor(BaseMonitor):
     """
     Monitor sieci.
     """
-    def __init__(self):
+    TASK = "network"
+    USAGE = NetworkUsage
+    SERIES = (
+        SeriesSchema(
+            "NET_UP", field="upload_kbps", unit="KB/s", range=(0.0, None),
+            color="brown", family="network_kbps", labels={"direction": "up"},
+            description="Przepływność sieci w KB/s.",
+        ),
+        SeriesSchema(
+            "NET_DOWN", field="download_kbps", unit="KB/s", range=(0.0, None),
+            color="brown", family="network_kbps", labels={"direction": "down"},
+            description="Przepływność sieci w KB/s.",
+        ),
+    )
+
+    def __init__(self, topology: Optional[TopologyCache] = None):
         """
         Inicjalizuje monitor sieci, ustawiając początkowe wartości.
+
+        Args:
+            topology: Wspólna pamięć topologii (prędkości interfejsów);
+                domyślnie własna instancja.
         """
-        self.last_bytes_sent = psutil.net_io_counters().bytes_sent
-        self.last_bytes_recv = psutil.net_io_counters().bytes_recv
-        self.last_time = time()
+        self.topology = topology if topology is not None else TopologyCache()
+        counters = psutil.net_io_counters()
+        self.last_bytes_sent = counters.bytes_sent
+        self.last_bytes_recv = counters.bytes_recv
+        self.last_ns = monotonic_ns()
 
     def get_usage(self) -> NetworkUsage:
         """
         Zwraca dane o aktualnym użyciu sieci jako obiekt NetworkUsage.
         """
-        current_time = time()
-        current_sent = psutil.net_io_counters().bytes_sent
-        current_recv = psutil.net_io_counters().bytes_recv
+        # Jeden odczyt liczników - oba pola pochodzą z tej samej chwili; czas
+        # z zegara monotonicznego, odporny na korekty zegara systemowego
+        counters = psutil.net_io_counters()
+        current_ns = monotonic_ns()
+        current_sent = counters.bytes_sent
+        current_recv = counters.bytes_recv
 
-        elapsed = current_time - self.last_time
-        if elapsed == 0:
+        elapsed = (current_ns - self.last_ns) / 1e9
+        if elapsed <= 0:
             return NetworkUsage(percent=0.0, upload_kbps=0.0, download_kbps=0.0)
 
         upload_speed = (
@@ -47,9 +73,9 @@ class NetworkMonitor(BaseMonitor):
 
         self.last_bytes_sent = current_sent
         self.last_bytes_recv = current_recv
-        self.last_time = current_time
+        self.last_ns = current_ns
 
-        stats = psutil.net_if_stats()
+        stats = self.topology.nic_stats()
         total_speed_mbps = sum(s.speed for s in stats.values() if s.speed > 0)
         if total_speed_mbps <= 0:
             percent = 0.0
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from time import monotonic_ns
+from typing import List, Optional
+
+import numpy as np
+import psutil
+
+from .base_monitor import BaseMonitor, BaseUsage, SeriesSchema
+from .counters import CounterDeltas
+from .topology import TopologyCache
+
+NIC_FIELDS = (
+    "bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+    "errin", "errout", "dropin", "dropout",
+)
+# Przyrostek nazwy metryki -> pole wyniku monitora
+NIC_SERIES = {
+    "UP": "upload_kbps",
+    "DOWN": "download_kbps",
+    "PKT_SENT": "packets_sent",
+    "PKT_RECV": "packets_recv",
+    "ERR_IN": "errin",
+    "ERR_OUT": "errout",
+    "DROP_IN": "dropin",
+    "DROP_OUT": "dropout",
+}
+_NIC_HELP = {
+    "UP": "Wysyłanie przez interfejs w KB/s.",
+    "DOWN": "Odbiór przez interfejs w KB/s.",
+}
+
+
+@dataclass(slots=True)
+class NICUsage(BaseUsage):
+    """Przepływność i błędy jednego interfejsu sieciowego (na sekundę)."""
+
+    name: str
+    upload_kbps: float
+    download_kbps: float
+    packets_sent: float
+    packets_recv: float
+    errin: float
+    errout: float
+    dropin: float
+    dropout: float
+
+
+class NICMonitor(BaseMonitor):
+    """
+    Monitor interfejsów sieciowych.
+
+    W każdym takcie wykonuje jeden odczyt ``psutil.net_io_counters(pernic=True)``
+    i wylicza przyrosty wszystkich interfejsów naraz (``CounterDeltas``).
+    ``percent`` to wykorzystanie łącza względem prędkości interfejsu
+    (0, gdy prędkość jest nieznana).
+    """
+    TASK = "nic"
+    USAGE = NICUsage
+    SERIES = tuple(
+        SeriesSchema(
+            f"NIC_{{key}}_{suffix}", field=field, key="name", label="nic",
+            unit="KB/s" if field.endswith("_kbps") else "1/s", range=(0.0, None),
+            plot=False, family=f"nic_{suffix.lower()}",
+            description=_NIC_HELP.get(suffix, ""),
+        )
+        for suffix, field in NIC_SERIES.items()
+    )
+
+    def __init__(self, topology: Optional[TopologyCache] = None):
+        """
+        Args:
+            topology: Wspólna pamięć topologii (prędkości interfejsów);
+                domyślnie własna instancja.
+        """
+        self.topology = topology if topology is not None else TopologyCache()
+        self.deltas = CounterDeltas(NIC_FIELDS)
+        self.deltas.update(psutil.net_io_counters(pernic=True), monotonic_ns())
+
+    def get_usage(self) -> List[NICUsage]:
+        """
+        Zwraca listę obiektów NICUsage dla wszystkich interfejsów.
+        """
+        names, deltas, elapsed = self.deltas.update(
+            psutil.net_io_counters(pernic=True), monotonic_ns()
+        )
+        if elapsed <= 0:
+            return []
+        rates = deltas / elapsed
+        rates[:, :2] /= 1024  # B/s -> KB/s
+
+        stats = self.topology.nic_stats()
+        speeds = np.array([
+            getattr(stats.get(name), "speed", 0) or 0 for name in names
+        ], dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percent = np.where(
+                speeds > 0,
+                (rates[:, 0] + rates[:, 1]) / (speeds * 128) * 100,  # Mbps -> KB/s
+                0.0,
+            )
+
+        return [
+            NICUsage(
+                percent=float(percent[i]),
+                name=name,
+                upload_kbps=float(row[0]),
+                download_kbps=float(row[1]),
+                packets_sent=float(row[2]),
+                packets_recv=float(row[3]),
+                errin=float(row[4]),
+                errout=float(row[5]),
+                dropin=float(row[6]),
+                dropout=float(row[7]),
+            )
+            for i, (name, row) in enumerate(zip(names, rates))
+        ]
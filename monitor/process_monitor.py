@@ -1,10 +1,11 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Sequence
 
+import numpy as np
 import psutil
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessUsage:
     """Informacje o pojedynczym procesie."""
 
@@ -14,8 +15,118 @@ class ProcessUsage:
     memory_percent: float
 
 
+@dataclass(slots=True)
+class ProcessBatch:
+    """
+    Odczyt wszystkich procesów w kolumnach (tablice zamiast obiektu na
+    proces).
+
+    ``ProcessUsage`` powstaje tylko dla procesów faktycznie zwracanych
+    (``top``), więc tysiące procesów w takcie to kilka tablic, nie tysiące
+    obiektów.
+    """
+
+    pids: np.ndarray
+    names: List[str]
+    cpu_percent: np.ndarray
+    memory_percent: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self, indices: Sequence[int]) -> List[ProcessUsage]:
+        """Zwraca procesy o podanych pozycjach jako ``ProcessUsage``."""
+        return [
+            ProcessUsage(
+                pid=int(self.pids[i]),
+                name=self.names[i],
+                cpu_percent=float(self.cpu_percent[i]),
+                memory_percent=float(self.memory_percent[i]),
+            )
+            for i in indices
+        ]
+
+    def top(self, n: int, sort_by: str = "cpu") -> List[ProcessUsage]:
+        """
+        Zwraca ``n`` procesów o największym użyciu CPU lub pamięci.
+
+        Args:
+            n: Maksymalna liczba procesów.
+            sort_by: Kryterium sortowania (``"cpu"`` lub ``"memory"``).
+        """
+        key = self.memory_percent if sort_by == "memory" else self.cpu_percent
+        n = min(n, len(key))
+        if n <= 0:
+            return []
+        candidates = np.arange(len(key))
+        if n < len(key):
+            # Wybór kandydatów w O(N), sortowanie tylko ``n`` pozycji
+            candidates = np.argpartition(-key, n - 1)[:n]
+        # Równe wartości w kolejności odczytu (jak ``heapq.nlargest``)
+        order = candidates[np.lexsort((candidates, -key[candidates]))]
+        return self.rows(order)
+
+
 class ProcessMonitor:
-    """Monitor zwracający listę procesów o najwyższym użyciu zasobów."""
+    """
+    Monitor zwracający listę procesów o najwyższym użyciu zasobów.
+
+    Monitor jest stanowy: obiekty ``psutil.Process`` są przechowywane między
+    wywołaniami, więc ``cpu_percent`` liczony jest względem poprzedniego
+    odczytu (nowy obiekt zawsze zwracałby 0.0). Procesy, które zakończyły
+    działanie, są usuwane z pamięci podręcznej.
+    """
+
+    def __init__(self):
+        self._procs: Dict[int, psutil.Process] = {}
+        self.last_samples = ProcessBatch(
+            np.zeros(0, dtype=np.int64), [], np.zeros(0), np.zeros(0)
+        )
+
+    def refresh(self) -> ProcessBatch:
+        """
+        Odczytuje dane wszystkich procesów w jednym przebiegu.
+
+        Dane każdego procesu są pobierane wewnątrz ``Process.oneshot()``,
+        dzięki czemu psutil czyta pliki procesu tylko raz.
+
+        Returns:
+            Kolumny danych wszystkich dostępnych procesów.
+        """
+        pids = set(psutil.pids())
+        for pid in self._procs.keys() - pids:
+            del self._procs[pid]
+
+        found: List[int] = []
+        names: List[str] = []
+        cpu: List[float] = []
+        memory: List[float] = []
+        for pid in pids:
+            proc = self._procs.get(pid)
+            try:
+                if proc is None:
+                    proc = self._procs[pid] = psutil.Process(pid)
+                with proc.oneshot():
+                    name = proc.name()
+                    cpu_percent = proc.cpu_percent(interval=None)
+                    memory_percent = proc.memory_percent()
+            except psutil.NoSuchProcess:
+                self._procs.pop(pid, None)
+                continue
+            except psutil.AccessDenied:
+                continue
+            found.append(pid)
+            names.append(name)
+            cpu.append(cpu_percent)
+            memory.append(memory_percent)
+
+        self.last_samples = ProcessBatch(
+            pids=np.array(found, dtype=np.int64),
+            names=names,
+            cpu_percent=np.array(cpu, dtype=np.float64),
+            memory_percent=np.array(memory, dtype=np.float64),
+        )
+        return self.last_samples
 
     def get_top_processes(
         self, top_n: int = 5, sort_by: str = "cpu"
@@ -26,27 +137,4 @@ class ProcessMonitor:
             top_n: maksymalna liczba procesów do zwrócenia.
             sort_by: kryterium sortowania ("cpu" lub "memory").
         """
-        processes: List[ProcessUsage] = []
-        for proc in psutil.process_iter(
-            ["pid", "name", "cpu_percent", "memory_percent"]
-        ):
-            try:
-                info = proc.info
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-            processes.append(
-                ProcessUsage(
-                    pid=info.get("pid", 0),
-                    name=info.get("name", ""),
-                    cpu_percent=info.get("cpu_percent", 0.0),
-                    memory_percent=info.get("memory_percent", 0.0),
-                )
-            )
-
-        key = (
-            (lambda p: p.memory_percent)
-            if sort_by == "memory"
-            else (lambda p: p.cpu_percent)
-        )
-        processes.sort(key=key, reverse=True)
-        return processes[:top_n]
+        return self.refresh().top(top_n, sort_by)
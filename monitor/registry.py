@@ -0,0 +1,348 @@
+"""Rejestr monitorów i deklaratywnych schematów ich metryk.
+
+Każdy monitor deklaruje zadanie próbkowania (``TASK``), klasę wyniku
+(``USAGE``) i publikowane serie (``SERIES``, zob. ``SeriesSchema``). Na tej
+podstawie rejestr tworzy monitory dla wątku próbkującego, spłaszcza ich
+wyniki do metryk (``flatten``) i odtwarza je z metryk (``unflatten``),
+a GUI, eksportery i serwer Prometheus odczytują z niego jednostki, zakresy
+i nazwy serii. Dodanie metryki nie wymaga więc zmian w aplikacji.
+
+Monitory spoza pakietu są wykrywane przez punkty wejścia grupy
+``resource_monitor.monitors`` (``load_entry_points``); punkt wejścia
+wskazuje klasę ``BaseMonitor`` albo gotowy ``MonitorSpec``::
+
+    [project.entry-points."resource_monitor.monitors"]
+    ups = "ups_monitor:UPSMonitor"
+"""
+
+import dataclasses
+import inspect
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .base_monitor import KEY, BaseMonitor, SeriesSchema
+from .cpu_monitor import CPUMonitor
+from .disk_io_monitor import DiskIOMonitor
+from .disk_monitor import DiskMonitor
+from .gpu_monitor import GPUMonitor
+from .instrumentation import INSTRUMENTATION
+from .memory_monitor import MemoryMonitor
+from .network_monitor import NetworkMonitor
+from .nic_monitor import NICMonitor
+from .topology import TopologyCache
+
+ENTRY_POINT_GROUP = "resource_monitor.monitors"
+
+
+@dataclass
+class MonitorSpec:
+    """
+    Opis monitora w rejestrze.
+
+    Args:
+        task: Nazwa zadania próbkowania (klucz w ``SnapshotStore``).
+        factory: Wywołanie tworzące monitor (obiekt z ``get_usage``).
+        series: Schematy publikowanych serii.
+        usage: Klasa wyniku monitora; ``None`` - wynik odtwarzany jako
+            ``SimpleNamespace``.
+        option: Nazwa opcji konfiguracji włączającej monitor (np.
+            ``io_metrics``); ``None`` - monitor zawsze włączony.
+        topology: Czy ``factory`` przyjmuje wspólny ``TopologyCache``.
+        preload: Czy odczytać monitor przy starcie GUI, aby od razu utworzyć
+            wykresy jego serii (tylko dla tanich odczytów).
+        flat_prefix: Wynik jest już słownikiem ``metryka: wartość`` o nazwach
+            z tym przedrostkiem (bez schematów serii).
+    """
+
+    task: str
+    factory: Callable[..., Any]
+    series: Tuple[SeriesSchema, ...] = ()
+    usage: Optional[type] = None
+    option: Optional[str] = None
+    topology: bool = False
+    preload: bool = False
+    flat_prefix: Optional[str] = None
+
+    @classmethod
+    def from_class(cls, monitor: type, **kwargs) -> "MonitorSpec":
+        """
+        Tworzy opis z deklaracji klasy monitora (``TASK``, ``USAGE``,
+        ``SERIES``).
+
+        Args:
+            monitor: Klasa pochodna ``BaseMonitor``.
+            **kwargs: Pozostałe pola ``MonitorSpec``.
+
+        Raises:
+            ValueError: Gdy klasa nie deklaruje ``TASK``.
+        """
+        if not monitor.TASK:
+            raise ValueError(f"Monitor {monitor.__name__} nie deklaruje TASK")
+        kwargs.setdefault(
+            "topology", "topology" in inspect.signature(monitor).parameters
+        )
+        return cls(
+            task=monitor.TASK,
+            factory=monitor,
+            series=tuple(monitor.SERIES),
+            usage=monitor.USAGE,
+            **kwargs,
+        )
+
+    def items(self, value: Any) -> Sequence[Any]:
+        """Zwraca wyniki urządzeń (wynik pojedynczy jako jednoelementową listę)."""
+        if value is None:
+            return ()
+        return value if isinstance(value, (list, tuple)) else (value,)
+
+
+@dataclass(frozen=True)
+class SeriesMatch:
+    """Seria rozpoznana po nazwie metryki (``MonitorRegistry.describe``)."""
+
+    spec: MonitorSpec
+    schema: SeriesSchema
+    key: str
+
+    @property
+    def title(self) -> str:
+        """Opis serii w eksporcie, np. ``Dysk /``."""
+        title = self.schema.title or self.schema.name
+        return title.replace(KEY, self.key)
+
+
+class SelfMonitor(BaseMonitor):
+    """Czasy działania samej aplikacji (``Instrumentation.metrics``)."""
+
+    TASK = "self"
+
+    def get_usage(self) -> Dict[str, float]:
+        """Zwraca metryki ``SELF_...`` z globalnego ``INSTRUMENTATION``."""
+        return INSTRUMENTATION.metrics()
+
+
+class MonitorRegistry:
+    """
+    Uporządkowany rejestr monitorów.
+
+    Kolejność rejestracji wyznacza kolejność zadań próbkowania, wykresów
+    i kolumn eksportu.
+    """
+    def __init__(self):
+        self._specs: Dict[str, MonitorSpec] = {}
+        self._lock = threading.Lock()
+        # Nazwa metryki -> rozpoznana seria (lub None); czyszczone przy
+        # każdej zmianie rejestru
+        self._described: Dict[str, Optional[SeriesMatch]] = {}
+        self._loaded_groups: set = set()
+
+    def register(self, spec: Any, replace: bool = False) -> MonitorSpec:
+        """
+        Dodaje monitor do rejestru.
+
+        Args:
+            spec: ``MonitorSpec`` lub klasa pochodna ``BaseMonitor``.
+            replace: Czy zastąpić monitor o tej samej nazwie zadania.
+
+        Returns:
+            Zarejestrowany opis.
+
+        Raises:
+            ValueError: Gdy zadanie jest już zarejestrowane (i nie podano
+                ``replace``).
+            TypeError: Gdy ``spec`` nie jest opisem ani klasą monitora.
+        """
+        if inspect.isclass(spec) and issubclass(spec, BaseMonitor):
+            spec = MonitorSpec.from_class(spec)
+        if not isinstance(spec, MonitorSpec):
+            raise TypeError(f"Nieobsługiwany wpis rejestru monitorów: {spec!r}")
+        with self._lock:
+            if spec.task in self._specs and not replace:
+                raise ValueError(f"Monitor {spec.task!r} jest już zarejestrowany")
+            self._specs[spec.task] = spec
+            self._described = {}
+        return spec
+
+    def unregister(self, task: str) -> None:
+        """Usuwa monitor z rejestru (brak wpisu jest ignorowany)."""
+        with self._lock:
+            self._specs.pop(task, None)
+            self._described = {}
+
+    def get(self, task: str) -> Optional[MonitorSpec]:
+        """Zwraca opis monitora zadania ``task``."""
+        return self._specs.get(task)
+
+    def specs(self, options: Optional[Dict[str, bool]] = None) -> List[MonitorSpec]:
+        """
+        Zwraca opisy monitorów w kolejności rejestracji.
+
+        Args:
+            options: Wartości opcji konfiguracji; monitory, których opcja
+                jest wyłączona (lub jej brak), są pomijane. ``None`` - wszystkie.
+        """
+        specs = list(self._specs.values())
+        if options is None:
+            return specs
+        return [s for s in specs if s.option is None or options.get(s.option)]
+
+    def create(self, task: str, topology: Optional[TopologyCache] = None) -> Any:
+        """
+        Tworzy monitor zadania ``task``.
+
+        Args:
+            task: Nazwa zadania.
+            topology: Wspólna topologia dla monitorów, które z niej korzystają.
+        """
+        spec = self._specs[task]
+        if spec.topology:
+            return spec.factory(topology=topology)
+        return spec.factory()
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> List[MonitorSpec]:
+        """
+        Rejestruje monitory zewnętrznych pakietów (punkty wejścia ``group``).
+
+        Wpis, którego nie da się załadować, jest pomijany z ostrzeżeniem
+        w logu; ponowne wywołanie dla tej samej grupy nic nie robi.
+
+        Returns:
+            Nowo zarejestrowane opisy.
+        """
+        if group in self._loaded_groups:
+            return []
+        self._loaded_groups.add(group)
+        from importlib import metadata
+
+        found = metadata.entry_points()
+        if hasattr(found, "select"):
+            entries = found.select(group=group)
+        else:
+            entries = found.get(group, [])
+        loaded = []
+        for entry in entries:
+            try:
+                loaded.append(self.register(entry.load()))
+            except Exception:
+                logging.exception("Nie można załadować monitora %s", entry.name)
+        return loaded
+
+    def describe(self, name: str) -> Optional[SeriesMatch]:
+        """
+        Rozpoznaje serię po nazwie metryki.
+
+        Przy kilku pasujących schematach wygrywa najbardziej szczegółowy
+        (np. ``IO_{key}_READ_IOPS`` przed ``IO_{key}_IOPS``).
+
+        Returns:
+            Dopasowanie lub ``None`` dla nieznanych metryk.
+        """
+        described = self._described
+        if name in described:
+            return described[name]
+        best = None
+        best_len = -1
+        for spec in self._specs.values():
+            for schema in spec.series:
+                key = schema.match(name)
+                if key is None:
+                    continue
+                literal = len(schema.name) - (len(KEY) if schema.key else 0)
+                if schema.key is None:
+                    literal = math.inf
+                if literal > best_len:
+                    best, best_len = SeriesMatch(spec, schema, key), literal
+        described[name] = best
+        return best
+
+    def flatten(self, task: str, value: Any) -> Dict[str, float]:
+        """
+        Zamienia wynik monitora na słownik ``nazwa metryki: wartość``.
+
+        Args:
+            task: Nazwa zadania próbkowania.
+            value: Wynik ``get_usage`` monitora.
+
+        Returns:
+            Słownik metryk; pusty dla nieznanych zadań.
+        """
+        spec = self._specs.get(task)
+        if spec is None or value is None:
+            return {}
+        if spec.flat_prefix is not None:
+            return dict(value)
+        values: Dict[str, float] = {}
+        for item in spec.items(value):
+            for schema in spec.series:
+                key = getattr(item, schema.key) if schema.key else None
+                values[schema.series_name(key)] = getattr(item, schema.field)
+        return values
+
+    def unflatten(self, values: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Odtwarza wyniki monitorów ze spłaszczonych metryk (odwrotność
+        ``flatten``).
+
+        Pola wyniku, których nie da się odtworzyć (np. ``used``/``total``
+        pamięci), mają wartość NaN; pola z wartością domyślną - tę wartość.
+
+        Returns:
+            Słownik ``zadanie: wynik`` tylko dla zadań, dla których są dane.
+        """
+        # zadanie -> urządzenie -> pole -> wartość
+        found: Dict[str, Dict[str, Dict[str, float]]] = {}
+        flat: Dict[str, Dict[str, float]] = {}
+        for name, value in values.items():
+            match = self.describe(name)
+            if match is not None:
+                fields = found.setdefault(match.spec.task, {}).setdefault(match.key, {})
+                fields[match.schema.field] = value
+                if match.schema.key:
+                    fields[match.schema.key] = match.key
+                continue
+            for spec in self._specs.values():
+                if spec.flat_prefix and name.startswith(spec.flat_prefix):
+                    flat.setdefault(spec.task, {})[name] = value
+                    break
+
+        result: Dict[str, Any] = {}
+        for task, devices in found.items():
+            spec = self._specs[task]
+            items = [_make_usage(spec.usage, fields) for fields in devices.values()]
+            keyed = any(schema.key for schema in spec.series)
+            result[task] = items if keyed else items[0]
+        result.update(flat)
+        return result
+
+
+def _make_usage(usage: Optional[type], fields: Dict[str, Any]) -> Any:
+    """Tworzy wynik monitora; brakujące pola wymagane otrzymują NaN."""
+    if usage is None or not dataclasses.is_dataclass(usage):
+        return SimpleNamespace(**fields)
+    for f in dataclasses.fields(usage):
+        required = (
+            f.default is dataclasses.MISSING
+            and f.default_factory is dataclasses.MISSING
+        )
+        if required and f.name not in fields:
+            fields[f.name] = math.nan
+    return usage(**fields)
+
+
+REGISTRY = MonitorRegistry()
+REGISTRY.register(MonitorSpec.from_class(CPUMonitor))
+REGISTRY.register(MonitorSpec.from_class(MemoryMonitor))
+REGISTRY.register(MonitorSpec.from_class(DiskMonitor, preload=True))
+REGISTRY.register(MonitorSpec.from_class(GPUMonitor))
+REGISTRY.register(MonitorSpec.from_class(NetworkMonitor))
+# Metryki urządzeń nie mają wykresów - trafiają do alertów i zapisu
+REGISTRY.register(MonitorSpec.from_class(NICMonitor, option="io_metrics"))
+REGISTRY.register(MonitorSpec.from_class(DiskIOMonitor, option="io_metrics"))
+# Czasy działania samej aplikacji jako zwykłe metryki
+REGISTRY.register(
+    MonitorSpec.from_class(SelfMonitor, option="self_metrics", flat_prefix="SELF_")
+)
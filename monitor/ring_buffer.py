@@ -0,0 +1,172 @@
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Bufor cykliczny o stałej pojemności na historię jednej metryki.
+
+    Dane są przechowywane w ciągłej tablicy NumPy (domyślnie ``float64``).
+    Każda wartość jest zapisywana dwukrotnie - w pozycji ``i`` oraz
+    ``i + capacity`` - dzięki czemu ostatnie ``n`` próbek zawsze tworzy
+    ciągły wycinek tablicy. Dodanie próbki kosztuje O(1), a ``view()``
+    zwraca widok bez kopiowania, gotowy do rysowania lub eksportu.
+
+    Z parametrem ``width`` próbką jest wiersz ``width`` wartości (np. jeden
+    takt wszystkich serii): cały takt zapisuje jedno ``append``, a historię
+    pojedynczej serii udostępnia ``column``.
+    """
+    def __init__(self, capacity: int, dtype=np.float64, width: Optional[int] = None):
+        """
+        Args:
+            capacity: Maksymalna liczba przechowywanych próbek.
+            dtype: Typ elementów tablicy.
+            width: Liczba wartości w próbce; ``None`` - próbki skalarne.
+        """
+        if capacity <= 0:
+            raise ValueError("Pojemność bufora musi być dodatnia")
+        self._capacity = int(capacity)
+        self._row_shape = () if width is None else (int(width),)
+        self._data = np.zeros((2 * self._capacity, *self._row_shape), dtype=dtype)
+        self._head = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maksymalna liczba próbek w buforze."""
+        return self._capacity
+
+    @property
+    def dtype(self):
+        """Typ elementów bufora."""
+        return self._data.dtype
+
+    @property
+    def width(self) -> Optional[int]:
+        """Liczba wartości w próbce (``None`` dla próbek skalarnych)."""
+        return self._row_shape[0] if self._row_shape else None
+
+    def append(self, value) -> None:
+        """Dodaje próbkę, nadpisując najstarszą po zapełnieniu bufora."""
+        head = self._head
+        self._data[head] = value
+        self._data[head + self._capacity] = value
+        self._head = (head + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def extend(self, values: Iterable) -> None:
+        """Dodaje wiele próbek naraz."""
+        values = np.asarray(values, dtype=self._data.dtype)
+        if len(values) >= self._capacity:
+            values = values[-self._capacity:]
+            self._data[:self._capacity] = values
+            self._data[self._capacity:] = values
+            self._head = 0
+            self._size = self._capacity
+            return
+        for value in values:
+            self.append(value)
+
+    def view(self) -> np.ndarray:
+        """
+        Zwraca widok (bez kopiowania) próbek od najstarszej do najnowszej.
+
+        Widok jest tylko do odczytu i pozostaje aktualny do kolejnego
+        ``append``.
+        """
+        end = self._head + self._capacity
+        view = self._data[end - self._size:end]
+        view.flags.writeable = False
+        return view
+
+    def tolist(self) -> list:
+        """Zwraca kopię danych jako listę wartości Pythona."""
+        return self.view().tolist()
+
+    @property
+    def last(self):
+        """Ostatnio dodana próbka."""
+        if not self._size:
+            raise IndexError("Bufor jest pusty")
+        return self._data[self._head + self._capacity - 1]
+
+    def resize(self, capacity: int) -> None:
+        """Zmienia pojemność bufora, zachowując najnowsze próbki."""
+        if capacity <= 0:
+            raise ValueError("Pojemność bufora musi być dodatnia")
+        if capacity == self._capacity:
+            return
+        kept = self.view()[-capacity:].copy()
+        self._capacity = int(capacity)
+        self._data = np.zeros(
+            (2 * self._capacity, *self._row_shape), dtype=self._data.dtype
+        )
+        self._head = 0
+        self._size = 0
+        self.extend(kept)
+
+    def column(self, index: int) -> "ColumnView":
+        """Zwraca historię jednej wartości próbek wierszowych (bez kopiowania)."""
+        if not self._row_shape:
+            raise ValueError("Bufor nie przechowuje próbek wierszowych")
+        return ColumnView(self, index)
+
+    def clear(self) -> None:
+        """Usuwa wszystkie próbki z bufora."""
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator:
+        return iter(self.view())
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __array__(self, dtype=None, copy=None):
+        view = self.view()
+        return view if dtype is None else view.astype(dtype)
+
+
+class ColumnView:
+    """
+    Historia jednej kolumny ``RingBuffer`` z próbkami wierszowymi.
+
+    Udostępnia odczyt jak ``RingBuffer`` (``view``, ``last``, ``tolist``);
+    dane zapisuje się przez bufor wierszy.
+    """
+    __slots__ = ("buffer", "index")
+
+    def __init__(self, buffer: RingBuffer, index: int):
+        self.buffer = buffer
+        self.index = index
+
+    def view(self) -> np.ndarray:
+        """Zwraca widok (bez kopiowania) wartości kolumny."""
+        return self.buffer.view()[:, self.index]
+
+    def tolist(self) -> list:
+        """Zwraca kopię danych jako listę wartości Pythona."""
+        return self.view().tolist()
+
+    @property
+    def last(self):
+        """Ostatnia wartość kolumny."""
+        return self.buffer.last[self.index]
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.view())
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __array__(self, dtype=None, copy=None):
+        view = self.view()
+        return view if dtype is None else view.astype(dtype)
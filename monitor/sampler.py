@@ -0,0 +1,364 @@
+import heapq
+import logging
+import threading
+from dataclasses import dataclass, field, replace
+from time import monotonic_ns, time_ns
+from typing import Any, Callable, Dict, List, Optional
+
+from .executor import CollectionExecutor
+from .instrumentation import INSTRUMENTATION, Instrumentation
+
+
+# Takt jest spóźniony, gdy rusza później niż ten ułamek interwału po terminie
+LATE_FRACTION = 0.1
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """
+    Ostatni odczyt monitora opublikowany w magazynie.
+
+    ``mono_ns`` (zegar monotoniczny) służy do liczenia odstępów w obrębie
+    procesu, ``wall_ns`` (czas uniksowy w ns) - do osi czasu, zapisu
+    i łączenia danych z wielu hostów. ``timestamp`` to ``mono_ns`` w
+    sekundach.
+    """
+
+    name: str
+    value: Any
+    timestamp: float
+    seq: int
+    mono_ns: int = 0
+    wall_ns: int = 0
+
+
+class SnapshotStore:
+    """
+    Bezpieczny wątkowo magazyn ostatnich odczytów wszystkich monitorów.
+
+    Wątek próbkujący publikuje w nim wyniki, a GUI (lub inni odbiorcy)
+    jedynie odczytuje najnowsze dane, nie wywołując samych monitorów.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._seq = 0
+        self._subscribers: List[Callable[[Snapshot], None]] = []
+
+    @property
+    def seq(self) -> int:
+        """Numer ostatniej publikacji (rośnie przy każdym odczycie)."""
+        with self._cond:
+            return self._seq
+
+    def publish(
+        self,
+        name: str,
+        value: Any,
+        timestamp: Optional[float] = None,
+        wall_ns: Optional[int] = None,
+    ) -> Snapshot:
+        """
+        Zapisuje nowy odczyt monitora i powiadamia subskrybentów.
+
+        Args:
+            name: Nazwa monitora.
+            value: Wynik ``get_usage`` (lub innej funkcji zbierającej).
+            timestamp: Czas odczytu (zegar monotoniczny, s); domyślnie
+                chwila publikacji.
+            wall_ns: Czas uniksowy odczytu w ns; domyślnie ``time.time_ns()``.
+                Dane z innego hosta lub nagrania przekazują tu czas próbki.
+
+        Returns:
+            Opublikowany obiekt ``Snapshot``.
+        """
+        mono_ns = monotonic_ns()
+        if wall_ns is None:
+            wall_ns = time_ns()
+        with self._cond:
+            self._seq += 1
+            snap = Snapshot(
+                name=name,
+                value=value,
+                timestamp=mono_ns / 1e9 if timestamp is None else timestamp,
+                seq=self._seq,
+                mono_ns=mono_ns,
+                wall_ns=wall_ns,
+            )
+            self._snapshots[name] = snap
+            subscribers = list(self._subscribers)
+            self._cond.notify_all()
+
+        for callback in subscribers:
+            try:
+                callback(snap)
+            except Exception:
+                logging.exception("Błąd subskrybenta magazynu odczytów")
+        return snap
+
+    def get(self, name: str) -> Optional[Snapshot]:
+        """Zwraca ostatni ``Snapshot`` monitora lub ``None``."""
+        with self._cond:
+            return self._snapshots.get(name)
+
+    def latest(self, name: str, default: Any = None) -> Any:
+        """Zwraca ostatnią wartość monitora lub ``default``."""
+        snap = self.get(name)
+        return default if snap is None else snap.value
+
+    def snapshot(self) -> Dict[str, Snapshot]:
+        """Zwraca kopię słownika wszystkich ostatnich odczytów."""
+        with self._cond:
+            return dict(self._snapshots)
+
+    def wait(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka, aż pojawi się publikacja nowsza niż ``seq``.
+
+        Returns:
+            ``True`` jeśli pojawiły się nowe dane, ``False`` po upływie czasu.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._seq > seq, timeout)
+
+    def subscribe(self, callback: Callable[[Snapshot], None]) -> None:
+        """Rejestruje funkcję wywoływaną po każdej publikacji."""
+        with self._cond:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Snapshot], None]) -> None:
+        """Usuwa wcześniej zarejestrowanego subskrybenta."""
+        with self._cond:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+
+@dataclass(slots=True)
+class TickStats:
+    """
+    Punktualność zadania próbkowania.
+
+    ``late`` - takty uruchomione później niż ``LATE_FRACTION`` interwału po
+    terminie; ``missed`` - takty pominięte, bo zadanie (lub cały wątek)
+    spóźniło się o pełny interwał lub więcej.
+    """
+
+    ticks: int = 0
+    late: int = 0
+    missed: int = 0
+    last_late_ms: float = 0.0
+    max_late_ms: float = 0.0
+
+
+@dataclass(order=True)
+class SamplerTask:
+    """
+    Zadanie próbkowania: funkcja zbierająca wywoływana co ``interval`` s.
+
+    ``next_run`` to bezwzględny termin kolejnego taktu (zegar monotoniczny,
+    ns); kolejne terminy są wyznaczane od poprzedniego terminu, a nie od
+    chwili wykonania, więc opóźnienia odczytów się nie kumulują.
+    """
+
+    next_run: int
+    name: str = field(compare=False)
+    func: Callable[[], Any] = field(compare=False)
+    interval: float = field(compare=False)
+    timeout: Optional[float] = field(default=None, compare=False)
+    stats: TickStats = field(default_factory=TickStats, compare=False)
+
+    @property
+    def interval_ns(self) -> int:
+        """Interwał w nanosekundach."""
+        return max(1, int(self.interval * 1e9))
+
+
+class Sampler:
+    """
+    Wątek próbkujący, który uruchamia monitory według własnych harmonogramów.
+
+    Każde zadanie ma osobny interwał; wyniki trafiają do ``SnapshotStore``.
+    Wątek GUI nie wywołuje monitorów, więc blokujące odczyty nie zamrażają
+    interfejsu. Z ``CollectionExecutor`` monitory działają współbieżnie,
+    a zawieszony monitor nie opóźnia pozostałych. Czas każdego odczytu jest
+    mierzony jako operacja ``collect.<nazwa>``.
+
+    Takty mają bezwzględne terminy (``SamplerTask.next_run``). Opóźnienie
+    startu taktu względem terminu jest mierzone jako operacja
+    ``schedule.<nazwa>`` (błąd - takt spóźniony), a takty spóźnione
+    i pominięte zlicza ``tick_stats``.
+    """
+    def __init__(
+        self,
+        store: Optional[SnapshotStore] = None,
+        executor: Optional[CollectionExecutor] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        """
+        Args:
+            store: Magazyn, do którego publikowane są odczyty.
+            executor: Pula wykonująca monitory; ``None`` oznacza wywołania
+                kolejno w wątku próbkującym.
+            instrumentation: Rejestr czasów odczytu; domyślnie wspólny
+                ``INSTRUMENTATION``.
+        """
+        self.store = store if store is not None else SnapshotStore()
+        self.executor = executor
+        self.instrumentation = (
+            instrumentation if instrumentation is not None else INSTRUMENTATION
+        )
+        self._tasks: Dict[str, SamplerTask] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        interval: float,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Dodaje (lub zastępuje) zadanie próbkowania.
+
+        Args:
+            name: Nazwa, pod którą wynik trafi do magazynu.
+            func: Funkcja zbierająca, np. ``monitor.get_usage``.
+            interval: Odstęp między próbkami w sekundach.
+            timeout: Limit czasu jednego odczytu (tylko z ``executor``);
+                domyślnie równy interwałowi.
+        """
+        if interval <= 0:
+            raise ValueError("Interwał próbkowania musi być dodatni")
+        with self._lock:
+            self._tasks[name] = SamplerTask(
+                next_run=monotonic_ns(), name=name,
+                func=self.instrumentation.wrap(f"collect.{name}", func),
+                interval=interval, timeout=timeout,
+            )
+        self._wakeup.set()
+
+    def remove(self, name: str) -> None:
+        """Usuwa zadanie próbkowania o podanej nazwie."""
+        with self._lock:
+            self._tasks.pop(name, None)
+
+    def set_interval(self, name: str, interval: float) -> None:
+        """Zmienia interwał istniejącego zadania."""
+        if interval <= 0:
+            raise ValueError("Interwał próbkowania musi być dodatni")
+        with self._lock:
+            task = self._tasks.get(name)
+            if task is not None:
+                task.interval = interval
+                task.next_run = min(task.next_run, monotonic_ns() + task.interval_ns)
+        self._wakeup.set()
+
+    def tick_stats(self) -> Dict[str, TickStats]:
+        """Zwraca kopie statystyk punktualności wszystkich zadań."""
+        with self._lock:
+            return {name: replace(task.stats) for name, task in self._tasks.items()}
+
+    @property
+    def running(self) -> bool:
+        """Czy wątek próbkujący działa."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> None:
+        """
+        Wykonuje wszystkie zadania jeden raz i czeka na wyniki.
+
+        Z ``executor`` czeka najwyżej tyle, ile wynosi najdłuższy limit
+        czasu zadania.
+        """
+        with self._lock:
+            tasks = list(self._tasks.values())
+        futures = [self._execute(task) for task in tasks]
+        if self.executor is not None:
+            timeout = max((self._timeout(t) for t in tasks), default=None)
+            self.executor.wait([f for f in futures if f is not None], timeout)
+
+    def start(self) -> None:
+        """Uruchamia wątek próbkujący (jeśli jeszcze nie działa)."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="resource-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """Zatrzymuje wątek próbkujący i czeka na jego zakończenie."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @staticmethod
+    def _timeout(task: SamplerTask) -> float:
+        """Limit czasu odczytu zadania."""
+        return task.timeout if task.timeout is not None else task.interval
+
+    def _execute(self, task: SamplerTask):
+        """Wywołuje funkcję zadania i publikuje wynik w magazynie."""
+        if self.executor is not None:
+            name = task.name
+            return self.executor.submit(
+                name,
+                task.func,
+                lambda value: self.store.publish(name, value),
+                timeout=self._timeout(task),
+            )
+        try:
+            value = task.func()
+        except Exception:
+            logging.exception("Błąd podczas próbkowania %s", task.name)
+            return None
+        self.store.publish(task.name, value)
+        return None
+
+    def _tick(self, task: SamplerTask) -> None:
+        """Wykonuje takt zadania i wyznacza termin następnego."""
+        interval_ns = task.interval_ns
+        late_ns = monotonic_ns() - task.next_run
+        late = late_ns > LATE_FRACTION * interval_ns
+        stats = task.stats
+        stats.ticks += 1
+        stats.late += late
+        stats.last_late_ms = late_ns / 1e6
+        stats.max_late_ms = max(stats.max_late_ms, stats.last_late_ms)
+        self.instrumentation.record(f"schedule.{task.name}", late_ns / 1e6, error=late)
+
+        self._execute(task)
+
+        # Terminy, które minęły w trakcie spóźnienia lub odczytu, są
+        # pomijane (bez serii odczytów "na doganianie")
+        missed = max(0, monotonic_ns() - task.next_run) // interval_ns
+        if missed:
+            stats.missed += missed
+            logging.debug("Pominięte takty zadania %s: %d", task.name, missed)
+        task.next_run += (missed + 1) * interval_ns
+
+    def _run(self) -> None:
+        """Główna pętla wątku: wykonuje zadania, których termin już minął."""
+        while not self._stop.is_set():
+            with self._lock:
+                queue = list(self._tasks.values())
+            heapq.heapify(queue)
+
+            now = monotonic_ns()
+            while queue and queue[0].next_run <= now:
+                task = heapq.heappop(queue)
+                if self._stop.is_set():
+                    return
+                self._tick(task)
+
+            with self._lock:
+                pending = [t.next_run for t in self._tasks.values()]
+            delay = (min(pending) - monotonic_ns()) / 1e9 if pending else None
+            self._wakeup.wait(None if delay is None else max(0.0, delay))
+            self._wakeup.clear()
@@ -0,0 +1,183 @@
+"""Pamięć podręczna statycznej topologii systemu z wykrywaniem zmian.
+
+Monitory nie odpytują co takt o listę partycji, parametry interfejsów
+sieciowych ani listę GPU - pobierają je z ``TopologyCache``, która odświeża
+je po upływie TTL (oraz natychmiast po zmianie montowań na Linuksie)
+i powiadamia subskrybentów, gdy topologia faktycznie się zmieni.
+"""
+
+import logging
+import os
+import select
+import threading
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+MOUNTS_FILE = "/proc/self/mounts"
+
+
+class _MountWatcher:
+    """
+    Wykrywa zmiany punktów montowania bez ponownego odczytu partycji.
+
+    Jądro Linuksa sygnalizuje zmianę tablicy montowań zdarzeniem ``POLLPRI``
+    na ``/proc/self/mounts``; sprawdzenie to jedno nieblokujące ``poll``.
+    Na innych systemach watcher jest nieaktywny i pozostaje sam TTL.
+    """
+    def __init__(self, path: str = MOUNTS_FILE):
+        self.path = path
+        self._file = None
+        self._poll = None
+        self.active = hasattr(select, "poll") and os.path.exists(path)
+
+    def _open(self) -> None:
+        """Otwiera plik montowań przy pierwszym sprawdzeniu."""
+        try:
+            self._file = open(self.path, "rb")
+            self._file.read()
+            self._poll = select.poll()
+            self._poll.register(self._file.fileno(), select.POLLPRI | select.POLLERR)
+        except OSError:
+            self.active = False
+
+    def changed(self) -> bool:
+        """Czy tablica montowań zmieniła się od poprzedniego wywołania."""
+        if not self.active:
+            return False
+        if self._poll is None:
+            # Pierwsze wywołanie następuje tuż po wczytaniu partycji
+            self._open()
+            return False
+        if not self._poll.poll(0):
+            return False
+        # Ponowny odczyt kasuje zdarzenie
+        self._file.seek(0)
+        self._file.read()
+        return True
+
+
+@dataclass
+class _Entry:
+    """Wpis pamięci podręcznej topologii."""
+
+    loader: Callable[[], Any]
+    ttl_s: float
+    watcher: Optional[Callable[[], bool]] = None
+    value: Any = None
+    loaded_at: float = float("-inf")
+    version: int = 0
+    listeners: List[Callable[[str, Any, Any], None]] = field(default_factory=list)
+
+
+class TopologyCache:
+    """
+    Pamięć podręczna rzadko zmieniającej się topologii systemu.
+
+    Lista partycji, parametry interfejsów sieciowych czy lista GPU zmieniają
+    się rzadko, a ich odczyt bywa kosztowny (setki montowań lub
+    interfejsów). Monitory pobierają je stąd; wartości są odświeżane po
+    upływie TTL lub - dla partycji na Linuksie - natychmiast po zdarzeniu
+    zmiany montowań. Zmiana wartości zwiększa ``version`` wpisu
+    i powiadamia subskrybentów.
+    """
+    def __init__(self, ttl_s: float = 30.0):
+        """
+        Args:
+            ttl_s: Domyślny czas ważności wpisów w sekundach.
+        """
+        self.ttl_s = ttl_s
+        self._lock = threading.RLock()
+        self._entries: Dict[str, _Entry] = {}
+        mounts = _MountWatcher()
+        self.register(
+            "partitions", lambda: psutil.disk_partitions(),
+            watcher=mounts.changed if mounts.active else None,
+        )
+        self.register("nic_stats", lambda: psutil.net_if_stats())
+
+    def register(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl_s: Optional[float] = None,
+        watcher: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Rejestruje wpis topologii.
+
+        Args:
+            key: Nazwa wpisu, np. ``gpus``.
+            loader: Funkcja odczytująca aktualną wartość.
+            ttl_s: Czas ważności; domyślnie ``ttl_s`` pamięci podręcznej.
+            watcher: Tania funkcja zwracająca ``True`` po wykryciu zmiany
+                (wymusza odświeżenie przed upływem TTL).
+        """
+        with self._lock:
+            self._entries[key] = _Entry(
+                loader=loader,
+                ttl_s=self.ttl_s if ttl_s is None else ttl_s,
+                watcher=watcher,
+            )
+
+    def get(self, key: str) -> Any:
+        """Zwraca wartość wpisu, odświeżając ją po upływie TTL lub zmianie."""
+        with self._lock:
+            entry = self._entries[key]
+            changed = entry.watcher is not None and entry.watcher()
+            if changed or monotonic() - entry.loaded_at >= entry.ttl_s:
+                self._reload(key, entry)
+            return entry.value
+
+    def version(self, key: str) -> int:
+        """Numer wersji wpisu (rośnie przy każdej zmianie wartości)."""
+        with self._lock:
+            return self._entries[key].version
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Wymusza odświeżenie wpisu (lub wszystkich) przy następnym ``get``."""
+        with self._lock:
+            for name, entry in self._entries.items():
+                if key is None or name == key:
+                    entry.loaded_at = float("-inf")
+
+    def subscribe(self, key: str, callback: Callable[[str, Any, Any], None]) -> None:
+        """Rejestruje funkcję ``callback(key, stara, nowa)`` wołaną po zmianie."""
+        with self._lock:
+            self._entries[key].listeners.append(callback)
+
+    def _reload(self, key: str, entry: _Entry) -> None:
+        """Odczytuje wartość wpisu i powiadamia o zmianie."""
+        old = entry.value
+        entry.value = entry.loader()
+        entry.loaded_at = monotonic()
+        if entry.version and entry.value == old:
+            return
+        entry.version += 1
+        if entry.version == 1:
+            return
+        logging.info("Zmiana topologii: %s", key)
+        for callback in list(entry.listeners):
+            try:
+                callback(key, old, entry.value)
+            except Exception:
+                logging.exception("Błąd subskrybenta topologii")
+
+    # Skróty dla najczęściej używanych wpisów
+
+    def partitions(self) -> list:
+        """Lista partycji (``psutil.disk_partitions()``)."""
+        return self.get("partitions")
+
+    def nic_stats(self) -> dict:
+        """Parametry interfejsów sieciowych (``psutil.net_if_stats()``)."""
+        return self.get("nic_stats")
+
+    def gpus(self) -> list:
+        """
+        Nazwy GPU (wpis rejestrowany przez ``GPUMonitor`` po otwarciu
+        backendu - wcześniej biblioteka GPU nie jest importowana).
+        """
+        return self.get("gpus")
@@ -0,0 +1,322 @@
+"""Odtwarzanie zapisanych metryk w miejsce monitorów.
+
+``ReplaySource`` publikuje w ``SnapshotStore`` wiersze wczytane z nagrania
+(eksport CSV/JSON/NPZ, strumień CSV/JSON Lines albo katalog magazynu
+``TieredStore``) - GUI, eksportery i alerty korzystają z nich tak samo jak
+z odczytów wątku próbkującego. Odtwarzanie odbywa się z zadaną prędkością
+(``1`` - czas rzeczywisty, ``10`` - dziesięciokrotnie szybciej, ``None`` -
+bez czekania) i można je przewinąć do dowolnej chwili::
+
+    python main.py --replay incydent.npz --speed 10
+    python headless.py --replay metrics.jsonl --speed max --output out.npz
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import math
+import threading
+from pathlib import Path
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from monitor.metrics import unflatten
+from monitor.sampler import SnapshotStore
+
+
+def _number(value) -> float:
+    """Zamienia komórkę CSV lub wartość JSON na liczbę (brak -> NaN)."""
+    if value is None or value == "":
+        return math.nan
+    return float(value)
+
+
+def _read_csv(path: Path) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Wczytuje plik CSV z kolumną czasu i kolumnami metryk."""
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if not header:
+            return np.empty(0), {}
+        rows = [[_number(v) for v in row] for row in reader if row]
+    data = np.array(rows, dtype=np.float64).reshape(len(rows), len(header))
+    return data[:, 0], {name: data[:, i] for i, name in enumerate(header[1:], 1)}
+
+
+def _read_json_lines(path: Path) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Wczytuje strumień JSON Lines (``{"t": ..., "CPU": ...}`` na wiersz)."""
+    rows: List[Dict[str, float]] = []
+    names: Dict[str, None] = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                row = json.loads(line)
+                rows.append(row)
+                names.update(dict.fromkeys(k for k in row if k != "t"))
+    x = np.array([_number(row.get("t")) for row in rows], dtype=np.float64)
+    return x, {
+        name: np.array([_number(row.get(name)) for row in rows], dtype=np.float64)
+        for name in names
+    }
+
+
+def _read_json(path: Path) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Wczytuje plik ``JSONExporter`` (``{"x_data": ..., "metrics": ...}``)."""
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    x = np.array([_number(v) for v in data["x_data"]], dtype=np.float64)
+    return x, {
+        name: np.array([_number(v) for v in values], dtype=np.float64)
+        for name, values in data["metrics"].items()
+    }
+
+
+def load_recording(path) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Wczytuje nagranie metryk z pliku lub katalogu magazynu.
+
+    Format jest rozpoznawany po rozszerzeniu: ``.npz`` (``NPZExporter``),
+    ``.json`` (``JSONExporter``), ``.jsonl``/``.ndjson`` (strumień JSON
+    Lines), katalog (``TieredStore``); pozostałe pliki są czytane jako CSV.
+
+    Args:
+        path: Ścieżka nagrania.
+
+    Returns:
+        Krotka ``(czas, {metryka: wartości})`` posortowana według czasu.
+    """
+    path = Path(path)
+    if path.is_dir():
+        from storage.rollup import TieredStore
+
+        tsdb = TieredStore(path)
+        try:
+            x, metrics = tsdb.frame()
+        finally:
+            tsdb.close()
+    elif path.suffix.lower() == ".npz":
+        from exporter.exporters import load_npz
+
+        x, metrics, _ = load_npz(str(path), mmap=False)
+    elif path.suffix.lower() == ".json":
+        x, metrics = _read_json(path)
+    elif path.suffix.lower() in (".jsonl", ".ndjson"):
+        x, metrics = _read_json_lines(path)
+    else:
+        x, metrics = _read_csv(path)
+    x = np.asarray(x, dtype=np.float64)
+    order = np.argsort(x, kind="stable")
+    return x[order], {
+        name: np.asarray(values, dtype=np.float64)[order]
+        for name, values in metrics.items()
+    }
+
+
+class ReplaySource:
+    """
+    Źródło odczytów odtwarzające nagranie zamiast uruchamiać monitory.
+
+    Interfejs ``start``/``stop``/``run_once`` odpowiada ``Sampler``: każdy
+    wiersz nagrania jest publikowany w ``store`` jako wyniki zadań ``cpu``,
+    ``ram``, ``disk``... (``unflatten``) z czasem wiersza jako ``wall_ns``.
+    Odbiorcy, którym nie wystarcza ostatni odczyt (np. wykresy przy
+    odtwarzaniu przyspieszonym), dostają każdy wiersz przez ``subscribe``.
+
+    Args:
+        x: Oś czasu nagrania w sekundach (rosnąco).
+        metrics: Wartości metryk (``{nazwa: tablica}``) o długości ``x``.
+        speed: Prędkość odtwarzania; ``None`` - bez czekania.
+        store: Magazyn, w którym publikowane są odczyty; domyślnie nowy.
+    """
+    def __init__(
+        self,
+        x,
+        metrics: Dict[str, np.ndarray],
+        speed: Optional[float] = 1.0,
+        store: Optional[SnapshotStore] = None,
+    ):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.names = list(metrics)
+        # Wiersze w jednej macierzy - odczyt wiersza to jedno wycięcie
+        self._rows = np.column_stack(
+            [np.asarray(metrics[n], dtype=np.float64) for n in self.names]
+        ) if self.names else np.empty((len(self.x), 0))
+        self.store = store if store is not None else SnapshotStore()
+        self.position = 0
+        self._lock = threading.Lock()
+        self._speed = speed
+        self._anchor: Optional[Tuple[float, float]] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[float, Dict[str, Any]], None]] = []
+
+    @classmethod
+    def from_file(cls, path, speed: Optional[float] = 1.0, **kwargs) -> "ReplaySource":
+        """Tworzy źródło z nagrania wczytanego przez ``load_recording``."""
+        x, metrics = load_recording(path)
+        return cls(x, metrics, speed=speed, **kwargs)
+
+    @property
+    def start_time(self) -> float:
+        """Czas pierwszego wiersza nagrania."""
+        return float(self.x[0]) if len(self.x) else 0.0
+
+    @property
+    def end_time(self) -> float:
+        """Czas ostatniego wiersza nagrania."""
+        return float(self.x[-1]) if len(self.x) else 0.0
+
+    @property
+    def time(self) -> float:
+        """Czas ostatnio opublikowanego wiersza."""
+        if not len(self.x):
+            return 0.0
+        return float(self.x[max(self.position - 1, 0)])
+
+    @property
+    def finished(self) -> bool:
+        """Czy odtworzono już wszystkie wiersze."""
+        return self.position >= len(self.x)
+
+    @property
+    def speed(self) -> Optional[float]:
+        """Prędkość odtwarzania (``None`` - maksymalna)."""
+        return self._speed
+
+    @speed.setter
+    def speed(self, value: Optional[float]) -> None:
+        if value is not None and value <= 0:
+            raise ValueError("Prędkość odtwarzania musi być dodatnia")
+        with self._lock:
+            self._speed = value
+            self._anchor = None
+        self._wake.set()
+
+    def row(self, index: int) -> Dict[str, float]:
+        """Zwraca wiersz nagrania jako słownik ``metryka: wartość``."""
+        return dict(zip(self.names, self._rows[index].tolist()))
+
+    def seek(self, t: float) -> None:
+        """
+        Przewija do chwili ``t`` i publikuje wiersz obowiązujący w tej chwili.
+
+        Args:
+            t: Czas w jednostkach osi nagrania.
+        """
+        with self._lock:
+            index = int(np.searchsorted(self.x, t, side="right"))
+            self.position = max(index - 1, 0)
+            self._anchor = None
+        self.run_once()
+        self._wake.set()
+
+    def subscribe(self, callback: Callable[[float, Dict[str, Any]], None]) -> None:
+        """
+        Rejestruje funkcję ``callback(czas, wyniki)`` wołaną po publikacji
+        każdego wiersza (``wyniki`` - słownik ``zadanie: wynik``).
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[float, Dict[str, Any]], None]) -> None:
+        """Usuwa funkcję zarejestrowaną przez ``subscribe``."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def run_once(self) -> bool:
+        """
+        Publikuje bieżący wiersz i przechodzi do następnego.
+
+        Returns:
+            ``False``, jeśli nagranie zostało już odtworzone.
+        """
+        with self._lock:
+            if self.position >= len(self.x):
+                return False
+            t = float(self.x[self.position])
+            values = self.row(self.position)
+            self.position += 1
+        # Odczyty niosą czas z nagrania, a nie chwilę odtworzenia
+        wall_ns = int(t * 1e9)
+        readings = unflatten(values)
+        for task, value in readings.items():
+            self.store.publish(task, value, wall_ns=wall_ns)
+        for callback in list(self._listeners):
+            try:
+                callback(t, readings)
+            except Exception:
+                logging.exception("Błąd odbiorcy wierszy nagrania")
+        return True
+
+    def _delay(self) -> float:
+        """Czas oczekiwania do publikacji bieżącego wiersza w sekundach."""
+        with self._lock:
+            if self._speed is None or self.position >= len(self.x):
+                return 0.0
+            t = float(self.x[self.position])
+            now = monotonic()
+            if self._anchor is None:
+                self._anchor = (now, t)
+            wall0, t0 = self._anchor
+            return wall0 + (t - t0) / self._speed - now
+
+    def run(self, on_row: Optional[Callable[[float], None]] = None) -> None:
+        """
+        Odtwarza nagranie do końca lub do wywołania ``stop`` (blokująco).
+
+        Args:
+            on_row: Funkcja wywoływana z czasem każdego opublikowanego
+                wiersza (np. zapis historii w trybie headless).
+        """
+        while not self._stop.is_set():
+            self._wake.clear()
+            delay = self._delay()
+            if delay > 0:
+                # Przewinięcie lub zmiana prędkości przerywa oczekiwanie
+                self._wake.wait(delay)
+                continue
+            if not self.run_once():
+                break
+            if on_row is not None:
+                on_row(self.time)
+        logging.info("Odtwarzanie zakończone na %.3f s", self.time)
+
+    def start(self) -> None:
+        """Uruchamia odtwarzanie w wątku w tle."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._anchor = None
+        self._thread = threading.Thread(target=self.run, name="replay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Zatrzymuje odtwarzanie."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def parse_speed(value: str) -> Optional[float]:
+    """
+    Parsuje prędkość odtwarzania z wiersza poleceń.
+
+    Args:
+        value: Liczba (np. ``10`` lub ``10x``) albo ``max``.
+
+    Returns:
+        Prędkość lub ``None`` dla ``max``.
+    """
+    value = value.strip().lower()
+    if value == "max":
+        return None
+    speed = float(value[:-1] if value.endswith("x") else value)
+    if speed <= 0:
+        raise ValueError("Prędkość odtwarzania musi być dodatnia")
+    return speed
@@ -0,0 +1,333 @@
+"""Wielorozdzielcze poziomy agregacji (rollup) dla długiej historii.
+
+Próbki surowe są na bieżąco agregowane do przedziałów o stałej długości
+(domyślnie 10 s, 1 min i 1 h). Każdy przedział przechowuje ``min``, ``max``,
+``avg`` i ``last``. Widoki i eksporty wybierają poziom, który mieści żądane
+okno czasu w zadanej liczbie punktów - np. 24 h na wykresie to 1440 punktów
+z poziomu minutowego zamiast 86 400 próbek surowych.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from monitor.ring_buffer import RingBuffer
+from storage.timeseries_store import RECORD_DTYPE, TimeSeriesStore
+
+DEFAULT_TIERS: Tuple[float, ...] = (10.0, 60.0, 3600.0)
+
+ROLLUP_DTYPE = np.dtype([
+    ("t", "<f8"), ("min", "<f8"), ("max", "<f8"), ("avg", "<f8"), ("last", "<f8"),
+])
+
+Bucket = Tuple[float, float, float, float, float]
+
+
+def select_tier(
+    tiers: Sequence[float],
+    window_s: float,
+    max_points: int,
+    raw_interval_s: float = 1.0,
+) -> Optional[float]:
+    """
+    Wybiera najdrobniejszą rozdzielczość, która mieści okno w ``max_points``.
+
+    Args:
+        tiers: Dostępne rozdzielczości poziomów w sekundach.
+        window_s: Długość żądanego okna czasu.
+        max_points: Maksymalna liczba punktów wyniku.
+        raw_interval_s: Odstęp między próbkami surowymi.
+
+    Returns:
+        Rozdzielczość poziomu w sekundach lub ``None`` dla danych surowych.
+    """
+    if window_s / raw_interval_s <= max_points:
+        return None
+    for resolution in sorted(tiers):
+        if window_s / resolution <= max_points:
+            return resolution
+    return max(tiers) if tiers else None
+
+
+class RollupAggregator:
+    """Przyrostowo agreguje próbki do przedziałów o długości ``resolution``."""
+
+    def __init__(self, resolution: float):
+        if resolution <= 0:
+            raise ValueError("Rozdzielczość musi być dodatnia")
+        self.resolution = resolution
+        self._start: Optional[float] = None
+        self._min = self._max = self._sum = self._last = 0.0
+        self._count = 0
+
+    def add(self, timestamp: float, value: float) -> Optional[Bucket]:
+        """
+        Dodaje próbkę.
+
+        Returns:
+            Zamknięty przedział ``(start, min, max, avg, last)``, jeśli próbka
+            rozpoczęła nowy przedział; w przeciwnym razie ``None``.
+        """
+        if value is None or math.isnan(value):
+            return None
+        start = math.floor(timestamp / self.resolution) * self.resolution
+        done = None
+        if self._start is not None and start != self._start:
+            done = self.current()
+            self._start = None
+        if self._start is None:
+            self._start = start
+            self._min = self._max = self._sum = self._last = value
+            self._count = 1
+        else:
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+            self._sum += value
+            self._last = value
+            self._count += 1
+        return done
+
+    def current(self) -> Optional[Bucket]:
+        """Zwraca bieżący (niezamknięty) przedział lub ``None``."""
+        if self._start is None:
+            return None
+        return (
+            self._start, self._min, self._max, self._sum / self._count, self._last
+        )
+
+
+class RollupHistory:
+    """
+    Historia jednej metryki w pamięci na wszystkich poziomach agregacji.
+
+    Każdy poziom trzyma zamknięte przedziały w buforach cyklicznych
+    o pojemności dobranej do okna ``window_s``.
+    """
+    def __init__(self, window_s: float, tiers: Iterable[float] = DEFAULT_TIERS):
+        self.tiers = tuple(sorted(tiers))
+        self._aggregators = {r: RollupAggregator(r) for r in self.tiers}
+        self._buffers: Dict[float, Dict[str, RingBuffer]] = {}
+        self.resize(window_s)
+
+    def resize(self, window_s: float) -> None:
+        """Dopasowuje pojemność poziomów do nowego okna czasu."""
+        for resolution in self.tiers:
+            capacity = max(1, math.ceil(window_s / resolution) + 1)
+            buffers = self._buffers.get(resolution)
+            if buffers is None:
+                self._buffers[resolution] = {
+                    field: RingBuffer(capacity) for field in ROLLUP_DTYPE.names
+                }
+            else:
+                for buffer in buffers.values():
+                    buffer.resize(capacity)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Dodaje próbkę surową i aktualizuje wszystkie poziomy."""
+        for resolution, aggregator in self._aggregators.items():
+            bucket = aggregator.add(timestamp, value)
+            if bucket is not None:
+                for field, item in zip(ROLLUP_DTYPE.names, bucket):
+                    self._buffers[resolution][field].append(item)
+
+    def view(
+        self, resolution: float, field: str = "avg"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Zwraca widoki ``(t, field)`` zamkniętych przedziałów poziomu."""
+        buffers = self._buffers[resolution]
+        return buffers["t"].view(), buffers[field].view()
+
+
+class TieredStore:
+    """
+    Trwały magazyn z danymi surowymi i poziomami agregacji.
+
+    Dane surowe trafiają do ``TimeSeriesStore`` w katalogu ``root``, a każdy
+    poziom - do podkatalogu ``@<rozdzielczość>s`` z rekordami
+    ``(t, min, max, avg, last)``. Interfejs ``append``/``flush``/``maintain``/
+    ``close`` jest zgodny z ``TimeSeriesStore``.
+
+    ``flush``, ``maintain`` i ``close`` zapisują także bieżące (niezamknięte)
+    przedziały; po ponownym otwarciu przedział jest odtwarzany z danych
+    surowych, a jego pełny rekord zastępuje zapisany częściowy.
+    """
+    def __init__(
+        self,
+        root,
+        tiers: Iterable[float] = DEFAULT_TIERS,
+        segment_records: int = 86_400,
+        retention_s: Optional[float] = None,
+        rollup_retention_s: Optional[float] = None,
+    ):
+        """
+        Args:
+            root: Katalog magazynu.
+            tiers: Rozdzielczości poziomów agregacji w sekundach.
+            segment_records: Liczba rekordów w segmencie danych surowych.
+            retention_s: Retencja danych surowych.
+            rollup_retention_s: Retencja poziomów agregacji.
+        """
+        self.root = Path(root)
+        self.tiers = tuple(sorted(tiers))
+        self.raw = TimeSeriesStore(
+            self.root, segment_records=segment_records, retention_s=retention_s
+        )
+        self.rollups: Dict[float, TimeSeriesStore] = {
+            resolution: TimeSeriesStore(
+                self.root / f"@{resolution:g}s",
+                segment_records=segment_records,
+                retention_s=rollup_retention_s,
+                dtype=ROLLUP_DTYPE,
+                value_field="avg",
+            )
+            for resolution in self.tiers
+        }
+        self._aggregators: Dict[Tuple[str, float], RollupAggregator] = {}
+        self._lock = threading.RLock()
+
+    def series(self):
+        """Zwraca nazwy zapisanych serii."""
+        return self.raw.series()
+
+    def append(self, name: str, timestamp: float, value: float) -> bool:
+        """Zapisuje próbkę surową i przyrostowo aktualizuje poziomy."""
+        with self._lock:
+            if not self.raw.append(name, timestamp, value):
+                return False
+            for resolution, store in self.rollups.items():
+                key = (name, resolution)
+                aggregator = self._aggregators.get(key)
+                if aggregator is None:
+                    aggregator = self._aggregators[key] = self._resume(
+                        name, resolution, timestamp
+                    )
+                bucket = aggregator.add(timestamp, value)
+                if bucket is not None:
+                    store.upsert(name, *bucket)
+            return True
+
+    def _resume(self, name: str, resolution: float, timestamp: float) -> RollupAggregator:
+        """
+        Tworzy agregator poziomu, odtwarzając przedział bieżący z próbek
+        surowych zapisanych przed ponownym otwarciem magazynu.
+        """
+        aggregator = RollupAggregator(resolution)
+        start = math.floor(timestamp / resolution) * resolution
+        t, values = self.raw.query(name, start, timestamp)
+        # Ostatni rekord to próbka właśnie dopisana przez ``append``
+        for sample_t, value in zip(t[:-1].tolist(), values[:-1].tolist()):
+            aggregator.add(sample_t, value)
+        return aggregator
+
+    def _write_current(self) -> None:
+        """Zapisuje bieżące (niezamknięte) przedziały wszystkich poziomów."""
+        with self._lock:
+            for (name, resolution), aggregator in self._aggregators.items():
+                bucket = aggregator.current()
+                if bucket is not None:
+                    self.rollups[resolution].upsert(name, *bucket)
+
+    def query(
+        self,
+        name: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        max_points: Optional[int] = None,
+        raw_interval_s: float = 1.0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca ``(t, wartości)`` z poziomu dopasowanego do okna.
+
+        Bez ``max_points`` (lub gdy okno mieści się w limicie) zwracane są
+        dane surowe; w przeciwnym razie średnie z wybranego poziomu.
+        """
+        resolution = self.resolution_for(name, start, end, max_points, raw_interval_s)
+        if resolution is None:
+            return self.raw.query(name, start, end)
+        try:
+            return self.rollups[resolution].query(name, start, end)
+        except KeyError:
+            empty = np.empty(0, dtype=RECORD_DTYPE)
+            return empty["t"], empty["v"]
+
+    def resolution_for(
+        self,
+        name: str,
+        start: Optional[float],
+        end: Optional[float],
+        max_points: Optional[int],
+        raw_interval_s: float = 1.0,
+    ) -> Optional[float]:
+        """Zwraca rozdzielczość, z której ``query`` odczyta dane."""
+        if max_points is None:
+            return None
+        segments = self.raw.segments(name)
+        if not segments:
+            return None
+        lo = segments[0].start if start is None else start
+        hi = segments[-1].end if end is None else end
+        return select_tier(self.tiers, hi - lo, max_points, raw_interval_s)
+
+    def query_records(
+        self,
+        name: str,
+        resolution: float,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> np.ndarray:
+        """Zwraca rekordy ``(t, min, max, avg, last)`` danego poziomu."""
+        return self.rollups[resolution].query_records(name, start, end)
+
+    def frame(
+        self,
+        names: Optional[Iterable[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        max_points: Optional[int] = None,
+        raw_interval_s: float = 1.0,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Zwraca wspólną oś czasu i wartości wielu serii (np. do eksportu).
+
+        Brakujące próbki danej serii są uzupełniane wartością NaN.
+        """
+        names = self.series() if names is None else list(names)
+        data = {
+            name: self.query(name, start, end, max_points, raw_interval_s)
+            for name in names
+        }
+        if not data:
+            return np.empty(0), {}
+        x = np.unique(np.concatenate([t for t, _ in data.values()]))
+        columns = {}
+        for name, (t, values) in data.items():
+            column = np.full(len(x), np.nan)
+            column[np.searchsorted(x, t)] = values
+            columns[name] = column
+        return x, columns
+
+    def flush(self, fsync: bool = False) -> None:
+        """Zapisuje bufory danych surowych i poziomów na dysk."""
+        self._write_current()
+        self.raw.flush(fsync)
+        for store in self.rollups.values():
+            store.flush(fsync)
+
+    def maintain(self, idle_s: float = 300.0) -> None:
+        """Okresowa obsługa danych surowych i poziomów (``TimeSeriesStore.maintain``)."""
+        self._write_current()
+        self.raw.maintain(idle_s)
+        for store in self.rollups.values():
+            store.maintain(idle_s)
+
+    def close(self) -> None:
+        """Zamyka wszystkie pliki magazynu."""
+        self._write_current()
+        self.raw.close()
+        for store in self.rollups.values():
+            store.close()
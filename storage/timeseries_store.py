@@ -0,0 +1,401 @@
+"""Trwały magazyn szeregów czasowych na dysku.
+
+Każda seria ma własny katalog z segmentami tylko do dopisywania. Segment to
+plik ``<start_ms>.seg`` zawierający rekordy o stałej szerokości (domyślnie
+``(timestamp: float64, value: float64)``). Odczyty korzystają z
+``numpy.memmap``, więc zapytania o zakres nie wczytują całej historii do list
+Pythona. Katalogi zaczynające się od ``@`` są zarezerwowane (np. na poziomy
+agregacji) i nie są traktowane jako serie.
+
+Otwarte pozostają tylko pliki ostatnio zapisywanych serii (``max_open``,
+kolejność LRU), więc liczba deskryptorów nie rośnie z liczbą dysków
+i interfejsów. ``maintain`` zamyka pliki bezczynnych serii, zapisuje bufory
+i stosuje retencję - ``StoreRecorder`` wywołuje ją okresowo.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic, time
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from monitor.metrics import flatten
+from monitor.sampler import Snapshot, SnapshotStore
+
+RECORD_DTYPE = np.dtype([("t", "<f8"), ("v", "<f8")])
+SEGMENT_SUFFIX = ".seg"
+
+
+@dataclass
+class Segment:
+    """Wpis indeksu czasowego opisujący jeden plik segmentu."""
+
+    path: Path
+    start: float
+    end: float
+    count: int
+
+
+def _read_records(path: Path, dtype: np.dtype = RECORD_DTYPE) -> np.ndarray:
+    """Mapuje plik segmentu do pamięci jako tablicę rekordów."""
+    if path.stat().st_size < dtype.itemsize:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class _Series:
+    """Stan jednej serii: indeks segmentów i otwarty segment do zapisu."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.segments: List[Segment] = []
+        self.writer: Optional[BinaryIO] = None
+        self.last_t = -np.inf
+        self.last_write = 0.0
+
+    @property
+    def active(self) -> Optional[Segment]:
+        return self.segments[-1] if self.segments else None
+
+
+class TimeSeriesStore:
+    """
+    Wbudowany magazyn szeregów czasowych z rotacją i retencją segmentów.
+
+    Args:
+        root: Katalog magazynu.
+        segment_records: Maksymalna liczba rekordów w jednym segmencie.
+        retention_s: Po ilu sekundach usuwać stare segmenty (``None`` -
+            bez limitu).
+        dtype: Strukturalny typ rekordu; pierwsze pole musi nazywać się
+            ``t`` i zawierać znacznik czasu.
+        value_field: Pole zwracane przez ``query`` jako wartość serii.
+        max_open: Maksymalna liczba jednocześnie otwartych plików segmentów;
+            najdawniej zapisywane są zamykane i otwierane ponownie przy
+            kolejnym zapisie.
+    """
+    def __init__(
+        self,
+        root,
+        segment_records: int = 86_400,
+        retention_s: Optional[float] = None,
+        dtype: np.dtype = RECORD_DTYPE,
+        value_field: str = "v",
+        max_open: int = 64,
+    ):
+        if segment_records <= 0:
+            raise ValueError("Segment musi mieścić co najmniej jeden rekord")
+        if max_open <= 0:
+            raise ValueError("Limit otwartych plików musi być dodatni")
+        self.dtype = np.dtype(dtype)
+        if self.dtype.names is None or self.dtype.names[0] != "t":
+            raise ValueError("Pierwszym polem rekordu musi być 't'")
+        self.value_field = value_field
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_records = segment_records
+        self.retention_s = retention_s
+        self._lock = threading.RLock()
+        self._series: Dict[str, _Series] = {}
+        self.max_open = max_open
+        # Serie z otwartym plikiem, od najdawniej zapisywanej
+        self._open: "OrderedDict[str, _Series]" = OrderedDict()
+        for directory in sorted(p for p in self.root.iterdir() if p.is_dir()):
+            if not directory.name.startswith("@"):
+                self._series[unquote(directory.name)] = self._load(directory)
+
+    def _load(self, directory: Path) -> _Series:
+        """Odbudowuje indeks czasowy serii na podstawie plików segmentów."""
+        series = _Series(directory)
+        for path in sorted(directory.glob(f"*{SEGMENT_SUFFIX}")):
+            size = path.stat().st_size
+            extra = size % self.dtype.itemsize
+            if extra:
+                # Niedokończony rekord po awarii - obcinamy go
+                with path.open("r+b") as f:
+                    f.truncate(size - extra)
+            records = _read_records(path, self.dtype)
+            if not len(records):
+                path.unlink()
+                continue
+            series.segments.append(Segment(
+                path=path,
+                start=float(records["t"][0]),
+                end=float(records["t"][-1]),
+                count=len(records),
+            ))
+            series.last_t = float(records["t"][-1])
+            del records
+        return series
+
+    def series(self) -> List[str]:
+        """Zwraca nazwy wszystkich zapisanych serii."""
+        with self._lock:
+            return sorted(self._series)
+
+    def append(self, name: str, timestamp: float, *values: float) -> bool:
+        """
+        Dopisuje próbkę do serii.
+
+        ``values`` to pozostałe pola rekordu (dla domyślnego typu - jedna
+        wartość).
+
+        Próbki muszą mieć rosnące znaczniki czasu; starsze niż ostatnia
+        zapisana próbka są pomijane.
+
+        Returns:
+            ``True`` jeśli próbka została zapisana.
+        """
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                directory = self.root / quote(name, safe="")
+                directory.mkdir(exist_ok=True)
+                series = self._series[name] = _Series(directory)
+            if timestamp < series.last_t:
+                logging.warning("Pominięto próbkę %s spoza kolejności", name)
+                return False
+
+            active = series.active
+            if active is None or active.count >= self.segment_records:
+                self._rotate(series, timestamp)
+                active = series.active
+            elif series.writer is None:
+                # Kontynuacja niepełnego segmentu po ponownym otwarciu
+                series.writer = active.path.open("ab")
+            self._touch(name, series)
+            series.writer.write(
+                np.array([(timestamp, *values)], dtype=self.dtype).tobytes()
+            )
+            active.count += 1
+            active.end = timestamp
+            series.last_t = timestamp
+            return True
+
+    def upsert(self, name: str, timestamp: float, *values: float) -> bool:
+        """
+        Dopisuje próbkę jak ``append``, ale rekord o znaczniku czasu równym
+        ostatniemu zapisanemu zastępuje go (np. przedział agregacji zapisany
+        przed zamknięciem i uzupełniony po ponownym otwarciu).
+
+        Returns:
+            ``True`` jeśli próbka została zapisana.
+        """
+        with self._lock:
+            series = self._series.get(name)
+            if series is None or timestamp != series.last_t:
+                return self.append(name, timestamp, *values)
+            active = series.active
+            if series.writer is not None:
+                series.writer.flush()
+            with active.path.open("r+b") as f:
+                f.seek((active.count - 1) * self.dtype.itemsize)
+                f.write(np.array([(timestamp, *values)], dtype=self.dtype).tobytes())
+            return True
+
+    def _touch(self, name: str, series: _Series) -> None:
+        """Oznacza serię jako ostatnio zapisywaną i pilnuje limitu plików."""
+        series.last_write = monotonic()
+        self._open[name] = series
+        self._open.move_to_end(name)
+        while len(self._open) > self.max_open:
+            _, oldest = self._open.popitem(last=False)
+            self._close_writer(oldest)
+
+    @staticmethod
+    def _close_writer(series: _Series) -> None:
+        if series.writer is not None:
+            series.writer.close()
+            series.writer = None
+
+    def _rotate(self, series: _Series, timestamp: float) -> None:
+        """Zamyka bieżący segment i rozpoczyna nowy."""
+        if series.writer is not None:
+            series.writer.close()
+        path = series.directory / f"{int(timestamp * 1000):020d}{SEGMENT_SUFFIX}"
+        if series.active is not None and series.active.path == path:
+            # Ta sama milisekunda - nie nadpisujemy pełnego segmentu
+            path = path.with_name(f"{path.stem}_{len(series.segments)}{SEGMENT_SUFFIX}")
+        series.writer = path.open("ab")
+        series.segments.append(Segment(path=path, start=timestamp, end=timestamp, count=0))
+        self.apply_retention(now=timestamp)
+
+    def flush(self, fsync: bool = False) -> None:
+        """Zapisuje bufory wszystkich otwartych segmentów na dysk."""
+        with self._lock:
+            for series in self._series.values():
+                if series.writer is not None:
+                    series.writer.flush()
+                    if fsync:
+                        os.fsync(series.writer.fileno())
+
+    def query(
+        self,
+        name: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca znaczniki czasu i wartości serii z przedziału ``[start, end]``.
+
+        Segmenty spoza zakresu są pomijane na podstawie indeksu; w obrębie
+        segmentu granice wyszukiwane są binarnie. Wynik z jednego segmentu
+        jest widokiem na zmapowany plik (bez kopiowania).
+        """
+        records = self.query_records(name, start, end)
+        return records["t"], records[self.value_field]
+
+    def query_records(
+        self,
+        name: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> np.ndarray:
+        """Zwraca pełne rekordy serii z przedziału ``[start, end]``."""
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                raise KeyError(name)
+            if series.writer is not None:
+                series.writer.flush()
+            segments = [
+                s for s in series.segments
+                if s.count and s.end >= start and s.start <= end
+            ]
+            chunks = []
+            for segment in segments:
+                records = _read_records(segment.path, self.dtype)[:segment.count]
+                lo = np.searchsorted(records["t"], start, side="left")
+                hi = np.searchsorted(records["t"], end, side="right")
+                if hi > lo:
+                    chunks.append(records[lo:hi])
+
+        if not chunks:
+            return np.empty(0, dtype=self.dtype)
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+    def segments(self, name: str) -> List[Segment]:
+        """Zwraca kopię indeksu segmentów serii."""
+        with self._lock:
+            return list(self._series[name].segments)
+
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        """
+        Usuwa segmenty starsze niż ``retention_s``.
+
+        Aktywny (ostatni) segment serii nigdy nie jest usuwany.
+
+        Returns:
+            Liczba usuniętych plików.
+        """
+        if self.retention_s is None:
+            return 0
+        cutoff = (time() if now is None else now) - self.retention_s
+        removed = 0
+        with self._lock:
+            for series in self._series.values():
+                keep = []
+                for segment in series.segments[:-1]:
+                    if segment.end < cutoff:
+                        segment.path.unlink(missing_ok=True)
+                        removed += 1
+                    else:
+                        keep.append(segment)
+                series.segments = keep + series.segments[-1:]
+        return removed
+
+    def close_idle(self, idle_s: float) -> int:
+        """
+        Zamyka pliki serii, do których nic nie zapisano od ``idle_s`` s.
+
+        Returns:
+            Liczba zamkniętych plików.
+        """
+        cutoff = monotonic() - idle_s
+        with self._lock:
+            idle = [n for n, s in self._open.items() if s.last_write <= cutoff]
+            for name in idle:
+                self._close_writer(self._open.pop(name))
+        return len(idle)
+
+    def maintain(self, idle_s: float = 300.0) -> None:
+        """
+        Okresowa obsługa magazynu: zapis buforów, zamknięcie plików
+        bezczynnych serii i retencja (także serii zapisywanych rzadko,
+        których segmenty nie podlegają rotacji).
+
+        Args:
+            idle_s: Po ilu sekundach bez zapisu zamykać plik serii.
+        """
+        self.flush()
+        self.close_idle(idle_s)
+        self.apply_retention()
+
+    def close(self) -> None:
+        """Zamyka wszystkie otwarte pliki segmentów."""
+        with self._lock:
+            for series in self._series.values():
+                self._close_writer(series)
+            self._open.clear()
+
+
+class StoreRecorder:
+    """
+    Zapisuje do ``TimeSeriesStore`` (lub ``TieredStore``) każdy odczyt
+    publikowany w ``SnapshotStore`` (subskrybent wątku próbkującego).
+
+    Args:
+        tsdb: Magazyn docelowy.
+        store: Magazyn odczytów, którego publikacje są zapisywane.
+        maintenance_s: Co ile sekund wywoływać ``tsdb.maintain`` w wątku
+            tła; ``None`` wyłącza okresową obsługę.
+    """
+    def __init__(
+        self,
+        tsdb: TimeSeriesStore,
+        store: SnapshotStore,
+        maintenance_s: Optional[float] = 60.0,
+    ):
+        self.tsdb = tsdb
+        self.store = store
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        store.subscribe(self.on_snapshot)
+        if maintenance_s is not None:
+            self._thread = threading.Thread(
+                target=self._maintain, args=(maintenance_s,),
+                name="store-maintenance", daemon=True,
+            )
+            self._thread.start()
+
+    def _maintain(self, interval_s: float) -> None:
+        """Pętla wątku tła: okresowa obsługa magazynu."""
+        while not self._stop.wait(interval_s):
+            try:
+                self.tsdb.maintain()
+            except Exception:
+                logging.exception("Błąd obsługi magazynu szeregów czasowych")
+
+    def on_snapshot(self, snap: Snapshot) -> None:
+        """Dopisuje metryki z jednego odczytu z czasem zegarowym odczytu."""
+        timestamp = snap.wall_ns / 1e9 if snap.wall_ns else time()
+        for metric, value in flatten(snap.name, snap.value).items():
+            self.tsdb.append(metric, timestamp, value)
+
+    def close(self) -> None:
+        """Odłącza rejestrator, zatrzymuje obsługę okresową i zamyka magazyn."""
+        self.store.unsubscribe(self.on_snapshot)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.tsdb.close()
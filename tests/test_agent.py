@@ -0,0 +1,160 @@
+import asyncio
+import math
+import socket
+import time
+
+import numpy as np
+import pytest
+
+from agent.agent import Agent
+from agent.collector import Collector
+from agent.protocol import (
+    FRAME_BATCH, HEADER, ProtocolError, decode_batch, encode_batch, parse_address,
+)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _run_agents(*agents, duration_s=0.3):
+    async def main():
+        await asyncio.gather(*(a.run(duration_s=duration_s) for a in agents))
+
+    asyncio.run(main())
+
+
+def test_batch_roundtrip_is_columnar():
+    rows = [(1.0, {"CPU": 10.0}), (2.0, {"CPU": 20.0, "DISK_/": 50.0})]
+    frame = encode_batch(rows)
+    frame_type = HEADER.unpack(frame[:HEADER.size])[2]
+    times, columns = decode_batch(frame[HEADER.size:])
+
+    assert frame_type == FRAME_BATCH
+    assert times.tolist() == [1.0, 2.0]
+    assert columns["CPU"].tolist() == [10.0, 20.0]
+    assert math.isnan(columns["DISK_/"][0]) and columns["DISK_/"][1] == 50.0
+    with pytest.raises(ProtocolError):
+        decode_batch(b"\x01")
+    assert parse_address("unix:/tmp/x.sock") == ("unix", "/tmp/x.sock")
+    assert parse_address("example:9200") == ("tcp", ("example", 9200))
+
+
+def test_collector_ingests_many_agents_on_loopback():
+    collector = Collector("127.0.0.1:0", history_length=100)
+    collector.start()
+    try:
+        address = collector.bound_address
+        agents = [
+            Agent(address, host=f"node{i}", collect=lambda i=i: {"CPU": float(i), "RAM": 50.0},
+                  interval_s=0.02, batch_size=3)
+            for i in range(3)
+        ]
+        _run_agents(*agents)
+
+        assert _wait_for(lambda: collector.hosts() == ["node0", "node1", "node2"])
+        for i, agent in enumerate(agents):
+            assert _wait_for(lambda: collector.host(f"node{i}").rows == agent.sent)
+            assert agent.sent > 3 and agent.dropped == 0
+            state = collector.host(f"node{i}")
+            assert state.store.latest("cpu").percent == float(i)
+            times, series = collector.history(f"node{i}")
+            assert np.all(np.diff(times) > 0)
+            assert set(series["CPU"]) == {float(i)}
+        assert _wait_for(lambda: not collector.host("node0").connected)
+    finally:
+        collector.stop()
+
+
+def test_agent_reconnects_and_delivers_queued_rows():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    agent = Agent(
+        f"127.0.0.1:{port}", host="late", collect=lambda: {"CPU": 1.0},
+        interval_s=0.02, batch_size=2, reconnect_min_s=0.05, reconnect_max_s=0.1,
+    )
+    collector = Collector(f"127.0.0.1:{port}")
+
+    async def main():
+        run = asyncio.create_task(agent.run(duration_s=0.6))
+        await asyncio.sleep(0.2)  # kolektor jeszcze nie działa - wiersze czekają
+        assert agent.connects == 0 and len(agent.queue) > 0
+        collector.start()
+        await run
+
+    try:
+        asyncio.run(main())
+        assert agent.connects == 1
+        assert not agent.queue
+        assert _wait_for(lambda: "late" in collector.hosts() and collector.host("late").rows == agent.sent)
+    finally:
+        collector.stop()
+
+
+def test_agent_queue_is_bounded():
+    agent = Agent("127.0.0.1:1", host="x", collect=dict, max_queue=3)
+    for t in range(5):
+        agent.enqueue((float(t), {}))
+    assert [row[0] for row in agent.queue] == [2.0, 3.0, 4.0]
+    assert agent.dropped == 2
+
+
+class FrameWriter:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(decode_batch(frame[HEADER.size:])[0].tolist())
+
+    async def drain(self):
+        pass
+
+
+def test_large_queue_is_sent_in_bounded_frames(monkeypatch):
+    import agent.agent as agent_module
+
+    agent = Agent("127.0.0.1:1", host="x", collect=dict, batch_size=10)
+    for t in range(35):
+        agent.enqueue((float(t), {"CPU": 1.0}))
+    calls = []
+
+    def encode(rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise ProtocolError("Ramka za duża")
+        return encode_batch(rows)
+
+    monkeypatch.setattr(agent_module, "encode_batch", encode)
+    writer = FrameWriter()
+
+    async def main():
+        agent._ready = asyncio.Event()
+        agent._stop = asyncio.Event()
+        agent._stop.set()
+        await agent._send_batches(writer)
+
+    asyncio.run(main())
+    # Druga paczka nie dała się zakodować - odrzucona, wysyłka trwa dalej
+    assert calls == [10, 10, 10, 5]
+    assert [frame[0] for frame in writer.frames] == [0.0, 20.0, 30.0]
+    assert (agent.sent, agent.dropped, len(agent.queue)) == (25, 10, 0)
+
+
+def test_collector_over_unix_socket(tmp_path):
+    collector = Collector(f"unix:{tmp_path / 'c.sock'}")
+    collector.start()
+    try:
+        agent = Agent(collector.bound_address, host="local",
+                      collect=lambda: {"NET_UP": 1.0}, interval_s=0.02)
+        _run_agents(agent, duration_s=0.1)
+        assert _wait_for(lambda: "local" in collector.hosts())
+        assert _wait_for(lambda: collector.host("local").store.latest("network") is not None)
+        assert collector.host("local").store.latest("network").upload_kbps == 1.0
+    finally:
+        collector.stop()
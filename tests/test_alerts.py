@@ -0,0 +1,166 @@
+import http.server
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+from alerts.engine import (
+    FIRING, RESOLVED, AlertEngine, RateRule, ThresholdRule, alert_metrics, rule_from_dict,
+)
+from alerts.sinks import BannerSink, LogSink, ThreadedSink, WebhookSink
+from monitor.sampler import SnapshotStore
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+def feed(engine, values, start=0.0, step=1.0, metric="CPU"):
+    events = []
+    for i, value in enumerate(values):
+        events += engine.evaluate("cpu", {metric: value}, start + i * step)
+    return events
+
+
+def test_threshold_fires_once_and_resolves_with_hysteresis():
+    sink = ListSink()
+    engine = AlertEngine([ThresholdRule("cpu", "CPU", 90, hysteresis=5)], [sink])
+
+    feed(engine, [50, 95, 97, 89, 91, 86, 84])
+
+    assert [(e.state, e.value) for e in sink.events] == [(FIRING, 95), (RESOLVED, 84)]
+    assert engine.active() == []
+
+
+def test_duration_rule_needs_sustained_breach():
+    engine = AlertEngine([ThresholdRule("cpu", "CPU", 90, for_s=30)])
+
+    assert feed(engine, [95] * 10 + [50] + [95] * 30) == []
+    events = feed(engine, [95], start=60)
+    assert [e.state for e in events] == [FIRING]
+    assert [a.series for a in engine.active()] == ["CPU"]
+
+
+def test_rate_rule_and_wildcards():
+    rule = rule_from_dict({"type": "rate", "name": "net", "metric": "NET_*",
+                           "threshold": 100, "window_s": 5})
+    assert isinstance(rule, RateRule)
+    engine = AlertEngine([rule])
+
+    assert feed(engine, [0, 50, 100], metric="NET_UP") == []
+    events = feed(engine, [1000], start=3, metric="NET_UP")
+    assert [(e.series, e.state) for e in events] == [("NET_UP", FIRING)]
+
+
+def test_disappeared_series_and_replaced_rules_resolve():
+    sink = ListSink()
+    engine = AlertEngine([ThresholdRule("proc", "PROCESS_*_CPU", 50)], [sink])
+    procs = [SimpleNamespace(pid=1, name="a", cpu_percent=80.0, memory_percent=1.0)]
+    engine.evaluate("processes", alert_metrics("processes", procs), 0)
+    engine.evaluate("processes", alert_metrics("processes", []), 1)
+    assert [(e.series, e.state) for e in sink.events] == [
+        ("PROCESS_a[1]_CPU", FIRING), ("PROCESS_a[1]_CPU", RESOLVED),
+    ]
+
+    engine.evaluate("cpu", {"CPU": 99.0}, 2)
+    engine.add_rule(ThresholdRule("proc", "CPU", 50))
+    engine.evaluate("cpu", {"CPU": 99.0}, 3)
+    assert [e.state for e in sink.events[2:]] == [FIRING]
+
+
+def test_cooldown_suppresses_flapping():
+    sink = ListSink()
+    engine = AlertEngine([ThresholdRule("cpu", "CPU", 90)], [sink], cooldown_s=10)
+    feed(engine, [95, 50, 95, 95, 50])
+    feed(engine, [95], start=20)
+    assert [(e.state, e.timestamp) for e in sink.events] == [
+        (FIRING, 0), (RESOLVED, 1), (FIRING, 20),
+    ]
+
+
+def test_engine_subscribes_to_store_and_banner():
+    banner = BannerSink(limit=1)
+    engine = AlertEngine([ThresholdRule("ram", "RAM", 80)], [banner])
+    store = SnapshotStore()
+    engine.attach(store)
+    store.publish("ram", SimpleNamespace(percent=90.0))
+    store.publish("disk", [SimpleNamespace(mount="/", percent=99.0)])
+    assert banner.messages() == ["[warning] ram: RAM = 90.0 (próg 80)"]
+
+    engine.detach()
+    store.publish("ram", SimpleNamespace(percent=10.0))
+    assert banner.text().startswith("[warning] ram")
+
+
+class SlowSink(ThreadedSink):
+    def __init__(self, **kwargs):
+        self.release = threading.Event()
+        self.handled = []
+        super().__init__(**kwargs)
+
+    def handle(self, event):
+        self.release.wait(5)
+        self.handled.append(event)
+
+
+def test_threaded_sink_never_blocks_and_rate_limits():
+    sink = SlowSink(max_queue=2, max_per_minute=2)
+    engine = AlertEngine([ThresholdRule("x", "*", 0)], [sink])
+
+    start = time.monotonic()
+    engine.evaluate("cpu", {f"M{i}": 1.0 for i in range(10)}, 0)
+    assert time.monotonic() - start < 1
+    sink.release.set()
+    assert sink.flush(5)
+    assert len(sink.handled) == 2
+    assert sink.dropped + sink.suppressed == 8
+    sink.close()
+
+
+def test_log_and_webhook_sinks(tmp_path):
+    received = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    log = LogSink(str(tmp_path / "alerts.log"))
+    webhook = WebhookSink(f"http://127.0.0.1:{server.server_address[1]}/hook")
+    try:
+        engine = AlertEngine([ThresholdRule("cpu", "CPU", 90)], [log, webhook])
+        feed(engine, [95])
+        assert log.flush(5) and webhook.flush(5)
+    finally:
+        server.shutdown()
+        log.close()
+        webhook.close()
+
+    assert "cpu: CPU = 95.0" in (tmp_path / "alerts.log").read_text()
+    assert received[0]["state"] == FIRING and received[0]["series"] == "CPU"
+
+
+def test_store_events_time_on_monotonic_clock(monkeypatch):
+    from monitor import sampler
+
+    clock = iter([0, 10 * 10**9, 30 * 10**9])
+    monkeypatch.setattr(sampler, "monotonic_ns", lambda: next(clock))
+    sink = ListSink()
+    engine = AlertEngine([ThresholdRule("ram", "RAM", 80, for_s=30)], [sink])
+    store = SnapshotStore()
+    engine.attach(store)
+    # Zegar systemowy cofnięty o godzinę nie wydłuża czasu trwania progu
+    for wall_s in (5000, 1400, 1420):
+        store.publish("ram", SimpleNamespace(percent=90.0), wall_ns=wall_s * 10**9)
+
+    assert [(e.state, e.timestamp) for e in sink.events] == [(FIRING, 1420.0)]
@@ -1,14 +1,14 @@
+import dataclasses
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import config
 import main
+from monitor.registry import MonitorRegistry
 
 
 def dummy_build_gui(self):
-    self.ani = main.animation.FuncAnimation(
-        None, self.update_plot, interval=self.update_interval_ms
-    )
+    self.timer = SimpleNamespace(interval=self.update_interval_ms)
 
 
 def make_root():
@@ -20,27 +20,26 @@ def make_root():
     return root
 
 
-def patch_monitors(monkeypatch):
-    monkeypatch.setattr(
-        main,
-        "CPUMonitor",
-        lambda: MagicMock(get_usage=lambda: SimpleNamespace(percent=0)),
-    )
-    monkeypatch.setattr(
-        main,
-        "MemoryMonitor",
-        lambda: MagicMock(get_usage=lambda: SimpleNamespace(percent=0)),
-    )
-    monkeypatch.setattr(main, "DiskMonitor", lambda: MagicMock(get_usage=lambda: []))
-    monkeypatch.setattr(main, "GPUMonitor", lambda: MagicMock(get_usage=lambda: []))
-    monkeypatch.setattr(
-        main,
-        "NetworkMonitor",
-        lambda: MagicMock(
+def patch_monitors(monkeypatch, **monitors):
+    """Zastępuje monitory z rejestru atrapami (``monitors``: zadanie -> monitor)."""
+    fakes = {
+        "cpu": MagicMock(get_usage=lambda: SimpleNamespace(percent=0)),
+        "ram": MagicMock(get_usage=lambda: SimpleNamespace(percent=0)),
+        "disk": MagicMock(get_usage=lambda: []),
+        "gpu": MagicMock(get_usage=lambda: []),
+        "network": MagicMock(
             get_usage=lambda: SimpleNamespace(upload_kbps=0, download_kbps=0)
         ),
-    )
-    
+        **monitors,
+    }
+    registry = MonitorRegistry()
+    for spec in main.REGISTRY.specs():
+        if spec.task in fakes:
+            monitor = fakes[spec.task]
+            spec = dataclasses.replace(spec, factory=lambda m=monitor, **_: m)
+        registry.register(spec)
+    monkeypatch.setattr(main, "REGISTRY", registry)
+
     class DummyVar:
         def __init__(self, master=None, value=""):
             self._value = value
@@ -63,21 +62,15 @@ def test_default_config_when_missing(monkeypatch, tmp_path):
     patch_monitors(monkeypatch)
     monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
     monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
-
-    def fake_anim(fig, func, interval):
-        return SimpleNamespace(event_source=SimpleNamespace(interval=interval))
-
-    monkeypatch.setattr(main.animation, "FuncAnimation", fake_anim)
     app = main.ResourceMonitorApp(make_root(), update_interval_ms=500, history_length=30)
     assert app.update_interval_ms == config.DEFAULT_CONFIG["update_interval_ms"]
     assert app.history_length == config.DEFAULT_CONFIG["history_length"]
-    assert app.ani.event_source.interval == config.DEFAULT_CONFIG["update_interval_ms"]
+    assert app.timer.interval == config.DEFAULT_CONFIG["update_interval_ms"]
 
     hl = config.DEFAULT_CONFIG["history_length"]
-    app.x_data = list(range(hl))
-    app.cpu_data = list(range(hl))
-    app.ram_data = list(range(hl))
-    app.network_data = {"NET_UP": list(range(hl)), "NET_DOWN": list(range(hl))}
+    app.x_data.extend(range(hl))
+    app.samples.extend([[float(i)] * len(app.series) for i in range(hl)])
+    app.sampler.run_once()
     app.update_plot(None)
     assert len(app.x_data) == hl
 
@@ -85,13 +78,6 @@ def test_default_config_when_missing(monkeypatch, tmp_path):
 def test_save_and_load_config(monkeypatch, tmp_path):
     patch_monitors(monkeypatch)
     monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
-    monkeypatch.setattr(
-        main.animation,
-        "FuncAnimation",
-        lambda *a, **k: SimpleNamespace(
-            event_source=SimpleNamespace(interval=k.get("interval"))
-        ),
-    )
     monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
 
     safe_call_mock = MagicMock()
@@ -131,3 +117,157 @@ def test_save_and_load_config(monkeypatch, tmp_path):
     assert app2.cpu_threshold_var.get() == "75"
     assert app2.ram_threshold_var.get() == "65"
 
+
+def test_select_remote_host(monkeypatch, tmp_path):
+    from agent.collector import HostState
+    from agent.protocol import HEADER, decode_batch, encode_batch
+
+    patch_monitors(monkeypatch)
+    monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
+    config.save_config({**config.DEFAULT_CONFIG, "collector_listen": "127.0.0.1:0"})
+
+    app = main.ResourceMonitorApp(make_root())
+    try:
+        assert app.collector is not None
+        # Dane hosta zdalnego trafiają do kolektora jak z połączenia agenta
+        state = app.collector._hosts["node"] = HostState("node", app.history_length)
+        frame = encode_batch([(1.0, {"CPU": 42.0, "RAM": 10.0})])
+        state.ingest(*decode_batch(frame[HEADER.size:]))
+
+        app.sampler.run_once()
+        app.update_plot(None)
+        app.select_host("node")
+        assert len(app.series["CPU"]) == 0
+        app.update_plot(None)
+        assert app.series["CPU"].tolist() == [42.0]
+
+        app.select_host(app.LOCAL_HOST)
+        assert app.view_store is app.store
+    finally:
+        app.on_close()
+
+
+def test_disk_hotplug_adds_and_removes_series(monkeypatch, tmp_path):
+    patch_monitors(monkeypatch)
+    monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
+    app = main.ResourceMonitorApp(make_root())
+    try:
+        disk = SimpleNamespace(mount="/", percent=10.0)
+        usb = SimpleNamespace(mount="/media/usb", percent=50.0)
+        app.store.publish("disk", [disk])
+        app.update_plot(None)
+        app.store.publish("disk", [disk, usb])
+        app.update_plot(None)
+        assert list(app.series) == [
+            "CPU", "RAM", "DISK_/", "DISK_/media/usb", "NET_UP", "NET_DOWN"
+        ]
+        assert app.series["DISK_/media/usb"].tolist()[-1] == 50.0
+        assert len(app.series["DISK_/media/usb"]) == len(app.x_data)
+        assert "DISK_/media/usb" in app.metric_options()
+
+        app.store.publish("disk", [disk])
+        app.update_plot(None)
+        assert "DISK_/" in app.series and "DISK_/media/usb" not in app.series
+        assert "DISK_/media/usb" not in app.rollups
+    finally:
+        app.on_close()
+
+
+def test_gpu_series_added_after_first_sample(monkeypatch, tmp_path):
+    gpu_monitor = MagicMock()
+    patch_monitors(monkeypatch, gpu=gpu_monitor)
+    monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
+    app = main.ResourceMonitorApp(make_root())
+    try:
+        # Start nie odpytuje GPU - serie pojawiają się z pierwszym odczytem
+        gpu_monitor.get_usage.assert_not_called()
+        assert not any(name.startswith("GPU_") for name in app.series)
+        app.store.publish("cpu", SimpleNamespace(percent=1.0))
+        app.update_plot(None)
+        app.store.publish("gpu", [SimpleNamespace(name="RTX", percent=30.0)])
+        app.update_plot(None)
+        history = app.series["GPU_RTX"].tolist()
+        assert history[-1] == 30.0
+        assert len(history) == len(app.x_data) == 2
+    finally:
+        app.on_close()
+
+
+def test_process_table_updated_only_on_new_reading(monkeypatch, tmp_path):
+    patch_monitors(monkeypatch)
+    monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
+    app = main.ResourceMonitorApp(make_root())
+    try:
+        app.renderer = MagicMock()
+        app.process_table = MagicMock(sort_by="memory")
+        processes = [SimpleNamespace(pid=1, name="a", cpu_percent=1.0, memory_percent=2.0)]
+        app.store.publish("processes", processes)
+        app.update_plot(None)
+        app.store.publish("cpu", SimpleNamespace(percent=1.0))
+        app.update_plot(None)
+        app.process_table.update.assert_called_once_with(processes)
+
+        monitor = MagicMock()
+        app.process_monitor = monitor
+        app.top_processes()
+        monitor.get_top_processes.assert_called_once_with(app.process_rows, "memory")
+    finally:
+        app.on_close()
+
+
+def test_replay_drives_plots(monkeypatch, tmp_path):
+    import numpy as np
+
+    from storage.replay import ReplaySource
+
+    patch_monitors(monkeypatch)
+    monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
+    replay = ReplaySource(
+        [0.0, 1.0, 2.0],
+        {"CPU": np.array([5.0, 6.0, 7.0]), "DISK_/data": np.array([1.0, 2.0, 3.0])},
+        speed=None,
+    )
+    app = main.ResourceMonitorApp(make_root(), replay=replay)
+    try:
+        assert app.view_store is replay.store
+        for _ in range(2):
+            replay.run_once()
+            app.update_plot(None)
+        assert app.series["CPU"].tolist() == [5.0, 6.0]
+        assert [n for n in app.series if n.startswith("DISK_")] == ["DISK_/data"]
+
+        # Oś czasu to czas z nagrania, a nie chwila odtworzenia
+        assert app.x_data.tolist() == [0.0, 1.0]
+
+        app.seek_replay(2.0)
+        app.update_plot(None)
+        assert app.series["CPU"].tolist() == [7.0]
+        assert replay.store.get("cpu").wall_ns == 2 * 10**9
+    finally:
+        app.on_close()
+
+
+def test_fast_replay_plots_every_row(monkeypatch, tmp_path):
+    import numpy as np
+
+    from storage.replay import ReplaySource
+
+    patch_monitors(monkeypatch)
+    monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
+    times = [100.0 + 0.5 * i for i in range(20)]
+    replay = ReplaySource(times, {"CPU": np.arange(20.0)}, speed=1000)
+    app = main.ResourceMonitorApp(make_root(), replay=replay)
+    try:
+        replay.run()
+        # Cały przebieg odtworzony między dwoma taktami GUI
+        app.update_plot(None)
+        assert app.x_data.tolist() == times
+        assert app.series["CPU"].tolist() == list(range(20))
+    finally:
+        app.on_close()
@@ -1,17 +1,17 @@
+import dataclasses
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import config
 import main
+from monitor.registry import MonitorRegistry
 
 
 def dummy_build_gui(self) -> None:
     """Minimal GUI setup for tests."""
     self.interval_var = main.tk.StringVar(value=str(self.update_interval_ms))
     self.history_var = main.tk.StringVar(value=str(self.history_length))
-    self.ani = main.animation.FuncAnimation(
-        None, self.update_plot, interval=self.update_interval_ms
-    )
+    self.timer = SimpleNamespace(interval=self.update_interval_ms)
 
 
 def make_root():
@@ -23,26 +23,25 @@ def make_root():
     return root
 
 
-def patch_monitors(monkeypatch):
-    monkeypatch.setattr(
-        main,
-        "CPUMonitor",
-        lambda: MagicMock(get_usage=lambda: SimpleNamespace(percent=0)),
-    )
-    monkeypatch.setattr(
-        main,
-        "MemoryMonitor",
-        lambda: MagicMock(get_usage=lambda: SimpleNamespace(percent=0)),
-    )
-    monkeypatch.setattr(main, "DiskMonitor", lambda: MagicMock(get_usage=lambda: []))
-    monkeypatch.setattr(main, "GPUMonitor", lambda: MagicMock(get_usage=lambda: []))
-    monkeypatch.setattr(
-        main,
-        "NetworkMonitor",
-        lambda: MagicMock(
+def patch_monitors(monkeypatch, **monitors):
+    """Zastępuje monitory z rejestru atrapami (``monitors``: zadanie -> monitor)."""
+    fakes = {
+        "cpu": MagicMock(get_usage=lambda: SimpleNamespace(percent=0)),
+        "ram": MagicMock(get_usage=lambda: SimpleNamespace(percent=0)),
+        "disk": MagicMock(get_usage=lambda: []),
+        "gpu": MagicMock(get_usage=lambda: []),
+        "network": MagicMock(
             get_usage=lambda: SimpleNamespace(upload_kbps=0, download_kbps=0)
         ),
-    )
+        **monitors,
+    }
+    registry = MonitorRegistry()
+    for spec in main.REGISTRY.specs():
+        if spec.task in fakes:
+            monitor = fakes[spec.task]
+            spec = dataclasses.replace(spec, factory=lambda m=monitor, **_: m)
+        registry.register(spec)
+    monkeypatch.setattr(main, "REGISTRY", registry)
 
     class DummyVar:
         def __init__(self, master=None, value=""):
@@ -61,11 +60,6 @@ def test_negative_values_are_rejected(monkeypatch):
     patch_monitors(monkeypatch)
     monkeypatch.setattr(main.ResourceMonitorApp, "build_gui", dummy_build_gui)
 
-    def fake_anim(fig, func, interval):
-        return SimpleNamespace(event_source=SimpleNamespace(interval=interval))
-
-    monkeypatch.setattr(main.animation, "FuncAnimation", fake_anim)
-
     app = main.ResourceMonitorApp(make_root())
     assert app.update_interval_ms == config.DEFAULT_CONFIG["update_interval_ms"]
     assert app.history_length == config.DEFAULT_CONFIG["history_length"]
@@ -76,5 +70,5 @@ def test_negative_values_are_rejected(monkeypatch):
 
     assert app.update_interval_ms == config.DEFAULT_CONFIG["update_interval_ms"]
     assert app.history_length == config.DEFAULT_CONFIG["history_length"]
-    assert app.ani.event_source.interval == config.DEFAULT_CONFIG["update_interval_ms"]
+    assert app.timer.interval == config.DEFAULT_CONFIG["update_interval_ms"]
 
@@ -0,0 +1,54 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from monitor.batch import SeriesIndex
+from monitor.cpu_monitor import CPUUsage
+from monitor.disk_monitor import DiskUsage
+from monitor.gpu_monitor import GPUUsage
+from monitor.process_monitor import ProcessUsage
+from monitor.sampler import Snapshot
+
+
+def test_pack_fills_columns_in_index_order():
+    index = SeriesIndex(["CPU", "DISK_/", "DISK_/data", "NET_DOWN", "UNKNOWN"])
+    readings = {
+        "cpu": CPUUsage(percent=12.0),
+        "disk": [
+            DiskUsage(percent=50.0, used=1, total=2, mount="/data"),
+            DiskUsage(percent=70.0, used=1, total=2, mount="/media/usb"),
+        ],
+        "network": SimpleNamespace(upload_kbps=1.0, download_kbps=2.0),
+    }
+    batch = index.pack(readings, timestamp=3.0)
+
+    assert batch.timestamp == 3.0
+    values = batch.values.tolist()
+    assert values[0] == 12.0 and values[2] == 50.0 and values[3] == 2.0
+    # Brak odczytu i serie nieznane rejestrowi - NaN
+    assert math.isnan(values[1]) and math.isnan(values[4])
+    assert sorted(index.tasks) == ["cpu", "disk", "network"]
+    assert index.unpack(batch)["DISK_/data"] == 50.0
+
+
+def test_pack_reuses_output_row():
+    index = SeriesIndex(["CPU", "RAM"])
+    row = np.empty(len(index))
+    first = index.pack({"cpu": CPUUsage(percent=1.0)}, 0.0, out=row)
+    second = index.pack({"ram": SimpleNamespace(percent=2.0)}, 1.0, out=row)
+    assert first.values is second.values is row
+    assert math.isnan(row[0]) and row[1] == 2.0
+
+
+@pytest.mark.parametrize("usage", [
+    CPUUsage(percent=1.0),
+    GPUUsage(percent=1.0, name="RTX"),
+    ProcessUsage(pid=1, name="a", cpu_percent=1.0, memory_percent=2.0),
+    Snapshot(name="cpu", value=None, timestamp=0.0, seq=1),
+])
+def test_per_tick_records_use_slots(usage):
+    assert not hasattr(usage, "__dict__")
+    with pytest.raises(AttributeError):
+        usage.unexpected = 1
@@ -0,0 +1,71 @@
+import json
+
+from benchmarks import harness
+from benchmarks.harness import (
+    BenchResult,
+    compare,
+    format_report,
+    load_baseline,
+    measure,
+    run_benchmark,
+    save_results,
+)
+
+
+def result(name, min_ms, params=None):
+    return BenchResult(
+        name=name, group="g", params=params or {"scale": 1.0}, calls=3, items=10,
+        min_ms=min_ms, median_ms=min_ms, mean_ms=min_ms, p95_ms=min_ms,
+    )
+
+
+def test_measure_respects_minimum_calls():
+    calls = []
+    times = measure(lambda: calls.append(1), min_calls=5, min_time_s=0.0)
+    assert len(times) == len(calls) == 5
+    assert all(t >= 0 for t in times)
+
+
+def test_run_benchmark_times_only_yielded_function(monkeypatch):
+    events = []
+
+    def case(scale):
+        events.append(("setup", scale))
+        yield (lambda: events.append("call")), 7
+        events.append("cleanup")
+
+    monkeypatch.setattr(harness, "BENCHMARKS", {})
+    harness.benchmark("demo", "g", min_calls=2, min_time_s=0.0, rows=100)(case)
+    res = run_benchmark(harness.BENCHMARKS["demo"], scale=0.5)
+
+    assert events == [("setup", 0.5), "call", "call", "cleanup"]
+    assert res.calls == 2
+    assert res.items == 7
+    assert res.params == {"rows": 100, "scale": 0.5}
+
+
+def test_compare_flags_only_matching_slow_cases(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_results(str(path), [result("a", 1.0), result("b", 1.0), result("c", 1.0)], 1.0)
+    baseline = load_baseline(str(path))
+    assert json.loads(path.read_text())["meta"]["scale"] == 1.0
+
+    current = [
+        result("a", 1.2),
+        result("b", 2.0),
+        result("c", 5.0, params={"scale": 0.1}),
+        result("new", 9.0),
+    ]
+    regressions = compare(current, baseline, tolerance=0.25)
+    assert [r.name for r in regressions] == ["b"]
+    assert regressions[0].ratio == 2.0
+
+    report = format_report(current, baseline, regressions)
+    assert "+100% !" in report
+    assert "Regresje wydajności: 1" in report
+
+
+def test_compare_ignores_microsecond_noise():
+    baseline = {"fast": result("fast", 0.001).to_dict()}
+    assert compare([result("fast", 0.002)], baseline) == []
+    assert len(compare([result("fast", 0.5)], baseline)) == 1
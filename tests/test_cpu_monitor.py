@@ -1,10 +1,52 @@
+from collections import namedtuple
+
+
 def test_cpu_monitor_reports_mocked_value(monkeypatch):
     from monitor import cpu_monitor as cm
 
     # Mock psutil.cpu_percent used inside the module
     monkeypatch.setattr(cm.psutil, "cpu_percent", lambda interval=1: 42.0)
 
-    m = cm.CPUMonitor()
+    m = cm.CPUMonitor(interval=1)
     usage = m.get_usage()
     assert usage == cm.CPUUsage(percent=42.0)
 
+
+Times = namedtuple(
+    "Times", ["user", "nice", "system", "idle", "iowait", "steal", "guest"]
+)
+
+
+def test_cpu_monitor_delta_mode_reports_per_core(monkeypatch):
+    from monitor import cpu_monitor as cm
+
+    snapshots = [
+        [Times(100, 0, 50, 800, 10, 0, 0), Times(100, 0, 50, 800, 10, 0, 0)],
+        # core 0: 100 ticks, 60 user + 20 system + 10 iowait + 10 idle
+        # core 1: 100 ticks, all idle
+        [Times(160, 0, 70, 810, 20, 0, 0), Times(100, 0, 50, 900, 10, 0, 0)],
+    ]
+    monkeypatch.setattr(cm.psutil, "cpu_times", lambda percpu: snapshots.pop(0))
+
+    def fail(*_a, **_k):
+        raise AssertionError("blocking cpu_percent must not be called")
+
+    monkeypatch.setattr(cm.psutil, "cpu_percent", fail)
+
+    usage = cm.CPUMonitor().get_usage()
+    assert usage.per_core == [80.0, 0.0]
+    assert usage.percent == 40.0
+    assert usage.user == 30.0
+    assert usage.system == 10.0
+    assert usage.iowait == 5.0
+    assert usage.steal == 0.0
+
+
+def test_cpu_monitor_delta_mode_handles_idle_interval(monkeypatch):
+    from monitor import cpu_monitor as cm
+
+    same = [Times(1, 0, 1, 1, 0, 0, 0)]
+    monkeypatch.setattr(cm.psutil, "cpu_times", lambda percpu: same)
+
+    usage = cm.CPUMonitor().get_usage()
+    assert usage == cm.CPUUsage(percent=0.0, per_core=[0.0])
@@ -0,0 +1,52 @@
+from collections import namedtuple
+
+import pytest
+
+Disk = namedtuple(
+    "Disk",
+    ["read_count", "write_count", "read_bytes", "write_bytes",
+     "read_time", "write_time", "busy_time"],
+)
+
+
+def test_disk_io_monitor_reports_iops_and_latency(monkeypatch):
+    from monitor import disk_io_monitor as dm
+
+    snapshots = [
+        {"sda": Disk(100, 50, 0, 0, 1000, 500, 2000), "loop0": Disk(0, 0, 0, 0, 0, 0, 0)},
+        {
+            "sda": Disk(140, 70, 8192, 4096, 1200, 700, 2500),
+            "loop0": Disk(9, 9, 9, 9, 9, 9, 9),
+        },
+    ]
+    times = iter([0, 2_000_000_000])
+    monkeypatch.setattr(dm.psutil, "disk_io_counters", lambda perdisk: snapshots.pop(0))
+    monkeypatch.setattr(dm, "monotonic_ns", lambda: next(times))
+
+    monitor = dm.DiskIOMonitor()
+    usage = monitor.get_usage()
+
+    assert [u.name for u in usage] == ["sda"]
+    sda = usage[0]
+    assert sda.read_kbps == 4.0
+    assert sda.write_kbps == 2.0
+    assert sda.read_iops == 20.0
+    assert sda.write_iops == 10.0
+    # (200 + 200) ms / 60 operacji
+    assert sda.await_ms == pytest.approx(400 / 60)
+    # 500 ms zajętości w ciągu 2 s
+    assert sda.percent == pytest.approx(25.0)
+
+
+def test_disk_io_metrics_roundtrip():
+    from monitor.disk_io_monitor import DiskIOUsage
+    from monitor.metrics import flatten, unflatten
+
+    usage = DiskIOUsage(
+        percent=25.0, name="nvme0n1", read_kbps=4.0, write_kbps=2.0,
+        read_iops=20.0, write_iops=10.0, await_ms=1.5,
+    )
+    values = flatten("diskio", [usage])
+    assert values["IO_nvme0n1_READ_IOPS"] == 20.0
+    assert values["IO_nvme0n1_BUSY"] == 25.0
+    assert unflatten(values)["diskio"] == [usage]
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from monitor.executor import CollectionExecutor
+from monitor.sampler import Sampler
+
+
+def test_collect_runs_monitors_concurrently():
+    executor = CollectionExecutor()
+    barrier = threading.Barrier(3, timeout=2)
+
+    def task(value):
+        def run():
+            barrier.wait()  # only passes if all three run at the same time
+            return value
+        return run
+
+    try:
+        results = executor.collect({"a": task(1), "b": task(2), "c": task(3)}, timeout=2)
+    finally:
+        executor.shutdown()
+    assert results == {"a": 1, "b": 2, "c": 3}
+
+
+def test_hung_monitor_is_skipped_and_reported(caplog):
+    executor = CollectionExecutor()
+    release = threading.Event()
+
+    def hung():
+        release.wait(5)
+        return "late"
+
+    try:
+        start = time.monotonic()
+        results = executor.collect({"disk": hung, "cpu": lambda: 1.0}, timeout=0.05)
+        assert results == {"cpu": 1.0}
+        assert time.monotonic() - start < 1
+
+        with caplog.at_level("WARNING"):
+            assert executor.submit("disk", hung, timeout=0.05) is None
+        assert executor.busy("disk")
+        assert executor.skipped == {"disk": 1}
+        assert executor.timeouts == {"disk": 1}
+        assert any("disk" in r.getMessage() for r in caplog.records)
+
+        assert executor.collect({"cpu": lambda: 2.0}, timeout=1) == {"cpu": 2.0}
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_failing_monitor_is_logged(caplog):
+    executor = CollectionExecutor()
+
+    def boom():
+        raise RuntimeError("x")
+
+    with caplog.at_level("ERROR"):
+        assert executor.collect({"gpu": boom}, timeout=1) == {}
+    executor.shutdown()
+    assert not executor.busy("gpu")
+
+
+def test_sampler_with_executor_is_not_delayed_by_slow_task():
+    executor = CollectionExecutor()
+    sampler = Sampler(executor=executor)
+    release = threading.Event()
+    sampler.add("slow", lambda: release.wait(5), 0.01, timeout=0.01)
+    sampler.add("fast", lambda: time.monotonic(), 0.01)
+
+    sampler.start()
+    try:
+        first = sampler.store.seq
+        assert sampler.store.wait(first + 5, timeout=2)
+        assert sampler.store.get("slow") is None
+        assert sampler.store.latest("fast") is not None
+    finally:
+        release.set()
+        sampler.stop()
+        executor.shutdown()
+    assert executor.skipped["slow"] > 0
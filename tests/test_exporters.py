@@ -17,6 +17,17 @@ def test_cpu_exporter_writes_csv(tmp_path):
     assert rows[-1] == ["2", "30.0"]
 
 
+def test_series_exporter_labels_from_schema(tmp_path):
+    from exporter.exporters import SeriesExporter
+    out = tmp_path / "disk.csv"
+    SeriesExporter.for_series("DISK_/data").export(str(out), [0, 1], [5.0, 6.0])
+
+    with out.open() as f:
+        rows = list(csv.reader(f))
+    assert rows == [["Czas (s)", "Dysk /data (%)"], ["0", "5.0"], ["1", "6.0"]]
+    assert SeriesExporter.for_series("IO_sda_AWAIT").label == "IO_sda_AWAIT (ms)"
+
+
 def test_multi_metric_exporter_handles_ragged_data(tmp_path):
     from exporter.exporters import MultiMetricExporter
     x = [0, 1, 2]
@@ -71,3 +82,58 @@ def test_json_exporter_raises_runtime_error(tmp_path):
     with pytest.raises(RuntimeError):
         JSONExporter().export(str(invalid), [0], {"CPU": [0.0]})
 
+
+def test_json_exporter_accepts_numpy_views(tmp_path):
+    from exporter.exporters import JSONExporter
+    from monitor.ring_buffer import RingBuffer
+
+    buf = RingBuffer(2)
+    buf.extend([1.0, 2.0, 3.0])
+    out = tmp_path / "views.json"
+    JSONExporter().export(str(out), buf.view().astype(int), {"CPU": buf.view()})
+
+    with out.open() as f:
+        data = json.load(f)
+    assert data == {"x_data": [2, 3], "metrics": {"CPU": [2.0, 3.0]}}
+
+
+def test_npz_exporter_roundtrip_with_metadata(tmp_path):
+    import numpy as np
+    from exporter.exporters import NPZExporter, load_npz
+
+    x = np.arange(1000, dtype=np.int64)
+    metrics = {
+        "CPU": np.linspace(0, 100, 1000),
+        "DISK_/": np.full(1000, 42.0),
+        "GPU_RTX": np.zeros(1000),
+        "NET_UP": np.ones(1000),
+    }
+    out = tmp_path / "all.npz"
+    NPZExporter().export(str(out), x, metrics, metadata={"interval_s": 1.0})
+
+    x2, loaded, meta = load_npz(str(out))
+    assert isinstance(loaded["CPU"], np.memmap)  # bez kopiowania
+    assert x2.dtype == np.int64 and np.array_equal(x2, x)
+    assert list(loaded) == list(metrics)
+    for name, values in metrics.items():
+        assert np.array_equal(loaded[name], values)
+    assert meta["mounts"] == ["/"]
+    assert meta["gpus"] == ["RTX"]
+    assert meta["units"]["NET_UP"] == "KB/s"
+    assert meta["interval_s"] == 1.0
+    assert meta["host"]
+
+
+def test_npz_exporter_compressed_is_plain_numpy(tmp_path):
+    import numpy as np
+    from exporter.exporters import NPZExporter, load_npz
+
+    out = tmp_path / "cpu.npz"
+    NPZExporter(compress=True, dtype=np.float32).export(str(out), [0, 1], {"CPU": [1.5, 2.5]})
+
+    _, loaded, _ = load_npz(str(out))
+    assert loaded["CPU"].dtype == np.float32
+    assert loaded["CPU"].tolist() == [1.5, 2.5]
+    # Plik czyta też zwykłe ``np.load`` (bez pickle)
+    with np.load(out) as data:
+        assert data["CPU"].tolist() == [1.5, 2.5]
@@ -1,4 +1,5 @@
 import importlib
+from types import SimpleNamespace
 
 
 def test_gpu_monitor_degrades_when_unavailable(monkeypatch):
@@ -35,3 +36,176 @@ def test_gpu_monitor_gputil_backend(monkeypatch):
     usages = m.get_usage()
     assert usages == [gm.GPUUsage(name="FakeRTX", percent=50.0)]
 
+
+class FakeNVMLError(Exception):
+    pass
+
+
+class FakeNVML:
+    """Atrapa ``pynvml`` z dwiema kartami; druga nie raportuje mocy."""
+
+    NVMLError = FakeNVMLError
+    NVML_TEMPERATURE_GPU = 0
+
+    def __init__(self):
+        self.calls = {}
+        self.count = 2
+        self.lost = set()
+        self.samples = [SimpleNamespace(pid=10, timeStamp=5, smUtil=40, memUtil=1)]
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def nvmlInit(self):
+        self._count("init")
+
+    def nvmlShutdown(self):
+        self._count("shutdown")
+
+    def nvmlDeviceGetCount(self):
+        return self.count
+
+    def nvmlDeviceGetHandleByIndex(self, index):
+        self._count("handle")
+        if index in self.lost:
+            raise FakeNVMLError("GPU is lost")
+        return index
+
+    def nvmlDeviceGetName(self, handle):
+        return [b"Tesla T4", "RTX 4090", "A100"][handle]
+
+    def nvmlDeviceGetUtilizationRates(self, handle):
+        if handle in self.lost:
+            raise FakeNVMLError("GPU is lost")
+        return SimpleNamespace(gpu=[30, 75, 90][handle], memory=10)
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        return SimpleNamespace(used=512 * 2**20, total=16384 * 2**20, free=0)
+
+    def nvmlDeviceGetTemperature(self, handle, sensor):
+        return 60 + handle
+
+    def nvmlDeviceGetPowerUsage(self, handle):
+        if handle == 1:
+            raise FakeNVMLError("not supported")
+        return 70500
+
+    def nvmlDeviceGetComputeRunningProcesses(self, handle):
+        return [SimpleNamespace(pid=10, usedGpuMemory=256 * 2**20)] if handle == 0 else []
+
+    def nvmlDeviceGetGraphicsRunningProcesses(self, handle):
+        return [SimpleNamespace(pid=11, usedGpuMemory=None)] if handle == 0 else []
+
+    def nvmlDeviceGetProcessUtilization(self, handle, last_seen):
+        self.calls.setdefault("last_seen", []).append((handle, last_seen))
+        fresh = [s for s in self.samples if s.timeStamp > last_seen]
+        if not fresh:
+            raise FakeNVMLError("not found")
+        return fresh
+
+
+def test_nvml_backend_reads_with_persistent_handles():
+    import monitor.gpu_monitor as gm
+
+    nvml = FakeNVML()
+    monitor = gm.GPUMonitor(backend=gm.NVMLBackend(nvml))
+    first = monitor.get_usage()
+    second = monitor.get_usage()
+
+    assert nvml.calls["init"] == 1
+    assert nvml.calls["handle"] == 2
+    assert [u.name for u in first] == ["Tesla T4", "RTX 4090"]
+    t4, rtx = second
+    assert t4.percent == 30.0
+    assert t4.memory_used_mb == 512.0 and t4.memory_total_mb == 16384.0
+    assert t4.temperature_c == 60.0 and t4.power_w == 70.5
+    assert rtx.power_w is None
+    assert rtx.processes == []
+
+    assert first[0].processes == [
+        gm.GPUProcessUsage(pid=10, memory_mb=256.0, sm_percent=40.0),
+        gm.GPUProcessUsage(pid=11),
+    ]
+    # Kolejny odczyt pyta tylko o próbki nowsze od ostatniej
+    assert (0, 5) in nvml.calls["last_seen"]
+    assert second[0].processes[0].sm_percent is None
+
+    monitor.close()
+    assert nvml.calls["shutdown"] == 1
+
+
+def test_nvml_backend_follows_added_and_lost_gpus():
+    import monitor.gpu_monitor as gm
+
+    nvml = FakeNVML()
+    backend = gm.NVMLBackend(nvml)
+    nvml.count = 3
+    assert [u.name for u in backend.read()] == ["Tesla T4", "RTX 4090", "A100"]
+    assert nvml.calls["handle"] == 5
+
+    # Odłączona karta: odczyt pomija ją, a lista urządzeń jest odświeżana
+    nvml.lost.add(1)
+    assert [u.name for u in backend.read()] == ["Tesla T4", "A100"]
+    assert nvml.calls["handle"] == 8
+    assert [u.percent for u in backend.read()] == [30.0, 90.0]
+    assert nvml.calls["handle"] == 8
+
+    nvml.count = 1
+    assert [u.name for u in backend.read()] == ["Tesla T4"]
+
+
+def test_detect_prefers_nvml(monkeypatch):
+    import sys
+
+    import monitor.gpu_monitor as gm
+
+    monkeypatch.setitem(sys.modules, "pynvml", FakeNVML())
+    monkeypatch.setattr(gm, "GPU_BACKEND", gm._UNDETECTED)
+    monkeypatch.setattr(gm, "pynvml", None)
+    assert gm.detect_backend() == "nvml"
+    monitor = gm.GPUMonitor()
+    assert isinstance(monitor.backend, gm.NVMLBackend)
+    assert [u.percent for u in monitor.get_usage()] == [30.0, 75.0]
+
+
+def test_detect_falls_back_without_nvml_driver(monkeypatch):
+    import sys
+
+    import monitor.gpu_monitor as gm
+
+    class NoDriver(FakeNVML):
+        def nvmlInit(self):
+            raise FakeNVMLError("library not found")
+
+    monkeypatch.setitem(sys.modules, "pynvml", NoDriver())
+    monkeypatch.setitem(sys.modules, "GPUtil", SimpleNamespace(getGPUs=lambda: []))
+    monkeypatch.setattr(gm, "GPU_BACKEND", gm._UNDETECTED)
+    monkeypatch.setattr(gm, "pynvml", None)
+    monkeypatch.setattr(gm, "GPUtil", None)
+    assert gm.detect_backend() == "gputil"
+
+
+def test_gpu_list_is_a_topology_entry():
+    import monitor.gpu_monitor as gm
+    from monitor.topology import TopologyCache
+
+    class StubBackend(gm.GPUBackend):
+        def __init__(self):
+            self.names = ["A"]
+            self.refreshes = 0
+
+        def read(self):
+            return [gm.GPUUsage(name=n, percent=1.0) for n in self.names]
+
+        def refresh(self):
+            self.refreshes += 1
+
+    topology = TopologyCache(ttl_s=0)
+    backend = StubBackend()
+    monitor = gm.GPUMonitor(backend=backend, topology=topology)
+    monitor.get_usage()
+    assert topology.gpus() == ["A"] and backend.refreshes == 0
+
+    backend.names = ["A", "B"]
+    assert [u.name for u in monitor.get_usage()] == ["A", "B"]
+    assert backend.refreshes == 1
@@ -0,0 +1,51 @@
+import csv
+import json
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from conftest import ROOT
+
+
+def test_headless_run_never_imports_gui_modules(tmp_path):
+    out = tmp_path / "metrics.csv"
+    code = (
+        "import sys, headless\n"
+        f"headless.main(['--interval-ms', '50', '--duration', '0.3', '--output', {str(out)!r}])\n"
+        "gui = [m for m in ('tkinter', 'matplotlib') if m in sys.modules]\n"
+        "print(','.join(gui))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+    with out.open() as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == "Czas (s)"
+    assert "CPU" in rows[0] and "RAM" in rows[0]
+    assert len(rows) > 1
+
+
+def test_record_aligns_late_series(tmp_path):
+    import headless
+
+    collector = headless.HeadlessCollector(
+        history_length=10, output=str(tmp_path / "m.json"), fmt="json"
+    )
+    store = collector.store
+    store.publish("cpu", SimpleNamespace(percent=10.0), wall_ns=1_700_000_000_000_000_000)
+    collector.record()
+    store.publish("cpu", SimpleNamespace(percent=20.0), wall_ns=1_700_000_001_500_000_000)
+    store.publish("network", SimpleNamespace(upload_kbps=1.0, download_kbps=2.0))
+    collector.record(1_700_000_002.0)
+    collector.export()
+
+    with open(tmp_path / "m.json") as f:
+        data = json.load(f)
+    # Oś czasu w eksporcie to czas zegarowy odczytów, a nie numery taktów
+    assert data["x_data"] == [1_700_000_000.0, 1_700_000_002.0]
+    assert data["metrics"]["CPU"] == [10.0, 20.0]
+    assert data["metrics"]["NET_UP"][1] == 1.0
+    assert data["metrics"]["NET_DOWN"][0] != data["metrics"]["NET_DOWN"][0]  # NaN
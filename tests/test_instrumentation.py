@@ -0,0 +1,63 @@
+import pytest
+
+from monitor.instrumentation import INSTRUMENTATION, Instrumentation, LatencyStats
+from monitor.metrics import flatten
+from monitor.sampler import Sampler
+
+
+def test_latency_histogram_and_quantiles():
+    stats = LatencyStats("x")
+    for ms in [1] * 90 + [40] * 9 + [3000]:
+        stats.observe(ms)
+    assert stats.calls == 100
+    assert stats.mean_ms == pytest.approx((90 + 360 + 3000) / 100)
+    assert stats.quantile(0.5) == 1
+    assert stats.quantile(0.95) == 50
+    assert stats.quantile(1.0) == 3000
+    assert LatencyStats("empty").quantile(0.99) == 0.0
+
+
+def test_timed_counts_calls_and_errors():
+    inst = Instrumentation()
+    with inst.timed("render.tick"):
+        pass
+    with pytest.raises(RuntimeError):
+        with inst.timed("render.tick"):
+            raise RuntimeError("x")
+
+    stats = inst.get("render.tick")
+    assert (stats.calls, stats.errors) == (2, 1)
+    # Kopia nie zmienia się razem z rejestrem
+    inst.record("render.tick", 5.0)
+    assert stats.calls == 2
+
+
+def test_metrics_are_flat_and_publishable():
+    inst = Instrumentation()
+    inst.record("collect.cpu", 2.0)
+    inst.record("collect.cpu", 4.0, error=True)
+
+    metrics = flatten("self", inst.metrics())
+    assert metrics["SELF_collect.cpu_calls"] == 2
+    assert metrics["SELF_collect.cpu_errors"] == 1
+    assert metrics["SELF_collect.cpu_mean_ms"] == pytest.approx(3.0)
+    assert metrics["SELF_collect.cpu_max_ms"] == pytest.approx(4.0)
+
+
+def test_sampler_instruments_collectors():
+    inst = Instrumentation()
+    sampler = Sampler(instrumentation=inst)
+    sampler.add("cpu", lambda: 1.0, 1)
+    sampler.add("disk", lambda: 1 / 0, 1)
+    sampler.run_once()
+
+    assert inst.get("collect.cpu").calls == 1
+    assert inst.get("collect.disk").errors == 1
+
+
+def test_exporters_are_instrumented(tmp_path):
+    from exporter.exporters import CPUExporter
+
+    before = INSTRUMENTATION.get("export.CPUExporter").calls
+    CPUExporter().export(str(tmp_path / "cpu.csv"), [0], [1.0])
+    assert INSTRUMENTATION.get("export.CPUExporter").calls == before + 1
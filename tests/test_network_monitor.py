@@ -6,15 +6,13 @@ def test_network_monitor_reports_mocked_speeds(monkeypatch):
 
     counters = [
         types.SimpleNamespace(bytes_sent=1000, bytes_recv=2000),
-        types.SimpleNamespace(bytes_sent=1000, bytes_recv=2000),
-        types.SimpleNamespace(bytes_sent=1300, bytes_recv=2600),
         types.SimpleNamespace(bytes_sent=1300, bytes_recv=2600),
     ]
-    times = [0.0, 1.0]
+    times = [0, 1_000_000_000]
     stats = {"eth0": types.SimpleNamespace(speed=1000)}
 
     monkeypatch.setattr(nm.psutil, "net_io_counters", lambda: counters.pop(0))
-    monkeypatch.setattr(nm, "time", lambda: times.pop(0))
+    monkeypatch.setattr(nm, "monotonic_ns", lambda: times.pop(0))
     monkeypatch.setattr(nm.psutil, "net_if_stats", lambda: stats)
 
     monitor = nm.NetworkMonitor()
@@ -0,0 +1,72 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+Net = namedtuple(
+    "Net",
+    ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+     "errin", "errout", "dropin", "dropout"],
+)
+
+
+def test_nic_monitor_reports_per_interface_rates(monkeypatch):
+    from monitor import nic_monitor as nm
+    from monitor.topology import TopologyCache
+
+    snapshots = [
+        {"eth0": Net(1000, 2000, 10, 20, 0, 0, 0, 0)},
+        {
+            "eth0": Net(1000 + 2048, 2000 + 4096, 14, 30, 1, 0, 2, 0),
+            "wlan0": Net(5, 5, 1, 1, 0, 0, 0, 0),
+        },
+    ]
+    calls = []
+
+    def counters(pernic):
+        calls.append(pernic)
+        return snapshots.pop(0)
+
+    times = iter([0, 2_000_000_000])
+    speed = namedtuple("Stats", ["speed"])
+    monkeypatch.setattr(nm.psutil, "net_io_counters", counters)
+    monkeypatch.setattr(nm.psutil, "net_if_stats", lambda: {"eth0": speed(1)})
+    monkeypatch.setattr(nm, "monotonic_ns", lambda: next(times))
+
+    monitor = nm.NICMonitor(TopologyCache())
+    usage = {u.name: u for u in monitor.get_usage()}
+
+    # Jeden odczyt liczników na takt
+    assert calls == [True, True]
+    eth = usage["eth0"]
+    assert eth.upload_kbps == 1.0
+    assert eth.download_kbps == 2.0
+    assert eth.packets_sent == 2.0
+    assert eth.packets_recv == 5.0
+    assert eth.errin == 0.5
+    assert eth.dropin == 1.0
+    assert eth.percent == (3.0 / 128) * 100
+    # Nowy interfejs nie ma jeszcze poprzedniego odczytu
+    assert math.isnan(usage["wlan0"].upload_kbps)
+    assert usage["wlan0"].percent == 0.0
+
+
+def test_counter_deltas_handle_wrap_and_reset():
+    from monitor.counters import COUNTER_WRAP, CounterDeltas
+
+    Counter = namedtuple("Counter", ["value"])
+    deltas = CounterDeltas(["value"])
+    names, first, elapsed = deltas.update(
+        {"a": Counter(COUNTER_WRAP - 10), "b": Counter(2 ** 40)}, 0
+    )
+    assert names == ["a", "b"]
+    assert elapsed == 0.0
+    assert np.isnan(first).all()
+
+    names, delta, elapsed = deltas.update(
+        {"a": Counter(5), "b": Counter(100)}, 1_000_000_000
+    )
+    assert elapsed == 1.0
+    # 32-bitowy licznik przepełnił się; 64-bitowy został wyzerowany
+    assert delta[0, 0] == 15
+    assert np.isnan(delta[1, 0])
@@ -1,46 +1,111 @@
+from contextlib import contextmanager
+
 import psutil
-from types import SimpleNamespace
 
 from monitor.process_monitor import ProcessMonitor
 
 
-def test_get_top_processes_cpu(monkeypatch):
-    processes = [
-        SimpleNamespace(info={"pid": 1, "name": "a", "cpu_percent": 10.0, "memory_percent": 5.0}),
-        SimpleNamespace(info={"pid": 2, "name": "b", "cpu_percent": 50.0, "memory_percent": 15.0}),
-        SimpleNamespace(info={"pid": 3, "name": "c", "cpu_percent": 20.0, "memory_percent": 25.0}),
+class FakeProc:
+    def __init__(self, pid, name, cpu, mem, exc=None):
+        self.pid = pid
+        self._name = name
+        self._cpu = cpu
+        self._mem = mem
+        self._exc = exc
+        self.oneshots = 0
+
+    @contextmanager
+    def oneshot(self):
+        self.oneshots += 1
+        yield
+
+    def name(self):
+        if self._exc:
+            raise self._exc
+        return self._name
+
+    def cpu_percent(self, interval=None):
+        return self._cpu
+
+    def memory_percent(self):
+        return self._mem
+
+
+def patch_processes(monkeypatch, procs):
+    table = {p.pid: p for p in procs}
+    created = []
+
+    def fake_process(pid):
+        created.append(pid)
+        if pid not in table:
+            raise psutil.NoSuchProcess(pid)
+        return table[pid]
+
+    monkeypatch.setattr(psutil, "pids", lambda: list(table))
+    monkeypatch.setattr(psutil, "Process", fake_process)
+    return table, created
+
+
+def sample_procs():
+    return [
+        FakeProc(1, "a", 10.0, 5.0),
+        FakeProc(2, "b", 50.0, 15.0),
+        FakeProc(3, "c", 20.0, 25.0),
     ]
-    monkeypatch.setattr(psutil, "process_iter", lambda attrs: iter(processes))
+
+
+def test_get_top_processes_cpu(monkeypatch):
+    patch_processes(monkeypatch, sample_procs())
     monitor = ProcessMonitor()
     result = monitor.get_top_processes(top_n=2, sort_by="cpu")
     assert [p.pid for p in result] == [2, 3]
 
 
 def test_get_top_processes_memory(monkeypatch):
-    processes = [
-        SimpleNamespace(info={"pid": 1, "name": "a", "cpu_percent": 10.0, "memory_percent": 5.0}),
-        SimpleNamespace(info={"pid": 2, "name": "b", "cpu_percent": 50.0, "memory_percent": 15.0}),
-        SimpleNamespace(info={"pid": 3, "name": "c", "cpu_percent": 20.0, "memory_percent": 25.0}),
-    ]
-    monkeypatch.setattr(psutil, "process_iter", lambda attrs: iter(processes))
+    patch_processes(monkeypatch, sample_procs())
     monitor = ProcessMonitor()
     result = monitor.get_top_processes(top_n=2, sort_by="memory")
     assert [p.pid for p in result] == [3, 2]
 
 
 def test_get_top_processes_ignores_errors(monkeypatch):
-    class BadProc:
-        def __init__(self, exc):
-            self._exc = exc
-
-        @property
-        def info(self):
-            raise self._exc
-
-    good = SimpleNamespace(info={"pid": 1, "name": "a", "cpu_percent": 10.0, "memory_percent": 5.0})
-    bad = BadProc(psutil.NoSuchProcess(2))
-    monkeypatch.setattr(psutil, "process_iter", lambda attrs: iter([bad, good]))
+    good = FakeProc(1, "a", 10.0, 5.0)
+    gone = FakeProc(2, "b", 0.0, 0.0, exc=psutil.NoSuchProcess(2))
+    denied = FakeProc(3, "c", 0.0, 0.0, exc=psutil.AccessDenied(3))
+    patch_processes(monkeypatch, [gone, good, denied])
     monitor = ProcessMonitor()
     result = monitor.get_top_processes(top_n=5)
     assert [p.pid for p in result] == [1]
+    # Denied process keeps its handle, vanished one is reaped
+    assert set(monitor._procs) == {1, 3}
+
+
+def test_process_handles_are_reused_and_reaped(monkeypatch):
+    table, created = patch_processes(monkeypatch, sample_procs())
+    monitor = ProcessMonitor()
+    monitor.get_top_processes()
+    monitor.get_top_processes()
+    assert sorted(created) == [1, 2, 3]
+    assert table[1].oneshots == 2
+
+    del table[2]
+    table[4] = FakeProc(4, "d", 90.0, 1.0)
+    result = monitor.get_top_processes(top_n=1)
+    assert [p.pid for p in result] == [4]
+    assert set(monitor._procs) == {1, 3, 4}
+    assert len(monitor.last_samples) == 3
+
+
+def test_top_processes_are_built_only_for_result(monkeypatch):
+    procs = [FakeProc(pid, f"p{pid}", float(pid % 3), 1.0) for pid in range(1, 10)]
+    patch_processes(monkeypatch, procs)
+    monitor = ProcessMonitor()
+    batch = monitor.refresh()
+    assert len(batch) == 9 and batch.cpu_percent.dtype == float
 
+    top = batch.top(4)
+    assert [p.cpu_percent for p in top] == [2.0, 2.0, 2.0, 1.0]
+    # Równe wartości zachowują kolejność odczytu
+    order = batch.pids.tolist()
+    assert [p.pid for p in top[:3]] == sorted((2, 5, 8), key=order.index)
+    assert batch.top(0) == [] and len(batch.top(50)) == 9
@@ -0,0 +1,145 @@
+from gui.process_table import ProcessTable, row_values
+from monitor.process_monitor import ProcessUsage
+
+
+class FakeTree:
+    """Minimalny odpowiednik ``ttk.Treeview`` zliczający operacje."""
+
+    def __init__(self):
+        self.rows = []
+        self.values = {}
+        self.selected = []
+        self.calls = []
+
+    def get_children(self):
+        return tuple(self.rows)
+
+    def insert(self, parent, index, iid, values):
+        self.calls.append("insert")
+        self.rows.insert(index, iid)
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        self.calls.append("delete")
+        for iid in iids:
+            self.rows.remove(iid)
+            del self.values[iid]
+            if iid in self.selected:
+                self.selected.remove(iid)
+
+    def item(self, iid, values):
+        self.calls.append("item")
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.calls.append("move")
+        self.rows.remove(iid)
+        self.rows.insert(index, iid)
+
+    def selection(self):
+        return tuple(self.selected)
+
+    def selection_add(self, iid):
+        self.selected.append(iid)
+
+    def shown(self):
+        return [self.values[iid] for iid in self.rows]
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.position = None
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+def procs(*specs):
+    return [ProcessUsage(pid, name, cpu, mem) for pid, name, cpu, mem in specs]
+
+
+def test_unchanged_rows_do_not_touch_widget():
+    tree = FakeTree()
+    table = ProcessTable(tree, height=5)
+    data = procs((1, "a", 10.0, 1.0), (2, "b", 20.0, 2.0))
+    table.update(data)
+    assert tree.rows == ["2", "1"]
+    tree.calls.clear()
+
+    table.update(data)
+    assert tree.calls == []
+
+
+def test_only_changed_rows_are_applied():
+    tree = FakeTree()
+    table = ProcessTable(tree, height=5)
+    table.update(procs((1, "a", 10.0, 1.0), (2, "b", 20.0, 2.0), (3, "c", 5.0, 3.0)))
+    tree.calls.clear()
+
+    # 1 zmienia CPU (bez zmiany kolejności), 3 kończy działanie, 4 startuje
+    table.update(procs((1, "a", 12.0, 1.0), (2, "b", 20.0, 2.0), (4, "d", 1.0, 4.0)))
+    assert sorted(tree.calls) == ["delete", "insert", "item"]
+    assert tree.shown() == [row_values(p) for p in procs(
+        (2, "b", 20.0, 2.0), (1, "a", 12.0, 1.0), (4, "d", 1.0, 4.0)
+    )]
+
+
+def test_reordering_moves_rows_in_place():
+    tree = FakeTree()
+    table = ProcessTable(tree, height=5)
+    table.update(procs((1, "a", 10.0, 1.0), (2, "b", 20.0, 2.0)))
+    tree.calls.clear()
+
+    table.update(procs((1, "a", 30.0, 1.0), (2, "b", 20.0, 2.0)))
+    assert tree.rows == ["1", "2"]
+    assert "insert" not in tree.calls and "delete" not in tree.calls
+
+
+def test_virtual_window_holds_only_visible_rows():
+    tree = FakeTree()
+    scrollbar = FakeScrollbar()
+    table = ProcessTable(tree, height=10, scrollbar=scrollbar)
+    table.update(procs(*[(pid, f"p{pid}", float(pid), 0.0) for pid in range(1, 301)]))
+    assert len(tree.rows) == 10
+    assert tree.rows[0] == "300"
+    assert scrollbar.position == (0.0, 10 / 300)
+
+    table.yview("scroll", 1, "pages")
+    assert tree.rows[0] == "290"
+    table.yview("moveto", "1.0")
+    assert tree.rows == [str(pid) for pid in range(10, 0, -1)]
+    assert scrollbar.position == (290 / 300, 1.0)
+    table.scroll(-1000)
+    assert table.offset == 0
+
+
+def test_sort_uses_last_reading_and_toggles_direction():
+    tree = FakeTree()
+    table = ProcessTable(tree, height=5)
+    table.update(procs((1, "zeta", 10.0, 30.0), (2, "Alpha", 20.0, 10.0), (3, "beta", 5.0, 20.0)))
+
+    table.sort("ram")
+    assert tree.rows == ["1", "3", "2"]
+    assert table.sort_by == "memory"
+    table.sort("ram")
+    assert tree.rows == ["2", "3", "1"]
+    table.sort("name")
+    assert tree.rows == ["2", "3", "1"]
+    assert table.sort_by == "cpu"
+
+
+def test_selection_survives_scrolling():
+    tree = FakeTree()
+    table = ProcessTable(tree, height=2)
+    table.update(procs(*[(pid, f"p{pid}", float(pid), 0.0) for pid in range(1, 7)]))
+    tree.selected = ["6"]
+    table.on_select()
+
+    table.scroll(4)
+    assert "6" not in tree.rows
+    table.scroll(-4)
+    assert tree.selection() == ("6",)
+
+    # Zakończony proces znika z zaznaczenia
+    table.update(procs((1, "p1", 1.0, 0.0)))
+    assert table.selected == set()
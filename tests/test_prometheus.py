@@ -0,0 +1,101 @@
+import json
+import math
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from exporter.prometheus import MetricsServer, render_prometheus
+from monitor.sampler import SnapshotStore
+
+
+def test_render_prometheus_text_format():
+    body = render_prometheus({
+        "CPU": 12.5,
+        "DISK_/mnt/\"x\"": 50.0,
+        "NET_UP": 1.0,
+        "NET_DOWN": math.nan,
+        "SELF_collect.cpu_calls": 3,
+        "NIC_eth0_PKT_SENT": 4.0,
+        "IO_sda_READ_IOPS": 20.0,
+    }).decode()
+    lines = body.splitlines()
+    assert "# TYPE resource_monitor_cpu_percent gauge" in lines
+    assert "resource_monitor_cpu_percent 12.5" in lines
+    assert 'resource_monitor_disk_percent{mount="/mnt/\\"x\\""} 50.0' in lines
+    assert 'resource_monitor_network_kbps{direction="down"} NaN' in lines
+    assert "# TYPE resource_monitor_self_calls counter" in lines
+    assert 'resource_monitor_self_calls{operation="collect.cpu"} 3.0' in lines
+    assert 'resource_monitor_nic_pkt_sent{nic="eth0"} 4.0' in lines
+    assert 'resource_monitor_disk_io_read_iops{disk="sda"} 20.0' in lines
+    assert body.endswith("\n")
+
+
+def _get(server, path):
+    host, port = server.address
+    with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5) as resp:
+        return resp.headers, resp.read()
+
+
+def test_metrics_body_is_rendered_once_per_tick():
+    store = SnapshotStore()
+    store.publish("cpu", SimpleNamespace(percent=10.0))
+    server = MetricsServer(store, port=0)
+    server.start()
+    try:
+        for _ in range(5):
+            headers, body = _get(server, "/metrics")
+        assert server.renders == 1
+        assert headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert b"resource_monitor_cpu_percent 10.0" in body
+
+        store.publish("cpu", SimpleNamespace(percent=20.0))
+        assert server.refresh() is True
+        assert server.refresh() is False
+        assert b"resource_monitor_cpu_percent 20.0" in _get(server, "/metrics")[1]
+        assert server.renders == 2
+
+        with pytest.raises(urllib.error.HTTPError) as err:
+            _get(server, "/api/history")
+        assert err.value.code == 404
+    finally:
+        server.stop()
+
+
+def test_history_endpoint_serves_json_ranges():
+    def history(names, start, end, max_points):
+        t = np.arange(10.0)
+        mask = (t >= (start or 0)) & (t <= (end if end is not None else 9))
+        values = np.where(t == 5, np.nan, t * 2)
+        return t[mask], {name: values[mask] for name in names or ["CPU"]}
+
+    server = MetricsServer(SnapshotStore(), port=0, history=history)
+    server.start()
+    try:
+        _, body = _get(server, "/api/history?series=CPU,RAM&start=4&end=6")
+        data = json.loads(body)
+        assert data["t"] == [4.0, 5.0, 6.0]
+        assert data["series"]["RAM"] == [8.0, None, 12.0]
+
+        with pytest.raises(urllib.error.HTTPError) as err:
+            _get(server, "/api/history?start=abc")
+        assert err.value.code == 400
+    finally:
+        server.stop()
+
+
+def test_headless_history_frame_from_memory():
+    import headless
+
+    collector = headless.HeadlessCollector(history_length=10)
+    for t, value in ((100, 1.0), (101, 2.0), (102, 3.0)):
+        collector.store.publish("cpu", SimpleNamespace(percent=value), wall_ns=t * 10**9)
+        collector.record()
+
+    t, series = collector.history_frame(["CPU"], start=101.0)
+    assert t.tolist() == [101.0, 102.0]
+    assert series["CPU"].tolist() == [2.0, 3.0]
+    t, _ = collector.history_frame(max_points=2)
+    assert t.tolist() == [100.0, 102.0]
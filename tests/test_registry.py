@@ -0,0 +1,110 @@
+import math
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+
+from exporter.prometheus import render_prometheus
+from monitor import registry as registry_module
+from monitor.base_monitor import BaseMonitor, BaseUsage, SeriesSchema
+from monitor.disk_io_monitor import DiskIOUsage
+from monitor.registry import REGISTRY, MonitorRegistry, MonitorSpec
+
+
+@dataclass
+class UPSUsage(BaseUsage):
+    name: str
+    load_w: float
+
+
+class UPSMonitor(BaseMonitor):
+    TASK = "ups"
+    USAGE = UPSUsage
+    SERIES = (
+        SeriesSchema("UPS_{key}", key="name", label="ups", family="ups_charge_percent"),
+        SeriesSchema(
+            "UPS_{key}_LOAD", field="load_w", key="name", unit="W",
+            range=(0.0, None), label="ups", family="ups_load_watts",
+            description="Obciążenie zasilacza w W.",
+        ),
+    )
+
+    def get_usage(self):
+        return [UPSUsage(percent=80.0, name="apc", load_w=120.0)]
+
+
+def test_schema_match_extracts_device():
+    schema = SeriesSchema("IO_{key}_READ", key="name")
+    assert schema.series_name("sda") == "IO_sda_READ"
+    assert schema.match("IO_sda_READ") == "sda"
+    assert schema.match("IO_sda_READ_IOPS") is None
+    assert schema.match("IO__READ") is None
+    assert SeriesSchema("CPU").match("CPU") == ""
+
+
+def test_describe_prefers_most_specific_schema():
+    match = REGISTRY.describe("IO_nvme0n1_READ_IOPS")
+    assert (match.spec.task, match.key, match.schema.field) == ("diskio", "nvme0n1", "read_iops")
+    assert REGISTRY.describe("DISK_/data").title == "Dysk /data"
+    assert REGISTRY.describe("UNKNOWN") is None
+
+
+def test_flatten_unflatten_round_trip():
+    values = REGISTRY.flatten("diskio", [DiskIOUsage(
+        percent=5.0, name="sda", read_kbps=1.0, write_kbps=2.0,
+        read_iops=3.0, write_iops=4.0, await_ms=0.5,
+    )])
+    values.update(REGISTRY.flatten("network", SimpleNamespace(upload_kbps=1.5, download_kbps=2.5)))
+
+    usages = REGISTRY.unflatten(values)
+    assert usages["diskio"][0].read_iops == 3.0
+    assert usages["diskio"][0].percent == 5.0
+    assert usages["network"].download_kbps == 2.5
+    assert math.isnan(usages["network"].percent)
+    assert REGISTRY.flatten("diskio", usages["diskio"]) == {
+        k: v for k, v in values.items() if k.startswith("IO_")
+    }
+
+
+def test_third_party_monitor_flows_through_schema():
+    registry = MonitorRegistry()
+    registry.register(UPSMonitor)
+    monitor = registry.create("ups")
+    values = registry.flatten("ups", monitor.get_usage())
+    assert values == {"UPS_apc": 80.0, "UPS_apc_LOAD": 120.0}
+    assert registry.describe("UPS_apc_LOAD").schema.unit == "W"
+    assert registry.unflatten(values)["ups"] == monitor.get_usage()
+
+    with pytest.raises(ValueError):
+        registry.register(UPSMonitor)
+
+
+def test_entry_point_monitors_are_discovered(monkeypatch):
+    registry = MonitorRegistry()
+    broken = SimpleNamespace(name="broken", load=lambda: object())
+    ups = SimpleNamespace(name="ups", load=lambda: UPSMonitor)
+    spec = MonitorSpec("custom", factory=dict, flat_prefix="CUSTOM_")
+    custom = SimpleNamespace(name="custom", load=lambda: spec)
+    groups = {registry_module.ENTRY_POINT_GROUP: [broken, ups, custom]}
+    monkeypatch.setattr(
+        "importlib.metadata.entry_points",
+        lambda: SimpleNamespace(select=lambda group: groups.get(group, [])),
+    )
+
+    loaded = registry.load_entry_points()
+    assert [s.task for s in loaded] == ["ups", "custom"]
+    assert registry.load_entry_points() == []
+    assert registry.unflatten({"CUSTOM_x": 1.0}) == {"custom": {"CUSTOM_x": 1.0}}
+
+
+def test_prometheus_names_follow_schema(monkeypatch):
+    registry = MonitorRegistry()
+    for spec in REGISTRY.specs():
+        registry.register(spec)
+    registry.register(UPSMonitor)
+    monkeypatch.setattr("exporter.prometheus.REGISTRY", registry)
+
+    lines = render_prometheus({"UPS_apc_LOAD": 120.0, "CPU": 1.0}).decode().splitlines()
+    assert "# HELP resource_monitor_ups_load_watts Obciążenie zasilacza w W." in lines
+    assert 'resource_monitor_ups_load_watts{ups="apc"} 120.0' in lines
+    assert "resource_monitor_cpu_percent 1.0" in lines
@@ -0,0 +1,79 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from gui.renderer import BlitRenderer, make_fill  # noqa: E402
+
+
+def make_renderer(n_axes=2, autoscale=False):
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    renderer = BlitRenderer(canvas, budget_ms=1000)
+    for i in range(n_axes):
+        ax = fig.add_subplot(1, n_axes, i + 1)
+        ax.set_ylim(0, 100)
+        line, = ax.plot([], [])
+        renderer.add(f"S{i}", line, make_fill(ax, "blue"), autoscale=autoscale)
+    renderer.set_xlim(-9, 0)
+    return fig, canvas, renderer
+
+
+def test_only_first_frame_is_full_redraw():
+    fig, canvas, renderer = make_renderer()
+    draws = []
+    canvas.mpl_connect("draw_event", lambda _e: draws.append(1))
+
+    x = np.arange(-9.0, 1.0)
+    for step in range(5):
+        for label in renderer.series:
+            renderer.update(label, x, np.full(10, float(step)))
+        renderer.draw()
+
+    assert len(draws) == 1
+    assert renderer.stats.frames == 5
+    assert renderer.stats.full_redraws == 1
+    assert renderer.stats.mean_ms > 0
+
+
+def test_fill_is_updated_in_place():
+    fig, canvas, renderer = make_renderer(n_axes=1)
+    series = renderer.series["S0"]
+    fill_before = series.fill
+
+    x = np.arange(3.0)
+    renderer.update("S0", x, np.array([10.0, np.nan, 30.0]))
+    buffer = series.verts
+    renderer.update("S0", x, np.array([1.0, 2.0, 3.0]))
+
+    assert series.fill is fill_before
+    assert series.fill in fill_before.axes.collections
+    assert series.verts is buffer
+    path = series.fill.get_paths()[0]
+    assert np.shares_memory(path.vertices, buffer)
+    assert path.vertices[:, 1].tolist() == [0.0, 1.0, 2.0, 3.0, 0.0, 0.0]
+
+    renderer.update("S0", x, np.array([10.0, np.nan, 30.0]))
+    assert path.vertices[2, 1] == 0.0
+
+
+def test_axis_change_forces_full_redraw():
+    fig, canvas, renderer = make_renderer(n_axes=1, autoscale=True)
+    x = np.arange(2.0)
+    renderer.update("S0", x, np.array([1.0, 2.0]))
+    renderer.draw()
+    renderer.update("S0", x, np.array([1.0, 2.0]))
+    renderer.draw()
+    assert renderer.stats.full_redraws == 1
+
+    renderer.update("S0", x, np.array([1.0, 340.0]))
+    renderer.draw()
+    assert renderer.stats.full_redraws == 2
+    assert renderer.series["S0"].line.axes.get_ylim() == (0.0, 500.0)
+
+    renderer.set_xlim(-20, 0)
+    renderer.draw()
+    assert renderer.stats.full_redraws == 3
@@ -0,0 +1,118 @@
+import json
+import math
+
+import numpy as np
+import pytest
+
+from exporter.exporters import JSONExporter, MultiMetricExporter, NPZExporter
+from exporter.streaming import open_stream
+from storage.replay import ReplaySource, load_recording, parse_speed
+from storage.rollup import TieredStore
+
+X = [0.0, 1.0, 2.0]
+METRICS = {
+    "CPU": [10.0, 20.0, 30.0],
+    "DISK_/": [50.0, math.nan, 52.0],
+    "NET_UP": [1.0, 2.0, 3.0],
+}
+
+
+def _assert_recording(x, metrics):
+    assert np.array_equal(x, X)
+    assert list(metrics) == list(METRICS)
+    for name, values in METRICS.items():
+        np.testing.assert_array_equal(metrics[name], values)
+
+
+@pytest.mark.parametrize(
+    "suffix, exporter",
+    [(".csv", MultiMetricExporter), (".json", JSONExporter), (".npz", NPZExporter)],
+)
+def test_load_recording_reads_exports(tmp_path, suffix, exporter):
+    path = tmp_path / f"rec{suffix}"
+    exporter().export(str(path), X, METRICS)
+    _assert_recording(*load_recording(path))
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_load_recording_reads_streams(tmp_path, suffix):
+    path = tmp_path / f"rec{suffix}"
+    with open_stream(str(path)) as stream:
+        for i, t in enumerate(X):
+            stream.write(t, {name: values[i] for name, values in METRICS.items()})
+    _assert_recording(*load_recording(path))
+
+
+def test_load_recording_reads_store_directory(tmp_path):
+    tsdb = TieredStore(tmp_path / "tsdb")
+    for name, values in METRICS.items():
+        for t, v in zip(X, values):
+            if not math.isnan(v):
+                tsdb.append(name, t, v)
+    tsdb.close()
+
+    x, metrics = load_recording(tmp_path / "tsdb")
+    assert np.array_equal(x, X)
+    np.testing.assert_array_equal(metrics["DISK_/"], METRICS["DISK_/"])
+
+
+def test_replay_publishes_rows_and_seeks():
+    source = ReplaySource(X, {k: np.array(v) for k, v in METRICS.items()}, speed=None)
+    assert source.run_once()
+    assert source.store.latest("cpu").percent == 10.0
+    assert source.store.latest("disk")[0].mount == "/"
+    assert source.store.latest("network").upload_kbps == 1.0
+
+    source.seek(2.5)
+    assert source.time == 2.0
+    assert source.store.latest("cpu").percent == 30.0
+    assert not source.run_once()
+    assert source.finished
+
+    source.seek(1.0)
+    seen = []
+    source.run(on_row=seen.append)
+    assert seen == [2.0]
+
+
+def test_replay_paces_rows_by_speed(monkeypatch):
+    from storage import replay as rp
+
+    clock = [100.0]
+    waits = []
+    monkeypatch.setattr(rp, "monotonic", lambda: clock[0])
+
+    source = ReplaySource([0.0, 10.0, 20.0], {"CPU": np.zeros(3)}, speed=10.0)
+
+    def wait(delay):
+        waits.append(delay)
+        clock[0] += delay
+        return False
+
+    monkeypatch.setattr(source._wake, "wait", wait)
+    source.run()
+    # 10 s nagrania co 1 s rzeczywisty przy prędkości 10x
+    assert waits == pytest.approx([1.0, 1.0])
+    assert source.finished
+
+
+def test_parse_speed():
+    assert parse_speed("10x") == 10.0
+    assert parse_speed("1") == 1.0
+    assert parse_speed("max") is None
+    with pytest.raises(ValueError):
+        parse_speed("0")
+
+
+def test_headless_replay_converts_recording(tmp_path):
+    from headless import HeadlessCollector
+
+    source = ReplaySource(X, {k: np.array(v) for k, v in METRICS.items()}, speed=None)
+    output = tmp_path / "out.json"
+    collector = HeadlessCollector(output=str(output), fmt="json", replay=source)
+    collector.run()
+
+    assert collector.t_data.tolist() == X
+    with open(output) as file:
+        data = json.load(file)
+    assert data["metrics"]["CPU"] == METRICS["CPU"]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from monitor.ring_buffer import RingBuffer
+
+
+def test_append_keeps_newest_samples_in_order():
+    buf = RingBuffer(3)
+    for value in [1.0, 2.0, 3.0, 4.0, 5.0]:
+        buf.append(value)
+
+    assert len(buf) == 3
+    assert buf.tolist() == [3.0, 4.0, 5.0]
+    assert buf.last == 5.0
+    assert buf[0] == 3.0
+
+
+def test_view_is_contiguous_zero_copy_and_read_only():
+    buf = RingBuffer(4)
+    buf.extend([1, 2, 3, 4, 5, 6])
+
+    view = buf.view()
+    assert view.dtype == np.float64
+    assert view.flags.c_contiguous
+    assert np.shares_memory(view, buf._data)
+    with pytest.raises(ValueError):
+        view[0] = 0.0
+
+
+def test_extend_larger_than_capacity():
+    buf = RingBuffer(3)
+    buf.extend(range(10))
+    assert buf.tolist() == [7.0, 8.0, 9.0]
+    buf.append(10)
+    assert buf.tolist() == [8.0, 9.0, 10.0]
+
+
+def test_resize_keeps_newest_samples():
+    buf = RingBuffer(5, dtype=np.int64)
+    buf.extend(range(5))
+
+    buf.resize(2)
+    assert buf.tolist() == [3, 4]
+    buf.resize(4)
+    buf.append(5)
+    assert buf.tolist() == [3, 4, 5]
+    assert buf.capacity == 4
+
+
+def test_empty_buffer():
+    buf = RingBuffer(2)
+    assert len(buf) == 0
+    assert buf.tolist() == []
+    with pytest.raises(IndexError):
+        buf.last
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_row_samples_with_column_views():
+    buf = RingBuffer(3, width=2)
+    cpu = buf.column(0)
+    for i in range(5):
+        buf.append([i, 10 * i])
+
+    assert buf.view().shape == (3, 2)
+    assert cpu.tolist() == [2.0, 3.0, 4.0]
+    assert buf.column(1).last == 40.0
+    assert np.shares_memory(cpu.view(), buf._data)
+
+    buf.resize(2)
+    assert len(cpu) == 2 and cpu.tolist() == [3.0, 4.0]
+    with pytest.raises(ValueError):
+        RingBuffer(3).column(0)
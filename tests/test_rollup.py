@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+
+from storage.rollup import (
+    RollupAggregator, RollupHistory, TieredStore, select_tier,
+)
+
+
+def test_aggregator_emits_closed_buckets():
+    agg = RollupAggregator(10)
+    assert agg.add(0, 1.0) is None
+    assert agg.add(5, 3.0) is None
+    assert agg.add(7, math.nan) is None
+    assert agg.add(9, 2.0) is None
+    assert agg.add(10, 8.0) == (0, 1.0, 3.0, 2.0, 2.0)
+    assert agg.current() == (10, 8.0, 8.0, 8.0, 8.0)
+
+
+def test_select_tier_fits_window():
+    tiers = (10, 60, 3600)
+    assert select_tier(tiers, 600, 1500) is None
+    assert select_tier(tiers, 86_400, 1500) == 60
+    assert select_tier(tiers, 86_400, 1440) == 60
+    assert select_tier(tiers, 30 * 86_400, 1000) == 3600
+
+
+def test_rollup_history_keeps_window():
+    history = RollupHistory(window_s=30, tiers=(10,))
+    for t in range(100):
+        history.add(float(t), float(t))
+    t, avg = history.view(10)
+    assert t.tolist() == [50.0, 60.0, 70.0, 80.0]
+    assert avg.tolist() == [54.5, 64.5, 74.5, 84.5]
+    assert history.view(10, "max")[1][-1] == 89.0
+
+
+def test_tiered_store_picks_tier_for_window(tmp_path):
+    store = TieredStore(tmp_path, tiers=(10, 60))
+    for t in range(3600):
+        store.append("CPU", float(t), float(t % 60))
+
+    t, v = store.query("CPU")
+    assert len(t) == 3600
+    t, v = store.query("CPU", max_points=100)
+    assert len(t) == 59  # last minute bucket is still open
+    assert np.allclose(v, 29.5)
+    t, v = store.query("CPU", 0, 599, max_points=100)
+    assert len(t) == 60
+    records = store.query_records("CPU", 10, 0, 10)
+    assert records["min"].tolist() == [0.0, 10.0]
+    assert records["last"].tolist() == [9.0, 19.0]
+
+    store.close()
+    reopened = TieredStore(tmp_path, tiers=(10, 60))
+    assert reopened.series() == ["CPU"]
+    # Otwarty przedział minutowy został zapisany przy zamknięciu
+    assert len(reopened.query("CPU", max_points=100)[0]) == 60
+
+
+def test_open_bucket_survives_close_and_reopen(tmp_path):
+    store = TieredStore(tmp_path, tiers=(10,))
+    for t in range(5):
+        store.append("CPU", float(t), float(t))
+    store.close()
+    partial = TieredStore(tmp_path, tiers=(10,)).query_records("CPU", 10)
+    assert partial[["t", "min", "max", "last"]].tolist() == [(0.0, 0.0, 4.0, 4.0)]
+
+    reopened = TieredStore(tmp_path, tiers=(10,))
+    for t in range(5, 13):
+        reopened.append("CPU", float(t), float(t))
+    reopened.flush()
+    records = reopened.query_records("CPU", 10)
+    # Przedział sprzed zamknięcia uzupełniony próbkami po otwarciu - jeden rekord
+    assert records["t"].tolist() == [0.0, 10.0]
+    assert records["min"].tolist() == [0.0, 10.0]
+    assert records["max"].tolist() == [9.0, 12.0]
+    assert records["avg"].tolist() == [4.5, 11.0]
+
+
+def test_frame_aligns_series(tmp_path):
+    store = TieredStore(tmp_path, tiers=(10,))
+    store.append("CPU", 1.0, 1.0)
+    store.append("CPU", 2.0, 2.0)
+    store.append("RAM", 2.0, 50.0)
+
+    x, columns = store.frame()
+    assert x.tolist() == [1.0, 2.0]
+    assert columns["CPU"].tolist() == [1.0, 2.0]
+    assert math.isnan(columns["RAM"][0])
+    assert columns["RAM"][1] == 50.0
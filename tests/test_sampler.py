@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from monitor import sampler as sampler_module
+from monitor.instrumentation import Instrumentation
+from monitor.sampler import Sampler, SnapshotStore
+
+
+def test_store_publishes_latest_value():
+    store = SnapshotStore()
+    assert store.latest("cpu") is None
+    assert store.latest("cpu", 0.0) == 0.0
+
+    store.publish("cpu", 10.0)
+    snap = store.publish("cpu", 20.0)
+
+    assert store.latest("cpu") == 20.0
+    assert store.get("cpu") is snap
+    assert store.seq == 2
+    assert set(store.snapshot()) == {"cpu"}
+    assert snap.mono_ns > 0 and snap.timestamp == snap.mono_ns / 1e9
+    assert abs(snap.wall_ns / 1e9 - time.time()) < 60
+    assert store.publish("cpu", 30.0, wall_ns=5).wall_ns == 5
+
+
+def test_store_notifies_subscribers_and_survives_errors():
+    store = SnapshotStore()
+    seen = []
+
+    def bad(_snap):
+        raise RuntimeError("x")
+
+    store.subscribe(bad)
+    store.subscribe(lambda snap: seen.append((snap.name, snap.value)))
+    store.publish("ram", 50.0)
+    store.unsubscribe(bad)
+    store.publish("ram", 60.0)
+
+    assert seen == [("ram", 50.0), ("ram", 60.0)]
+
+
+def test_run_once_publishes_every_task():
+    sampler = Sampler()
+    sampler.add("cpu", lambda: 1.0, 1.0)
+    sampler.add("ram", lambda: 2.0, 5.0)
+    sampler.run_once()
+
+    assert sampler.store.latest("cpu") == 1.0
+    assert sampler.store.latest("ram") == 2.0
+
+
+def test_failing_task_is_skipped(caplog):
+    sampler = Sampler()
+
+    def boom():
+        raise RuntimeError("x")
+
+    sampler.add("bad", boom, 1.0)
+    sampler.add("ok", lambda: 3.0, 1.0)
+    with caplog.at_level("ERROR"):
+        sampler.run_once()
+
+    assert sampler.store.get("bad") is None
+    assert sampler.store.latest("ok") == 3.0
+
+
+def test_background_thread_samples_on_own_schedule():
+    sampler = Sampler()
+    fast = []
+    slow = []
+    done = threading.Event()
+
+    def fast_task():
+        fast.append(1)
+        if len(fast) >= 5:
+            done.set()
+        return len(fast)
+
+    sampler.add("fast", fast_task, 0.01)
+    sampler.add("slow", lambda: slow.append(1), 10.0)
+    sampler.start()
+    try:
+        assert done.wait(2.0)
+    finally:
+        sampler.stop()
+
+    assert not sampler.running
+    assert len(slow) == 1
+    assert sampler.store.latest("fast") >= 5
+
+
+def test_invalid_interval_is_rejected():
+    sampler = Sampler()
+    with pytest.raises(ValueError):
+        sampler.add("cpu", lambda: 0.0, 0)
+
+
+def test_ticks_follow_absolute_deadlines(monkeypatch):
+    clock = [0]
+    monkeypatch.setattr(sampler_module, "monotonic_ns", lambda: clock[0])
+    inst = Instrumentation()
+    sampler = Sampler(instrumentation=inst)
+
+    def slow():
+        clock[0] += 2_000_000_000  # odczyt trwa dwa interwały
+        return 1.0
+
+    sampler.add("cpu", lambda: 1.0, 1.0)
+    task = sampler._tasks["cpu"]
+
+    clock[0] = 50_000_000
+    sampler._tick(task)
+    # Termin liczony od poprzedniego terminu - 50 ms opóźnienia nie przesuwa siatki
+    assert task.next_run == 1_000_000_000
+
+    clock[0] = 1_300_000_000
+    task.func = slow
+    sampler._tick(task)
+    assert task.next_run == 4_000_000_000
+
+    stats = sampler.tick_stats()["cpu"]
+    assert (stats.ticks, stats.late, stats.missed) == (2, 1, 2)
+    assert stats.max_late_ms == pytest.approx(300.0)
+    assert stats is not task.stats
+    assert inst.snapshot()["schedule.cpu"].errors == 1
@@ -0,0 +1,72 @@
+import json
+import subprocess
+import sys
+import textwrap
+
+from conftest import ROOT
+
+# Moduły ładowane dopiero przy pierwszym użyciu (wykresy, eksport, GPU...)
+DEFERRED = (
+    "matplotlib",
+    "GPUtil",
+    "pynvml",
+    "wmi",
+    "gui.renderer",
+    "exporter.exporters",
+    "agent.collector",
+    "storage.replay",
+    "urllib.request",
+)
+
+# Budżet od początku importu ``main`` do pierwszego odczytu monitorów
+STARTUP_BUDGET_S = 0.5
+
+
+def run_python(code: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_main_import_defers_optional_modules():
+    loaded = run_python(
+        f"""
+        import json, sys
+        import main
+        print(json.dumps({{"loaded": [m for m in {DEFERRED!r} if m in sys.modules]}}))
+        """
+    )["loaded"]
+    assert loaded == []
+
+
+def test_cold_start_to_first_sample_within_budget():
+    # Najlepszy z kilku zimnych startów - pojedynczy pomiar na obciążonej
+    # maszynie bywa kilkukrotnie dłuższy
+    code = """
+        import json
+        from time import perf_counter
+
+        start = perf_counter()
+        import main
+
+        store = main.SnapshotStore()
+        sampler = main.Sampler(store, main.CollectionExecutor())
+        topology = main.TopologyCache()
+        for task in ("cpu", "ram", "disk", "network"):
+            monitor = main.REGISTRY.create(task, topology=topology)
+            sampler.add(task, monitor.get_usage, 1.0)
+        sampler.start()
+        store.wait(0, timeout=10)
+        elapsed = perf_counter() - start
+        sampler.stop()
+        print(json.dumps({"elapsed": elapsed, "seq": store.seq}))
+    """
+    runs = [run_python(code) for _ in range(3)]
+    assert all(run["seq"] > 0 for run in runs)
+    assert min(run["elapsed"] for run in runs) < STARTUP_BUDGET_S
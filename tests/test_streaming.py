@@ -0,0 +1,69 @@
+import csv
+import json
+import math
+
+
+def test_csv_stream_appends_rows_and_resumes(tmp_path):
+    from exporter.streaming import CSVStreamExporter
+
+    out = tmp_path / "all.csv"
+    with CSVStreamExporter(str(out)) as sink:
+        sink.write(0, {"CPU": 1.0, "RAM": 50.0})
+        sink.write(1, {"CPU": 2.0, "RAM": math.nan, "GPU_x": 3.0})
+
+    # Ponowne otwarcie kontynuuje plik bez drugiego nagłówka
+    with CSVStreamExporter(str(out)) as sink:
+        sink.write(2, {"RAM": 52.0})
+
+    with out.open() as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ["Czas (s)", "CPU", "RAM"],
+        ["0", "1.0", "50.0"],
+        ["1", "2.0", ""],
+        ["2", "", "52.0"],
+    ]
+
+
+def test_jsonl_stream_writes_one_object_per_line(tmp_path):
+    from exporter.streaming import open_stream
+
+    out = tmp_path / "m.jsonl"
+    sink = open_stream(str(out), flush_every_s=0)
+    sink.write(10.5, {"CPU": 1.0, "NET_UP": math.nan})
+    # flush_every_s=0 - dane są na dysku bez zamykania pliku
+    assert json.loads(out.read_text()) == {"t": 10.5, "CPU": 1.0, "NET_UP": None}
+    sink.write(11.5, {"CPU": 2.0})
+    sink.close()
+
+    lines = out.read_text().splitlines()
+    assert [json.loads(line)["CPU"] for line in lines] == [1.0, 2.0]
+    assert sink.rows == 2
+
+
+def test_stream_buffers_until_flush(tmp_path):
+    from exporter.streaming import CSVStreamExporter
+
+    out = tmp_path / "cpu.csv"
+    sink = CSVStreamExporter(str(out), columns=["CPU"], flush_every_s=3600, fsync=True)
+    sink.write(0, {"CPU": 1.0})
+    assert out.read_text() == ""
+    sink.flush()
+    assert out.read_text().splitlines()[-1] == "0,1.0"
+    sink.close()
+
+
+def test_headless_streams_each_record(tmp_path):
+    from types import SimpleNamespace
+
+    import headless
+
+    out = tmp_path / "stream.jsonl"
+    collector = headless.HeadlessCollector(stream=str(out))
+    collector.store.publish("cpu", SimpleNamespace(percent=10.0))
+    collector.record()
+    collector.record()
+    collector.stream.close()
+
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["CPU"] for r in rows] == [10.0, 10.0]
@@ -0,0 +1,120 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from monitor.sampler import SnapshotStore
+from storage.timeseries_store import StoreRecorder, TimeSeriesStore
+
+
+def test_append_and_range_query(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    for t in range(10):
+        assert store.append("CPU", float(t), t * 10.0)
+
+    t, v = store.query("CPU", 3, 5)
+    assert t.tolist() == [3.0, 4.0, 5.0]
+    assert v.tolist() == [30.0, 40.0, 50.0]
+    assert store.query("CPU")[0].size == 10
+    assert store.series() == ["CPU"]
+    with pytest.raises(KeyError):
+        store.query("RAM")
+
+
+def test_single_segment_query_is_memory_mapped(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    store.append("CPU", 1.0, 1.0)
+    store.append("CPU", 2.0, 2.0)
+    t, v = store.query("CPU")
+    assert isinstance(t.base, np.memmap) or isinstance(t, np.memmap)
+
+
+def test_rotation_and_reopen(tmp_path):
+    store = TimeSeriesStore(tmp_path, segment_records=4)
+    for t in range(10):
+        store.append("DISK_/", float(t), float(t))
+    store.close()
+    assert len(store.segments("DISK_/")) == 3
+
+    reopened = TimeSeriesStore(tmp_path, segment_records=4)
+    assert reopened.series() == ["DISK_/"]
+    reopened.append("DISK_/", 10.0, 10.0)
+    reopened.append("DISK_/", 9.5, 0.0)  # out of order -> skipped
+    t, v = reopened.query("DISK_/", 2.5, 10)
+    assert t.tolist() == [3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    assert len(reopened.segments("DISK_/")) == 3
+
+
+def test_truncated_record_is_recovered(tmp_path):
+    store = TimeSeriesStore(tmp_path)
+    store.append("RAM", 1.0, 50.0)
+    store.close()
+    segment = store.segments("RAM")[0].path
+    with segment.open("ab") as f:
+        f.write(b"\x00\x01\x02")
+
+    t, v = TimeSeriesStore(tmp_path).query("RAM")
+    assert v.tolist() == [50.0]
+
+
+def test_retention_removes_old_segments(tmp_path):
+    store = TimeSeriesStore(tmp_path, segment_records=2, retention_s=5)
+    for t in range(10):
+        store.append("CPU", float(t), 0.0)
+
+    t, _ = store.query("CPU")
+    assert t[0] >= 2.0
+    assert t[-1] == 9.0
+    assert store.apply_retention(now=100.0) > 0
+    assert len(store.segments("CPU")) == 1
+
+
+def test_recorder_writes_published_snapshots(tmp_path):
+    snapshots = SnapshotStore()
+    recorder = StoreRecorder(TimeSeriesStore(tmp_path), snapshots)
+    snapshots.publish("cpu", SimpleNamespace(percent=12.5))
+    snapshots.publish("network", SimpleNamespace(upload_kbps=1.0, download_kbps=2.0))
+    recorder.close()
+
+    store = TimeSeriesStore(tmp_path)
+    assert store.series() == ["CPU", "NET_DOWN", "NET_UP"]
+    assert store.query("CPU")[1].tolist() == [12.5]
+
+
+def test_open_files_are_capped_and_idle_ones_closed(tmp_path):
+    store = TimeSeriesStore(tmp_path, max_open=2)
+    for t in range(3):
+        for name in ("A", "B", "C"):
+            store.append(name, float(t), t * 1.0)
+    open_series = [n for n in store.series() if store._series[n].writer is not None]
+    assert open_series == ["B", "C"]
+    # Seria z zamkniętym plikiem jest dopisywana do tego samego segmentu
+    assert store.query("A")[1].tolist() == [0.0, 1.0, 2.0]
+    assert len(store.segments("A")) == 1
+
+    assert store.close_idle(0.0) == 2
+    assert all(s.writer is None for s in store._series.values())
+
+
+def test_maintain_expires_slow_series(tmp_path):
+    store = TimeSeriesStore(tmp_path, segment_records=2, retention_s=5)
+    now = time.time()
+    # Seria przestaje być zapisywana - rotacja nie usunie starego segmentu
+    for t in (now - 100, now - 99, now - 98):
+        store.append("CPU", t, 0.0)
+    assert len(store.segments("CPU")) == 2
+
+    store.maintain()
+    assert [s.start for s in store.segments("CPU")] == [now - 98]
+
+
+def test_recorder_maintains_store_periodically(tmp_path):
+    calls = threading.Event()
+    tsdb = TimeSeriesStore(tmp_path)
+    tsdb.maintain = lambda: calls.set()
+    recorder = StoreRecorder(tsdb, SnapshotStore(), maintenance_s=0.01)
+    assert calls.wait(2.0)
+    recorder.close()
+    assert not recorder._thread.is_alive()
@@ -0,0 +1,65 @@
+from collections import namedtuple
+
+from monitor import topology as tp
+
+
+def test_cache_reloads_after_ttl_and_notifies(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(tp, "monotonic", lambda: now[0])
+    calls = []
+    values = [["a"], ["a"], ["a", "b"]]
+
+    def loader():
+        calls.append(now[0])
+        return values[len(calls) - 1]
+
+    cache = tp.TopologyCache(ttl_s=10.0)
+    cache.register("gpus", loader)
+    changes = []
+    cache.subscribe("gpus", lambda key, old, new: changes.append((key, old, new)))
+
+    assert cache.get("gpus") == ["a"]
+    now[0] = 5.0
+    assert cache.get("gpus") == ["a"]
+    assert calls == [0.0]
+
+    # Po upływie TTL wartość jest odczytywana ponownie; bez zmiany - cisza
+    now[0] = 10.0
+    assert cache.get("gpus") == ["a"]
+    assert cache.version("gpus") == 1
+    assert changes == []
+
+    cache.invalidate("gpus")
+    assert cache.get("gpus") == ["a", "b"]
+    assert cache.version("gpus") == 2
+    assert changes == [("gpus", ["a"], ["a", "b"])]
+
+
+def test_watcher_forces_reload():
+    flags = [False, True]
+    values = iter([1, 2])
+    cache = tp.TopologyCache(ttl_s=3600.0)
+    cache.register("x", lambda: next(values), watcher=lambda: flags.pop(0))
+
+    assert cache.get("x") == 1
+    assert cache.get("x") == 2
+
+
+def test_disk_monitor_reads_partitions_from_cache(monkeypatch):
+    from monitor import disk_monitor as dm
+
+    Part = namedtuple("Part", ["mountpoint", "opts"])
+    calls = []
+
+    def partitions():
+        calls.append(1)
+        return [Part("/", "rw")]
+
+    DU = namedtuple("DU", ["percent", "used", "total"])
+    monkeypatch.setattr(dm.psutil, "disk_partitions", partitions)
+    monkeypatch.setattr(dm.psutil, "disk_usage", lambda mp: DU(1.0, 1, 100))
+
+    monitor = dm.DiskMonitor(tp.TopologyCache(ttl_s=3600.0))
+    for _ in range(5):
+        assert [u.mount for u in monitor.get_usage()] == ["/"]
+    assert len(calls) == 1